@@ -0,0 +1,81 @@
+"""Measures callout parser throughput and accuracy against the checked-in corpus. Runs fully offline.
+
+Run from the repo root:  python -m benchmarks.bench_parser [--iterations 2000] [--strict]
+"""
+import sys
+import json
+import time
+import pathlib
+import argparse
+from collections import defaultdict
+from src.scrapers.trade_parser import TradeParser
+
+CORPUS = pathlib.Path(__file__).parent / "fixtures" / "parser_corpus.jsonl"
+
+# Fixed so expected outputs do not depend on the day the benchmark runs
+DEFAULT_EXPIRATION = "12/31"
+
+def load_corpus(path=CORPUS):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def check_accuracy(parser, corpus):
+    mismatches = []
+    for row in corpus:
+        actual = parser.parse(row["message"])
+        if actual != row["expected"]:
+            mismatches.append((row, actual))
+    return mismatches
+
+def time_parser(parser, corpus, iterations):
+    """Returns per-channel lists of single-parse times in microseconds."""
+    timings = defaultdict(list)
+    clock = time.perf_counter_ns
+    for _ in range(iterations):
+        for row in corpus:
+            start = clock()
+            parser.parse(row["message"])
+            timings[row["channel"]].append((clock() - start) / 1000)
+    return timings
+
+def percentile(sorted_samples, pct):
+    return sorted_samples[min(len(sorted_samples) - 1, int(len(sorted_samples) * pct))]
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--iterations", type=int, default=2000)
+    arg_parser.add_argument("--corpus", default=str(CORPUS))
+    arg_parser.add_argument("--strict", action="store_true", help="exit non-zero on any mismatch")
+    args = arg_parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    parser = TradeParser(default_expiration=lambda: DEFAULT_EXPIRATION)
+
+    mismatches = check_accuracy(parser, corpus)
+    for row, actual in mismatches:
+        note = f" ({row['note']})" if row.get("note") else ""
+        print(f"MISMATCH [{row['channel']}] {row['message'][:80]!r}{note}")
+        print(f"    expected: {row['expected']}")
+        print(f"    actual:   {actual}")
+
+    started = time.perf_counter()
+    timings = time_parser(parser, corpus, args.iterations)
+    elapsed = time.perf_counter() - started
+
+    print(f"\n{'channel':<26}{'msgs':>8}{'p50 us':>10}{'p99 us':>10}")
+    all_samples = []
+    for channel, samples in sorted(timings.items()):
+        samples.sort()
+        all_samples.extend(samples)
+        print(f"{channel:<26}{len(samples):>8}{percentile(samples, 0.50):>10.2f}{percentile(samples, 0.99):>10.2f}")
+    all_samples.sort()
+    print(f"{'all':<26}{len(all_samples):>8}{percentile(all_samples, 0.50):>10.2f}{percentile(all_samples, 0.99):>10.2f}")
+
+    print(f"\nthroughput: {len(all_samples) / elapsed:,.0f} msgs/s")
+    print(f"accuracy:   {len(corpus) - len(mismatches)}/{len(corpus)} messages match expected output")
+
+    if args.strict and mismatches:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
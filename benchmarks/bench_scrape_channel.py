@@ -0,0 +1,68 @@
+"""Compares batched vs per-element message extraction on a local Discord fixture.
+
+Run from the repo root:  python -m benchmarks.bench_scrape_channel [--polls 20]
+"""
+import argparse
+import pathlib
+import statistics
+import time
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from src.main.message_extraction import extract_messages, extract_messages_per_element
+
+FIXTURE = pathlib.Path(__file__).parent / "fixtures" / "discord_channel.html"
+
+def count_driver_calls(driver):
+    """Wraps driver.execute so every chromedriver command (including WebElement ones) is counted."""
+    counter = {"calls": 0}
+    original_execute = driver.execute
+
+    def counting_execute(driver_command, params=None):
+        counter["calls"] += 1
+        return original_execute(driver_command, params)
+
+    driver.execute = counting_execute
+    return counter
+
+def run(driver, counter, extractor, polls):
+    timings = []
+    calls = []
+    for _ in range(polls):
+        counter["calls"] = 0
+        start = time.perf_counter()
+        messages = extractor(driver)
+        timings.append((time.perf_counter() - start) * 1000)
+        calls.append(counter["calls"])
+    return len(messages), timings, calls
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--polls", type=int, default=20)
+    args = parser.parse_args()
+
+    chrome_options = Options()
+    chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    driver = webdriver.Chrome(options=chrome_options)
+
+    try:
+        driver.get(FIXTURE.resolve().as_uri())
+        counter = count_driver_calls(driver)
+        watermark = extract_messages(driver)[0][-1]["id"]
+
+        print(f"{'path':<14}{'messages':>10}{'calls/poll':>12}{'p50 ms':>10}{'mean ms':>10}{'max ms':>10}")
+        paths = (
+            ("per-element", extract_messages_per_element),
+            ("batched", lambda d: extract_messages(d)[0]),
+            ("watermark", lambda d: extract_messages(d, after_id=watermark)[0]),
+        )
+        for name, extractor in paths:
+            count, timings, calls = run(driver, counter, extractor, args.polls)
+            print(f"{name:<14}{count:>10}{statistics.mean(calls):>12.1f}{statistics.median(timings):>10.2f}"
+                  f"{statistics.mean(timings):>10.2f}{max(timings):>10.2f}")
+    finally:
+        driver.quit()
+
+if __name__ == "__main__":
+    main()
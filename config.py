@@ -10,5 +10,54 @@ ALPACA_API_KEY = os.getenv("ALPACA_API_KEY")
 ALPACA_API_SECRET = os.getenv("ALPACA_API_SECRET")
 ALPACA_BASE_URL = os.getenv("ALPACA_BASE_URL")
 
+# Number of Chrome worker processes to shard Discord channels across (0 = single shared browser)
+BROWSER_POOL_WORKERS = int(os.getenv("BROWSER_POOL_WORKERS", "0"))
+
+# How Discord tabs are read: "poll" scrapes each channel on its interval, "push" drains a MutationObserver queue in the page
+SCRAPE_MODE = os.getenv("SCRAPE_MODE", "poll")
+
+# Streaming quotes for exit/add triggers: "alpaca" for the market-data websocket, "off" to rely on position polling
+QUOTE_STREAM = os.getenv("QUOTE_STREAM", "alpaca")
+
+# Callout latency metrics: rotating JSONL snapshots, plus a Prometheus /metrics endpoint when the port is set (0 = off)
+METRICS_FILE = os.getenv("METRICS_FILE", os.path.join("logs", "metrics.jsonl"))
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+# Interface the /metrics endpoint binds to; set 0.0.0.0 only if a remote Prometheus must reach it
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+
+# Fast start: reuse the cached chromedriver path and a pinned User-Agent instead of resolving both on every start
+FAST_START = os.getenv("FAST_START", "1") == "1"
+CHROMEDRIVER_PATH = os.getenv("CHROMEDRIVER_PATH")
+DISCORD_USER_AGENT = os.getenv("DISCORD_USER_AGENT")
+
+# Where callouts are read from: "selenium" (Discord tabs), "jsonl" (tail MESSAGE_SOURCE_PATH) or "gateway" (websocket at MESSAGE_GATEWAY_URL)
+MESSAGE_SOURCE = os.getenv("MESSAGE_SOURCE", "selenium")
+MESSAGE_SOURCE_PATH = os.getenv("MESSAGE_SOURCE_PATH", os.path.join("data", "messages.jsonl"))
+MESSAGE_GATEWAY_URL = os.getenv("MESSAGE_GATEWAY_URL", "ws://127.0.0.1:8799")
+MESSAGE_GATEWAY_TOKEN = os.getenv("MESSAGE_GATEWAY_TOKEN")
+
+# Underlyings whose option chains are indexed at startup; others are added the first time they are called out
+OPTION_CHAIN_WATCHLIST = [ticker.strip().upper() for ticker in os.getenv("OPTION_CHAIN_WATCHLIST", "SPY,QQQ").split(",") if ticker.strip()]
+
+# Seconds within which the same callout (ticker, contract, action) from another channel is merged into the first (0 = off)
+SIGNAL_COALESCE_WINDOW = float(os.getenv("SIGNAL_COALESCE_WINDOW", "30"))
+
+# Limit entry chasing: reprice toward the ask every CHASE_STEP_INTERVAL seconds, never paying more than
+# CHASE_MAX_SLIPPAGE (fraction) over the callout price, for at most CHASE_TIME_BUDGET seconds per signal.
+# Whatever is left is dropped unless CHASE_MARKET_FALLBACK=1 sends it at market.
+CHASE_MAX_SLIPPAGE = float(os.getenv("CHASE_MAX_SLIPPAGE", "0.05"))
+CHASE_TIME_BUDGET = float(os.getenv("CHASE_TIME_BUDGET", "10"))
+CHASE_STEP_INTERVAL = float(os.getenv("CHASE_STEP_INTERVAL", "1"))
+CHASE_MARKET_FALLBACK = os.getenv("CHASE_MARKET_FALLBACK", "0") == "1"
+
+# Logging: level, file format ("text" or "json"), size-based rotation, and per-tag sampling for repetitive
+# status lines as TAG=seconds pairs (e.g. at most one TRIGGERS P/L line per ticker every 30s)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")
+LOG_FILE = os.getenv("LOG_FILE", os.path.join("logs", "trading_bot.log"))
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+LOG_RATE_LIMITS = os.getenv("LOG_RATE_LIMITS", "TRIGGERS=30")
+
 if not all([DISCORD_EMAIL, DISCORD_PASSWORD, ALPACA_API_KEY, ALPACA_API_SECRET, ALPACA_BASE_URL]):
     raise ValueError("Missing Alpaca API credentials. Check your .env file.")
\ No newline at end of file
@@ -1,21 +1,34 @@
 import logging
 import time
+from src.main.logging_setup import configure_logging, parse_rate_limits
 from src.main.channel_manager import initialize_discord_session
-from src.main.live_monitoring import start_live_monitoring
+from src.main.channel_scheduler import ChannelScheduler
+from src.main.browser_pool import BrowserPool
+from src.main.message_sources import create_message_source
+from src.scrapers import (
+    daytrade_scalps, midas_account, small_account_challenge, swing_trades,
+    longterm_leaps, highrisk, golden_sweeps,
+)
 from src.trading.execute_trade import handle_trade_entry, handle_trade_exit
 from src.trading.alpaca_client import api
-from config import ALPACA_API_KEY, ALPACA_API_SECRET, ALPACA_BASE_URL
-
-# ✅ Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler("logs/trading_bot.log", encoding="utf-8"),
-        logging.StreamHandler()
-    ]
+from src.trading.position_cache import PositionCache, parse_occ_symbol
+from src.trading.trigger_book import TriggerBook
+from src.trading.order_tracker import OrderTracker
+from src.trading.account_cache import AccountCache
+from src.trading.option_chain import OptionChainIndex
+from src.trading.order_chaser import OrderChaser
+from src.trading.signal_coalescer import SignalCoalescer
+from src.metrics.latency import LatencyMetrics
+from src.trading.execution_queue import ExecutionQueue
+from config import (
+    ALPACA_API_KEY, ALPACA_API_SECRET, ALPACA_BASE_URL, BROWSER_POOL_WORKERS, SCRAPE_MODE, QUOTE_STREAM, METRICS_FILE, METRICS_PORT, METRICS_HOST,
+    MESSAGE_SOURCE, MESSAGE_SOURCE_PATH, MESSAGE_GATEWAY_URL, MESSAGE_GATEWAY_TOKEN,
+    OPTION_CHAIN_WATCHLIST, SIGNAL_COALESCE_WINDOW, LOG_LEVEL, LOG_FORMAT, LOG_FILE, LOG_MAX_BYTES, LOG_BACKUP_COUNT, LOG_RATE_LIMITS,
 )
 
+# ✅ Configure logging: every module logs through one queue; a background thread does the formatting and disk writes
+configure_logging(LOG_LEVEL, LOG_FORMAT, LOG_FILE, LOG_MAX_BYTES, LOG_BACKUP_COUNT, parse_rate_limits(LOG_RATE_LIMITS))
+
 logger = logging.getLogger(__name__)
 
 # ✅ Define the Discord channels to monitor
@@ -29,37 +42,101 @@ DISCORD_CHANNELS = [
     "https://discord.com/channels/525113944239767562/1287928439663230976",
 ]
 
+# ✅ Scraper name, parser, poll interval (s) and priority per channel. Fast-moving channels poll more often.
+CHANNEL_SCRAPERS = {
+    daytrade_scalps.DISCORD_CHANNEL: {"scraper_name": "Daytrade Scalps", "parse_trade_message": daytrade_scalps.parse_trade_message, "interval": 2, "priority": 3},
+    golden_sweeps.DISCORD_CHANNEL: {"scraper_name": "Golden Sweeps", "parse_trade_message": golden_sweeps.parse_trade_message, "interval": 2, "priority": 3},
+    midas_account.DISCORD_CHANNEL: {"scraper_name": "Midas Small Account", "parse_trade_message": midas_account.parse_trade_message, "interval": 3, "priority": 2},
+    small_account_challenge.DISCORD_CHANNEL: {"scraper_name": "Small Account Challenge", "parse_trade_message": small_account_challenge.parse_trade_message, "interval": 3, "priority": 2},
+    highrisk.DISCORD_CHANNEL: {"scraper_name": "Highrisk Trades", "parse_trade_message": highrisk.parse_trade_message, "interval": 3, "priority": 2},
+    swing_trades.DISCORD_CHANNEL: {"scraper_name": "Swing Trades", "parse_trade_message": swing_trades.parse_trade_message, "interval": 5, "priority": 1},
+    longterm_leaps.DISCORD_CHANNEL: {"scraper_name": "Longterm Leaps", "parse_trade_message": longterm_leaps.parse_trade_message, "interval": 10, "priority": 0},
+}
+
 def main():
     logger.info("🚀 Starting Trading Bot...")
     
     # ✅ Ensure Alpaca API connectivity
     try:
         account = api.get_account()
-        logger.info(f"✅ [MAIN] Connected to Alpaca. Account Cash Balance: ${account.cash}")
+        logger.info("✅ [MAIN] Connected to Alpaca. Account Cash Balance: $%s", account.cash)
     except Exception as e:
-        logger.error(f"❌ [MAIN] Failed to connect to Alpaca API: {e}")
+        logger.error("❌ [MAIN] Failed to connect to Alpaca API: %s", e)
         return
+
+    # ✅ Stage-by-stage callout latency, from the Discord post to the fill
+    LatencyMetrics.get_instance().start(METRICS_FILE, METRICS_PORT, host=METRICS_HOST)
+
+    # ✅ One shared position poller for every trim/out/add monitor
+    PositionCache.get_instance().start()
+
+    # ✅ Fill tracking from the trade_updates stream (polling fallback built in)
+    OrderTracker.get_instance().start()
+
+    # ✅ Cash/buying power for sizing served from a cache adjusted by our own fills
+    AccountCache.get_instance().start(OrderTracker.get_instance())
+
+    # ✅ Option chains for callout symbol resolution, plus the underlyings we already hold
+    held_roots = {contract["root"] for contract in map(parse_occ_symbol, PositionCache.get_instance().get_all()) if contract}
+    OptionChainIndex.get_instance().start([*OPTION_CHAIN_WATCHLIST, *held_roots])
+
+    # ✅ Live quotes re-mark positions for trim/out/add triggers between position refreshes
+    if QUOTE_STREAM == "alpaca":
+        from src.trading.market_data import QuoteStream
+        quote_stream = QuoteStream.get_instance()
+        quote_stream.attach(TriggerBook.get_instance())
+        quote_stream.attach_chaser(OrderChaser.get_instance())
+        quote_stream.start()
     
+    # ✅ Scrapers only enqueue signals; order placement runs on the execution workers
+    execution_queue = ExecutionQueue(handle_trade_entry, handle_trade_exit)
+    execution_queue.start()
+
+    # ✅ The same callout from several channels within the window becomes one signal
+    coalescer = SignalCoalescer(SIGNAL_COALESCE_WINDOW)
+    on_entry = coalescer.gate(execution_queue.enqueue_entry)
+    on_exit = coalescer.gate(execution_queue.enqueue_exit)
+    reporters = [execution_queue.log_stats, coalescer.log_stats, api.log_stats,
+                 OptionChainIndex.get_instance().log_stats, OrderChaser.get_instance().log_stats,
+                 TriggerBook.get_instance().log_stats, OrderTracker.get_instance().log_stats]
+
+    # ✅ Non-browser sources (JSONL tail, gateway) need no Discord login; messages are pushed, so poll them often
+    if MESSAGE_SOURCE != "selenium":
+        source = create_message_source(MESSAGE_SOURCE, path=MESSAGE_SOURCE_PATH, url=MESSAGE_GATEWAY_URL, token=MESSAGE_GATEWAY_TOKEN)
+        logger.info("📡 Reading callouts from the %s source...", MESSAGE_SOURCE)
+        scheduler = ChannelScheduler(None, on_entry, on_exit, reporters=reporters, source=source)
+        for channel_url in DISCORD_CHANNELS:
+            scheduler.add_channel(channel_url, None, **dict(CHANNEL_SCRAPERS[channel_url], interval=0.2))
+        scheduler.run()
+        logger.info("🛑 Shutting down Trading Bot.")
+        return
+
+    # ✅ Pool mode: each worker process runs its own browser and streams signals back here
+    if BROWSER_POOL_WORKERS > 0:
+        logger.info("🧩 Starting browser pool with %s workers (%s mode)...", BROWSER_POOL_WORKERS, SCRAPE_MODE)
+        pool = BrowserPool({url: CHANNEL_SCRAPERS[url] for url in DISCORD_CHANNELS}, workers=BROWSER_POOL_WORKERS, mode=SCRAPE_MODE)
+        pool.start()
+        pool.run(on_entry, on_exit)
+        execution_queue.log_stats()
+        logger.info("🛑 Shutting down Trading Bot.")
+        return
+
     # ✅ Start Discord Session and Scrapers
     logger.info("🔑 Logging into Discord and setting up scrapers...")
-    driver, tab_handles = initialize_discord_session(DISCORD_CHANNELS)
+    web_driver, tab_handles = initialize_discord_session(DISCORD_CHANNELS)
+    if web_driver is None:
+        logger.error("❌ [MAIN] Discord session unavailable. Exiting.")
+        return
     
     # ✅ Start Live Monitoring for trade callouts
     logger.info("📡 Starting Discord Trade Monitoring...")
-    try:
-        for idx, channel_url in enumerate(DISCORD_CHANNELS):
-            logger.info(f"📊 Monitoring {channel_url}...")
-            start_live_monitoring(
-                scraper_name=f"Scraper-{idx}",
-                channel_url=channel_url,
-                tab_handle=tab_handles[channel_url],
-                parse_trade_message=lambda msg: None,  # Replace with trade parsing logic
-                handle_trade_entry=handle_trade_entry,
-                handle_trade_exit=handle_trade_exit
-            )
-
-    except KeyboardInterrupt:
-        logger.info("🛑 Shutting down Trading Bot.")
+    scheduler = ChannelScheduler(web_driver, on_entry, on_exit, mode=SCRAPE_MODE, reporters=reporters)
+    for channel_url in DISCORD_CHANNELS:
+        logger.info("📊 Monitoring %s...", channel_url)
+        scheduler.add_channel(channel_url, tab_handles[channel_url], **CHANNEL_SCRAPERS[channel_url])
+
+    scheduler.run()
+    logger.info("🛑 Shutting down Trading Bot.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
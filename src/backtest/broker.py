@@ -0,0 +1,288 @@
+import uuid
+import random
+import itertools
+import threading
+import datetime as dt
+from alpaca_trade_api.rest import APIError
+from src.trading.clock import get_clock
+from src.trading.position_cache import parse_occ_symbol
+
+def contract_multiplier(symbol):
+    return 100 if parse_occ_symbol(symbol) is not None else 1
+
+class Entity:
+    """Attribute view over a raw dict, like alpaca_trade_api's Entity (order_to_dict reads _raw)."""
+
+    def __init__(self, raw):
+        self._raw = raw
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        try:
+            return self._raw[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __repr__(self):
+        return f"Entity({self._raw})"
+
+class SimulatedBroker:
+    """In-memory stand-in for tradeapi.REST: account, positions and order matching against quotes.
+
+    Market orders fill at the ask (buys) or bid (sells). Limit orders fill at that price once it is
+    at or through the limit, and otherwise rest until a quote makes them marketable. Without any
+    quote or trade for a symbol, limit orders fill at their limit when fill_without_quote is set
+    (callout prices are usually marketable) and market orders are rejected.
+
+    With partial_fill_rate set, that fraction of marketable orders fills a random part first and
+    the rest partial_fill_delay seconds later (on the clock's scheduler if it has one).
+
+    Listeners get a copy of every order update, like the trade_updates stream. Each position is
+    attributed to the channel that was active when it was opened, for per-channel P/L.
+    Callers on several threads must hold broker.lock around every call.
+    """
+
+    def __init__(self, cash=100_000.0, fill_without_quote=True, clock=None, partial_fill_rate=0.0, partial_fill_delay=1.0, seed=None):
+        self.cash = float(cash)
+        self.fill_without_quote = fill_without_quote
+        self.clock = clock
+        self.partial_fill_rate = partial_fill_rate
+        self.partial_fill_delay = partial_fill_delay
+        self.random = random.Random(seed)
+        self.lock = threading.RLock()
+        self.quotes = {}
+        self.last_price = {}
+        self.positions = {}
+        self.orders = {}
+        self.open_orders = {}
+        self.fills = []
+        self.listeners = []
+        self.current_channel = None
+        self.ids = itertools.count(1)
+
+    def _now(self):
+        clock = self.clock or get_clock()
+        return dt.datetime.fromtimestamp(clock.time(), dt.timezone.utc).isoformat()
+
+    def add_listener(self, callback):
+        self.listeners.append(callback)
+
+    def _notify(self, order):
+        for callback in self.listeners:
+            callback(dict(order))
+
+    # ---- market data ----
+
+    def on_quote(self, symbol, bid, ask):
+        symbol = symbol.upper()
+        bid, ask = float(bid or 0), float(ask or 0)
+        self.quotes[symbol] = (bid, ask)
+        if bid and ask:
+            self.last_price[symbol] = (bid + ask) / 2
+        for order in [order for order in self.open_orders.values() if order["symbol"] == symbol]:
+            self._try_fill(order)
+
+    def get_quote(self, symbol):
+        """Latest bid/ask in the shape of QuoteStream.get_quote, so the order chaser can price off the replay."""
+        quote = self.quotes.get(symbol.upper())
+        if not quote:
+            return None
+        return {"symbol": symbol.upper(), "bid": quote[0], "ask": quote[1]}
+
+    def _fill_price(self, order):
+        symbol = order["symbol"]
+        limit = float(order["limit_price"]) if order.get("limit_price") is not None else None
+        quote = self.quotes.get(symbol)
+        if quote and all(quote):
+            price = quote[1] if order["side"] == "buy" else quote[0]
+        elif symbol in self.last_price:
+            price = self.last_price[symbol]
+        elif limit is not None and self.fill_without_quote:
+            return limit
+        else:
+            return None
+
+        if limit is not None and ((order["side"] == "buy" and price > limit) or (order["side"] == "sell" and price < limit)):
+            return None
+        return price
+
+    def _try_fill(self, order, price=None):
+        price = price if price is not None else self._fill_price(order)
+        if price is None:
+            return False
+        qty = int(order["qty"]) - int(float(order["filled_qty"]))
+        if qty > 1 and self.partial_fill_rate and self.random.random() < self.partial_fill_rate:
+            qty = self.random.randint(1, qty - 1)
+            self.open_orders[order["id"]] = order
+            self._schedule(self.partial_fill_delay, lambda: self._fill_rest(order["id"]))
+        self._execute(order, qty, price)
+        return True
+
+    def _schedule(self, delay, callback):
+        clock = self.clock or get_clock()
+        if hasattr(clock, "schedule"):
+            clock.schedule(clock.time() + delay, callback)
+        else:
+            timer = threading.Timer(delay, callback)
+            timer.daemon = True
+            timer.start()
+
+    def _fill_rest(self, order_id):
+        with self.lock:
+            order = self.open_orders.get(order_id)
+            if order is not None:
+                self._try_fill(order)
+
+    def _execute(self, order, qty, price):
+        symbol = order["symbol"]
+        multiplier = contract_multiplier(symbol)
+        position = self.positions.get(symbol)
+        realized = 0.0
+
+        if order["side"] == "buy":
+            if position is None:
+                position = self.positions[symbol] = {"qty": 0, "avg_entry_price": 0.0, "channel": order.get("channel")}
+            cost = position["avg_entry_price"] * position["qty"] + price * qty
+            position["qty"] += qty
+            position["avg_entry_price"] = cost / position["qty"]
+            self.cash -= price * qty * multiplier
+        else:
+            realized = (price - position["avg_entry_price"]) * qty * multiplier
+            position["qty"] -= qty
+            self.cash += price * qty * multiplier
+            if position["qty"] == 0:
+                del self.positions[symbol]
+
+        self.last_price[symbol] = price
+        filled_before = int(float(order["filled_qty"]))
+        filled = filled_before + qty
+        order["filled_avg_price"] = str((float(order["filled_avg_price"] or 0) * filled_before + price * qty) / filled)
+        order["filled_qty"] = str(filled)
+        order["updated_at"] = self._now()
+        if filled >= int(order["qty"]):
+            order["status"] = "filled"
+            order["filled_at"] = order["updated_at"]
+            self.open_orders.pop(order["id"], None)
+        else:
+            order["status"] = "partially_filled"
+
+        self.fills.append({
+            "time": (self.clock or get_clock()).time(),
+            "order_id": order["id"],
+            "channel": order.get("channel") or (position or {}).get("channel"),
+            "symbol": symbol,
+            "side": order["side"],
+            "qty": qty,
+            "price": price,
+            "realized_pl": realized,
+        })
+        self._notify(order)
+
+    # ---- REST surface used by src/trading ----
+
+    def get_account(self):
+        equity = self.cash + sum(self._market_value(symbol, position) for symbol, position in self.positions.items())
+        cash = f"{self.cash:.2f}"
+        return Entity({"cash": cash, "buying_power": cash, "options_buying_power": cash, "equity": f"{equity:.2f}", "status": "ACTIVE"})
+
+    def _mark(self, symbol, position):
+        return self.last_price.get(symbol, position["avg_entry_price"])
+
+    def _market_value(self, symbol, position):
+        return self._mark(symbol, position) * position["qty"] * contract_multiplier(symbol)
+
+    def list_positions(self):
+        positions = []
+        for symbol, position in self.positions.items():
+            price = self._mark(symbol, position)
+            entry = position["avg_entry_price"]
+            positions.append(Entity({
+                "symbol": symbol,
+                "asset_class": "us_option" if contract_multiplier(symbol) == 100 else "us_equity",
+                "qty": str(position["qty"]),
+                "side": "long",
+                "current_price": str(price),
+                "avg_entry_price": str(entry),
+                "market_value": str(self._market_value(symbol, position)),
+                "unrealized_plpc": str((price - entry) / entry if entry else 0.0),
+            }))
+        return positions
+
+    def submit_order(self, symbol, qty, side, type, time_in_force, limit_price=None, client_order_id=None, **kwargs):
+        symbol = symbol.upper()
+        order = {
+            "id": str(uuid.UUID(int=next(self.ids))),
+            "client_order_id": client_order_id or uuid.uuid4().hex,
+            "symbol": symbol,
+            "asset_class": "us_option" if contract_multiplier(symbol) == 100 else "us_equity",
+            "qty": str(int(qty)),
+            "side": side,
+            "type": type,
+            "time_in_force": time_in_force,
+            "limit_price": str(limit_price) if limit_price is not None else None,
+            "status": "new",
+            "filled_qty": "0",
+            "filled_avg_price": None,
+            "submitted_at": self._now(),
+            "filled_at": None,
+            "channel": self.current_channel,
+        }
+        self.orders[order["id"]] = order
+
+        held = self.positions.get(symbol, {}).get("qty", 0)
+        if side == "sell" and int(qty) > held:
+            order["status"] = "rejected"
+        elif not self._try_fill(order):
+            if type == "market":
+                order["status"] = "rejected"
+            else:
+                self.open_orders[order["id"]] = order
+        if order["status"] in ("new", "rejected"):
+            self._notify(order)
+        return Entity(dict(order))
+
+    def get_order(self, order_id):
+        if order_id not in self.orders:
+            raise APIError({"code": 40410000, "message": "order not found"})
+        return Entity(dict(self.orders[order_id]))
+
+    def list_orders(self, status="open", **kwargs):
+        orders = self.open_orders.values() if status == "open" else self.orders.values()
+        return [Entity(dict(order)) for order in orders]
+
+    def cancel_order(self, order_id):
+        order = self.open_orders.pop(order_id, None)
+        if order is None:
+            raise APIError({"code": 42210000, "message": "order is not cancelable"})
+        order["status"] = "canceled"
+        order["canceled_at"] = self._now()
+        self._notify(order)
+
+    def replace_order(self, order_id, qty=None, limit_price=None, time_in_force=None, client_order_id=None, **kwargs):
+        old = self.open_orders.pop(order_id, None)
+        if old is None:
+            raise APIError({"code": 42210000, "message": "order is not replaceable"})
+        remaining = int(old["qty"]) - int(float(old["filled_qty"]))
+        previous_channel = self.current_channel
+        self.current_channel = old.get("channel")
+        try:
+            new = self.submit_order(
+                old["symbol"], qty if qty is not None else remaining, old["side"], old["type"],
+                time_in_force or old["time_in_force"],
+                limit_price=limit_price if limit_price is not None else old["limit_price"],
+                client_order_id=client_order_id,
+            )
+        finally:
+            self.current_channel = previous_channel
+        old["status"] = "replaced"
+        old["replaced_by"] = new.id
+        self.orders[new.id]["replaces"] = order_id
+        self._notify(old)
+        return self.get_order(new.id)
+
+    def close_position(self, symbol):
+        position = self.positions.get(symbol.upper())
+        if position is None:
+            raise APIError({"code": 40410000, "message": "position not found"})
+        return self.submit_order(symbol, position["qty"], "sell", "market", "day")
@@ -0,0 +1,76 @@
+import heapq
+import datetime as dt
+import itertools
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+class VirtualClock:
+    """Event-driven clock: time only moves when the backtest advances it.
+
+    Events come from scheduled callbacks and from one lazily-read feed of (t, payload) records
+    (the recorded quotes), so weeks of quotes never have to sit in memory. sleep() and wait()
+    advance the clock instead of blocking, running every event due in between.
+    """
+
+    def __init__(self, start, feed=(), on_feed=None):
+        self.current = start
+        self.events = []
+        self.sequence = itertools.count()
+        self.feed = iter(feed)
+        self.on_feed = on_feed
+        self.next_feed = next(self.feed, None)
+
+    def time(self):
+        return self.current
+
+    def monotonic(self):
+        return self.current
+
+    def now(self):
+        return dt.datetime.fromtimestamp(self.current)
+
+    def schedule(self, at, callback):
+        heapq.heappush(self.events, (at, next(self.sequence), callback))
+
+    def _next_due(self):
+        scheduled = self.events[0][0] if self.events else None
+        feed = self.next_feed[0] if self.next_feed is not None else None
+        if scheduled is None:
+            return feed
+        if feed is None:
+            return scheduled
+        return min(scheduled, feed)
+
+    def step(self, until):
+        """Runs the earliest event due at or before until. Returns False if there was none."""
+        due = self._next_due()
+        if due is None or due > until:
+            return False
+        self.current = max(self.current, due)
+        if self.events and self.events[0][0] == due:
+            _, _, callback = heapq.heappop(self.events)
+            callback()
+        else:
+            payload = self.next_feed[1]
+            self.next_feed = next(self.feed, None)
+            self.on_feed(payload)
+        return True
+
+    def advance_to(self, until):
+        while self.step(until):
+            pass
+        self.current = max(self.current, until)
+
+    def sleep(self, seconds):
+        self.advance_to(self.current + seconds)
+
+    def wait(self, future, timeout):
+        deadline = self.current + timeout
+        while not future.done() and self.step(deadline):
+            pass
+        if future.done():
+            return future.result()
+        self.current = max(self.current, deadline)
+        raise FutureTimeoutError()
+
+    def exhausted(self):
+        return self._next_due() is None
@@ -0,0 +1,220 @@
+"""Local stand-in for the Alpaca trading REST API, backed by a SimulatedBroker.
+
+Implements the endpoints src/trading uses: account, positions, and order submit, get, list, cancel
+and replace. Latency, rate limiting, partial fills and error injection are configurable. There is no
+trade_updates stream, so the OrderTracker falls back to polling. Point the bot at it with
+ALPACA_BASE_URL=http://127.0.0.1:<port>.
+
+Run from the repo root:  python -m src.backtest.fake_alpaca [--port 8765] [--latency 0.05] [--error-rate 0.01]
+"""
+import os
+import json
+import time
+import random
+import logging
+import argparse
+import threading
+from urllib.parse import urlparse, parse_qs, unquote
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# The broker imports the trading modules, and config.py refuses to import without credentials.
+# The server itself never talks to Alpaca or Discord.
+for name in ("DISCORD_EMAIL", "DISCORD_PASSWORD", "ALPACA_API_KEY", "ALPACA_API_SECRET"):
+    os.environ.setdefault(name, "fake-alpaca")
+os.environ.setdefault("ALPACA_BASE_URL", "http://127.0.0.1:0")
+
+from alpaca_trade_api.rest import APIError
+from src.main.logging_setup import configure_logging
+from src.backtest.broker import SimulatedBroker
+
+logger = logging.getLogger(__name__)
+
+class FixedWindowLimiter:
+    """Alpaca-style per-minute request quota; over-quota requests get a 429 instead of waiting."""
+
+    def __init__(self, per_minute):
+        self.per_minute = per_minute
+        self.lock = threading.Lock()
+        self.window = int(time.time() // 60)
+        self.used = 0
+
+    def take(self):
+        """Returns (allowed, remaining, reset epoch seconds)."""
+        with self.lock:
+            window = int(time.time() // 60)
+            if window != self.window:
+                self.window, self.used = window, 0
+            allowed = not self.per_minute or self.used < self.per_minute
+            if allowed:
+                self.used += 1
+            return allowed, max(0, self.per_minute - self.used), (self.window + 1) * 60
+
+class FakeAlpacaServer:
+    def __init__(self, broker=None, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, rate_limit=200, error_rate=0.0, seed=None):
+        self.broker = broker or SimulatedBroker(seed=seed)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.limiter = FixedWindowLimiter(rate_limit)
+        self.random = random.Random(seed)
+        self.stats_lock = threading.Lock()
+        self.requests = 0
+        self.throttled = 0
+        self.injected_errors = 0
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def route(self, method, path, query, body):
+        """Returns (status, payload). Runs under the broker lock."""
+        broker = self.broker
+        parts = [unquote(part) for part in path.strip("/").split("/")]
+        if parts[:1] != ["v2"]:
+            return 404, {"code": 40410000, "message": "endpoint not found"}
+        resource, ident = parts[1] if len(parts) > 1 else None, parts[2] if len(parts) > 2 else None
+
+        if resource == "account" and method == "GET":
+            return 200, broker.get_account()._raw
+        if resource == "clock" and method == "GET":
+            return 200, {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()), "is_open": True}
+        if resource == "positions":
+            if method == "GET" and ident is None:
+                return 200, [position._raw for position in broker.list_positions()]
+            if method == "GET":
+                matches = [position._raw for position in broker.list_positions() if position.symbol == ident.upper()]
+                return (200, matches[0]) if matches else (404, {"code": 40410000, "message": "position does not exist"})
+            if method == "DELETE" and ident is not None:
+                return 200, broker.close_position(ident)._raw
+        if resource == "orders":
+            if method == "POST" and ident is None:
+                order = dict(body)
+                return 200, broker.submit_order(
+                    order.pop("symbol"), order.pop("qty"), order.pop("side"), order.pop("type"), order.pop("time_in_force"), **order
+                )._raw
+            if method == "GET" and ident is None:
+                return 200, [order._raw for order in broker.list_orders(status=query.get("status", ["open"])[0])]
+            if method == "GET":
+                return 200, broker.get_order(ident)._raw
+            if method == "DELETE":
+                broker.cancel_order(ident)
+                return 204, None
+            if method == "PATCH":
+                return 200, broker.replace_order(ident, **body)._raw
+        return 404, {"code": 40410000, "message": "endpoint not found"}
+
+    def handle(self, method, raw_path, body):
+        with self.stats_lock:
+            self.requests += 1
+        if self.latency or self.jitter:
+            time.sleep(max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter)))
+
+        allowed, remaining, reset = self.limiter.take()
+        headers = {"X-RateLimit-Limit": str(self.limiter.per_minute), "X-RateLimit-Remaining": str(remaining), "X-RateLimit-Reset": str(reset)}
+        if not allowed:
+            with self.stats_lock:
+                self.throttled += 1
+            return 429, {"code": 42910000, "message": "rate limit exceeded"}, headers
+        if self.error_rate and self.random.random() < self.error_rate:
+            with self.stats_lock:
+                self.injected_errors += 1
+            return self.random.choice((500, 502, 503)), {"code": 50010000, "message": "injected error"}, headers
+
+        url = urlparse(raw_path)
+        try:
+            with self.broker.lock:
+                status, payload = self.route(method, url.path, parse_qs(url.query), body)
+        except APIError as e:
+            # Alpaca error codes start with the HTTP status: 40410000 -> 404
+            status, payload = e.code // 100000, {"code": e.code, "message": str(e)}
+        except (KeyError, TypeError, ValueError) as e:
+            status, payload = 422, {"code": 40010001, "message": f"invalid request: {e}"}
+        return status, payload, headers
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _dispatch(self, method):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else {}
+                status, payload, headers = server.handle(method, self.path, body)
+                data = json.dumps(payload).encode() if payload is not None else b""
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._dispatch("GET")
+
+            def do_POST(self):
+                self._dispatch("POST")
+
+            def do_PATCH(self):
+                self._dispatch("PATCH")
+
+            def do_DELETE(self):
+                self._dispatch("DELETE")
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="fake-alpaca", daemon=True)
+        self._thread.start()
+        logger.info(f"🧪 [FAKE ALPACA] Listening on {self.url}")
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def get_stats(self):
+        with self.stats_lock:
+            return {"requests": self.requests, "throttled": self.throttled, "injected_errors": self.injected_errors}
+
+def add_server_arguments(arg_parser):
+    arg_parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    arg_parser.add_argument("--jitter", type=float, default=0.0, help="+/- seconds of random latency")
+    arg_parser.add_argument("--rate-limit", type=int, default=200, help="requests per minute before 429s (0 = unlimited)")
+    arg_parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with a 5xx")
+    arg_parser.add_argument("--partial-fill-rate", type=float, default=0.0, help="fraction of fills split in two")
+    arg_parser.add_argument("--partial-fill-delay", type=float, default=1.0, help="seconds until the rest of a partial fill")
+    arg_parser.add_argument("--cash", type=float, default=100_000.0)
+    arg_parser.add_argument("--seed", type=int)
+
+def server_from_args(args, port=0):
+    broker = SimulatedBroker(cash=args.cash, partial_fill_rate=args.partial_fill_rate,
+                             partial_fill_delay=args.partial_fill_delay, seed=args.seed)
+    return FakeAlpacaServer(broker, port=port, latency=args.latency, jitter=args.jitter,
+                            rate_limit=args.rate_limit, error_rate=args.error_rate, seed=args.seed)
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--port", type=int, default=8765)
+    add_server_arguments(arg_parser)
+    args = arg_parser.parse_args(argv)
+
+    configure_logging("INFO")
+    server = server_from_args(args, port=args.port).start()
+    try:
+        while True:
+            time.sleep(60)
+            logger.info(f"🧪 [FAKE ALPACA] {server.get_stats()}")
+    except KeyboardInterrupt:
+        server.stop()
+
+if __name__ == "__main__":
+    main()
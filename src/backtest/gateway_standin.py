@@ -0,0 +1,156 @@
+"""Local stand-in for a Discord-gateway-shaped websocket, for driving GatewaySource without Discord.
+
+Speaks the subset GatewaySource uses: HELLO on connect, READY after IDENTIFY, heartbeat ACKs and
+MESSAGE_CREATE dispatches. Messages come from a JSONL file (same rows as the backtest fixtures:
+{"channel", "content", "t"?}) replayed at --speed, or from publish() when used in-process.
+Point the bot at it with MESSAGE_SOURCE=gateway MESSAGE_GATEWAY_URL=ws://127.0.0.1:<port>.
+
+Run from the repo root:  python -m src.backtest.gateway_standin --messages benchmarks/fixtures/backtest_messages.jsonl [--port 8799] [--speed 60]
+"""
+import os
+import json
+import time
+import asyncio
+import logging
+import argparse
+import itertools
+import threading
+import importlib
+import datetime as dt
+
+# message_sources imports config.py, which refuses to import without credentials; the stand-in never uses them
+for name in ("DISCORD_EMAIL", "DISCORD_PASSWORD", "ALPACA_API_KEY", "ALPACA_API_SECRET"):
+    os.environ.setdefault(name, "gateway-standin")
+os.environ.setdefault("ALPACA_BASE_URL", "http://127.0.0.1:0")
+
+from src.main.logging_setup import configure_logging
+from src.main.message_sources import channel_key, parse_timestamp
+from src.main.message_extraction import timestamp_to_snowflake
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_INTERVAL_MS = 41250
+
+class GatewayStandin:
+    def __init__(self, host="127.0.0.1", port=8799, heartbeat_interval=HEARTBEAT_INTERVAL_MS):
+        self.host = host
+        self.port = port
+        self.heartbeat_interval = heartbeat_interval
+        self.clients = set()
+        self.sequence = itertools.count(1)
+        self.ids = itertools.count()
+        self.loop = None
+        self.server = None
+        self.ready = threading.Event()
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"ws://{self.host}:{self.port}"
+
+    async def handler(self, websocket, path=None):
+        # path is only passed by older websockets releases
+        await websocket.send(json.dumps({"op": 10, "d": {"heartbeat_interval": self.heartbeat_interval}}))
+        try:
+            async for raw in websocket:
+                event = json.loads(raw)
+                if event.get("op") == 2:
+                    self.clients.add(websocket)
+                    await websocket.send(json.dumps({"op": 0, "t": "READY", "s": next(self.sequence), "d": {"v": 10}}))
+                elif event.get("op") == 1:
+                    await websocket.send(json.dumps({"op": 11}))
+        finally:
+            self.clients.discard(websocket)
+
+    def message_payload(self, channel, content, posted_at=None, author="standin"):
+        posted_at = posted_at or time.time()
+        return {
+            "id": timestamp_to_snowflake(posted_at, next(self.ids)),
+            "channel_id": channel_key(channel),
+            "content": content,
+            "author": {"username": author},
+            "timestamp": dt.datetime.fromtimestamp(posted_at, dt.timezone.utc).isoformat(),
+        }
+
+    async def _broadcast(self, payload):
+        event = json.dumps({"op": 0, "t": "MESSAGE_CREATE", "s": next(self.sequence), "d": payload})
+        for websocket in list(self.clients):
+            try:
+                await websocket.send(event)
+            except Exception as e:
+                logger.warning(f"⚠️ [STANDIN] Dropping client: {e}")
+                self.clients.discard(websocket)
+
+    def publish(self, channel, content, posted_at=None, author="standin"):
+        """Thread-safe: sends a MESSAGE_CREATE to every identified client."""
+        payload = self.message_payload(channel, content, posted_at, author)
+        asyncio.run_coroutine_threadsafe(self._broadcast(payload), self.loop).result()
+        return payload
+
+    async def _serve(self):
+        import websockets
+
+        self.server = await websockets.serve(self.handler, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.ready.set()
+        await self.server.wait_closed()
+
+    def start(self):
+        """Serves on a background thread; port=0 picks a free port."""
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_until_complete, args=(self._serve(),), name="gateway-standin", daemon=True)
+        self._thread.start()
+        self.ready.wait()
+        logger.info(f"✅ [STANDIN] Gateway stand-in listening on {self.url}")
+        return self
+
+    def stop(self):
+        if self.server is not None:
+            self.loop.call_soon_threadsafe(self.server.close)
+
+def resolve_channel(channel):
+    """Fixture rows may name the scraper module (e.g. "daytrade_scalps") instead of the channel url."""
+    if "/" in channel or channel.isdigit():
+        return channel
+    try:
+        return importlib.import_module(f"src.scrapers.{channel}").DISCORD_CHANNEL
+    except (ImportError, AttributeError):
+        return channel
+
+def replay(standin, path, speed=1.0):
+    """Publishes the file's rows in order, spaced by their "t" offsets divided by speed (rows without one go out at once)."""
+    with open(path, encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+
+    first = next((parse_timestamp(row["t"]) for row in rows if row.get("t") is not None), None)
+    started = time.monotonic()
+    for row in rows:
+        if first is not None and row.get("t") is not None and speed:
+            time.sleep(max(0.0, started + (parse_timestamp(row["t"]) - first) / speed - time.monotonic()))
+        standin.publish(resolve_channel(row["channel"]), row["content"], author=row.get("author") or "standin")
+    return len(rows)
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--messages", help="JSONL callouts to replay once a client has identified")
+    arg_parser.add_argument("--host", default="127.0.0.1")
+    arg_parser.add_argument("--port", type=int, default=8799)
+    arg_parser.add_argument("--speed", type=float, default=1.0, help="replay speed multiplier (0 = as fast as possible)")
+    args = arg_parser.parse_args(argv)
+
+    configure_logging("INFO")
+    standin = GatewayStandin(args.host, args.port).start()
+
+    try:
+        if args.messages:
+            while not standin.clients:
+                time.sleep(0.2)
+            count = replay(standin, args.messages, args.speed)
+            logger.info(f"📨 [STANDIN] Replayed {count} messages")
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        standin.stop()
+
+if __name__ == "__main__":
+    main()
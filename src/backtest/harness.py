@@ -0,0 +1,225 @@
+"""Replays recorded Discord callouts and quotes through the real parser and execution code.
+
+Orders go to an in-memory SimulatedBroker, and time runs on a VirtualClock, so fill timeouts and
+trigger waits cost no real time. Messages are JSONL rows {"t" or "timestamp", "channel", "content"}.
+Quotes use the ReplayQuoteTransport format {"t", "symbol", "bid", "ask"} and must be sorted by t.
+
+Run from the repo root:
+    python -m src.backtest.harness --messages callouts.jsonl --quotes quotes.jsonl [--fills fills.jsonl]
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import datetime as dt
+from collections import defaultdict
+
+# config.py refuses to import without credentials; the backtest never talks to Alpaca or Discord.
+# The base URL must still parse as http(s), or tradeapi.REST refuses it at import.
+for name in ("DISCORD_EMAIL", "DISCORD_PASSWORD", "ALPACA_API_KEY", "ALPACA_API_SECRET"):
+    os.environ.setdefault(name, "backtest")
+os.environ.setdefault("ALPACA_BASE_URL", "http://127.0.0.1:0")
+
+from src.main.logging_setup import configure_logging
+
+# Configure before the trading modules import, so their import-time log lines stay quiet too
+configure_logging("WARNING")
+
+from src.backtest.broker import SimulatedBroker, contract_multiplier
+from src.backtest.clock import VirtualClock
+from src.scrapers.trade_parser import ENTRY_TYPES, EXIT_TYPES
+from src.trading.alpaca_client import api
+from src.trading.clock import RealClock, set_clock
+from src.trading.order_chaser import OrderChaser
+from src.trading.signal_coalescer import SignalCoalescer
+from config import SIGNAL_COALESCE_WINDOW
+from src.trading.position_cache import PositionCache
+from src.trading.account_cache import AccountCache
+from src.trading.order_tracker import OrderTracker
+from src.trading.trigger_book import TriggerBook
+from src.trading.execute_trade import handle_trade_entry, handle_trade_exit
+from src.scrapers.callouts import parse_trade_message
+
+logger = logging.getLogger(__name__)
+
+class BacktestOrderTracker(OrderTracker):
+    """Updates arrive synchronously from the broker; there is nothing to poll or stream."""
+
+    def start(self):
+        pass
+
+    def _start_poller(self):
+        pass
+
+class BacktestTriggerBook(TriggerBook):
+    """Evaluated synchronously by the harness after every message and quote instead of on a thread."""
+
+    def start(self):
+        pass
+
+    def notify(self):
+        pass
+
+def load_jsonl(path):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def record_time(row):
+    if row.get("t") is not None:
+        return float(row["t"])
+    return dt.datetime.fromisoformat(row["timestamp"].replace("Z", "+00:00")).timestamp()
+
+class Backtest:
+    def __init__(self, messages, quotes=(), cash=100_000.0, fill_without_quote=True, coalesce_window=SIGNAL_COALESCE_WINDOW):
+        self.messages = sorted(messages, key=record_time)
+        self.quotes = quotes
+        self.cash = cash
+        self.fill_without_quote = fill_without_quote
+        self.coalesce_window = coalesce_window
+        self.signals = defaultdict(int)
+        self.errors = 0
+
+    def on_quote(self, quote):
+        symbol = quote["symbol"].upper()
+        self.broker.on_quote(symbol, quote.get("bid"), quote.get("ask"))
+        if symbol in self.broker.positions:
+            self.position_cache.invalidate()
+            if self.trigger_book.triggers:
+                self.trigger_book.evaluate(time.monotonic())
+
+    def on_message(self, row):
+        channel = row.get("channel", "unknown")
+        self.broker.current_channel = channel
+        try:
+            for trade in parse_trade_message(row["content"]):
+                self.signals[channel] += 1
+                trade["channel"] = channel
+                if not self.coalescer.offer(trade):
+                    continue
+                if trade["type"] in EXIT_TYPES:
+                    handle_trade_exit(trade)
+                elif trade["type"] in ENTRY_TYPES:
+                    handle_trade_entry(trade)
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"❌ [BACKTEST] {channel} - Failed on {row['content']!r}: {e}")
+        finally:
+            self.broker.current_channel = None
+        self.position_cache.invalidate()
+        if self.trigger_book.triggers:
+            self.trigger_book.evaluate(time.monotonic())
+
+    def setup(self):
+        quotes = ((record_time(quote), quote) for quote in self.quotes)
+        start = record_time(self.messages[0]) if self.messages else time.time()
+        self.clock = VirtualClock(start, feed=quotes, on_feed=self.on_quote)
+        self.broker = SimulatedBroker(cash=self.cash, fill_without_quote=self.fill_without_quote, clock=self.clock)
+
+        set_clock(self.clock)
+        api.set_backend(self.broker, rate_per_minute=None)
+        self.position_cache = PositionCache._instance = PositionCache()
+        # Every read refreshes: the broker is in memory and its state moves with virtual, not real, time
+        AccountCache._instance = AccountCache(max_staleness={"sizing": 0, "add": 0})
+        self.order_tracker = OrderTracker._instance = BacktestOrderTracker()
+        self.trigger_book = TriggerBook._instance = BacktestTriggerBook(self.position_cache)
+        self.broker.add_listener(self.order_tracker.update)
+        # Entries are chased against the replayed quotes
+        self.chaser = OrderChaser._instance = OrderChaser(quote_source=self.broker)
+        self.coalescer = SignalCoalescer(self.coalesce_window)
+
+    def run(self):
+        self.setup()
+        started = time.perf_counter()
+        try:
+            for row in self.messages:
+                self.clock.advance_to(record_time(row))
+                self.on_message(row)
+            while self.clock.step(float("inf")):
+                pass
+        finally:
+            set_clock(RealClock())
+        self.wall_time = time.perf_counter() - started
+        return self.report()
+
+    def report(self):
+        channels = defaultdict(lambda: {"signals": 0, "fills": 0, "realized_pl": 0.0, "unrealized_pl": 0.0})
+        for channel, count in self.signals.items():
+            channels[channel]["signals"] = count
+        for fill in self.broker.fills:
+            stats = channels[fill["channel"] or "unknown"]
+            stats["fills"] += 1
+            stats["realized_pl"] += fill["realized_pl"]
+        for symbol, position in self.broker.positions.items():
+            mark = self.broker._mark(symbol, position)
+            pl = (mark - position["avg_entry_price"]) * position["qty"] * contract_multiplier(symbol)
+            channels[position["channel"] or "unknown"]["unrealized_pl"] += pl
+
+        simulated = (self.clock.time() - record_time(self.messages[0])) if self.messages else 0.0
+        return {
+            "channels": dict(channels),
+            "fills": self.broker.fills,
+            "messages": len(self.messages),
+            "signals": sum(self.signals.values()),
+            "errors": self.errors,
+            "ending_cash": self.broker.cash,
+            "open_positions": len(self.broker.positions),
+            "wall_time": self.wall_time,
+            "simulated_time": simulated,
+            "messages_per_second": len(self.messages) / self.wall_time if self.wall_time else 0.0,
+            "speedup": simulated / self.wall_time if self.wall_time else 0.0,
+            "chase": self.chaser.get_stats(),
+            "merged": self.coalescer.get_stats()["merged"],
+        }
+
+def print_report(report, out=sys.stdout):
+    print(f"Messages {report['messages']}, signals {report['signals']} ({report['merged']} merged across channels), "
+          f"fills {len(report['fills'])}, errors {report['errors']}", file=out)
+    print(f"Replayed {report['simulated_time'] / 3600:.1f}h in {report['wall_time']:.2f}s "
+          f"({report['messages_per_second']:.0f} msgs/s, {report['speedup']:.0f}x real time)", file=out)
+    print(f"{'channel':<40} {'signals':>8} {'fills':>6} {'realized':>12} {'unrealized':>12}", file=out)
+    for channel, stats in sorted(report["channels"].items()):
+        print(f"{channel[-40:]:<40} {stats['signals']:>8} {stats['fills']:>6} "
+              f"{stats['realized_pl']:>12.2f} {stats['unrealized_pl']:>12.2f}", file=out)
+    print(f"Ending cash {report['ending_cash']:.2f}, open positions {report['open_positions']}", file=out)
+    chase = report["chase"]
+    if chase["chases"]:
+        time_to_fill = chase["time_to_fill"]
+        print(f"Entries {chase['chases']}: fill rate {chase['fill_rate'] * 100:.1f}%, "
+              f"time to fill p50 {time_to_fill['p50']:.2f}s, slippage p50 {(chase['slippage_p50'] or 0) * 100:+.2f}%, "
+              f"{chase['replacements']} replacements", file=out)
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--messages", required=True, help="JSONL of recorded callouts")
+    arg_parser.add_argument("--quotes", help="JSONL of recorded quotes, sorted by t")
+    arg_parser.add_argument("--cash", type=float, default=100_000.0)
+    arg_parser.add_argument("--no-fill-without-quote", action="store_true", help="never fill orders for symbols without quotes")
+    arg_parser.add_argument("--coalesce-window", type=float, default=SIGNAL_COALESCE_WINDOW, help="cross-channel merge window in seconds (0 = off)")
+    arg_parser.add_argument("--fills", help="write every fill to this JSONL file")
+    arg_parser.add_argument("--verbose", action="store_true", help="log the execution code at INFO")
+    args = arg_parser.parse_args(argv)
+
+    if args.verbose:
+        logging.getLogger().setLevel(logging.INFO)
+
+    backtest = Backtest(
+        load_jsonl(args.messages),
+        load_jsonl(args.quotes) if args.quotes else (),
+        cash=args.cash,
+        fill_without_quote=not args.no_fill_without_quote,
+        coalesce_window=args.coalesce_window,
+    )
+    report = backtest.run()
+    print_report(report)
+
+    if args.fills:
+        with open(args.fills, "w", encoding="utf-8") as f:
+            for fill in report["fills"]:
+                f.write(json.dumps(fill) + "\n")
+
+if __name__ == "__main__":
+    main()
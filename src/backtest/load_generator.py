@@ -0,0 +1,133 @@
+"""Load test for the execution path: fires N callouts through the ExecutionQueue at a fake Alpaca server.
+
+Each signal is an "in" callout, followed by an immediate "out" for the same ticker, spread over
+--tickers underlyings so the queue shards run in parallel. By default a FakeAlpacaServer is started
+in-process; pass --url to target one that is already running.
+
+Run from the repo root:
+    python -m src.backtest.load_generator --signals 500 --concurrency 8 [--rate 300] [--latency 0.05]
+"""
+import os
+import time
+import string
+import logging
+import argparse
+import itertools
+import threading
+from collections import deque
+
+# config.py refuses to import without credentials; the client is pointed at the fake server below
+# (the base URL must still parse as http(s), or tradeapi.REST refuses it at import)
+for name in ("DISCORD_EMAIL", "DISCORD_PASSWORD", "ALPACA_API_KEY", "ALPACA_API_SECRET"):
+    os.environ.setdefault(name, "load-test")
+os.environ.setdefault("ALPACA_BASE_URL", "http://127.0.0.1:0")
+
+from src.main.logging_setup import configure_logging
+
+configure_logging("WARNING")
+
+import alpaca_trade_api as tradeapi
+from src.backtest.fake_alpaca import add_server_arguments, server_from_args
+from src.trading.alpaca_client import api, RATE_LIMIT_PER_MINUTE
+from src.trading.execution_queue import ExecutionQueue
+from src.trading.order_tracker import OrderTracker
+from src.trading.execute_trade import handle_trade_entry, handle_trade_exit, get_current_week_friday
+
+logger = logging.getLogger(__name__)
+
+def make_tickers(count):
+    return ["".join(letters) for letters in itertools.islice(itertools.product(string.ascii_uppercase, repeat=3), count)]
+
+def make_signals(count, tickers):
+    expiration = get_current_week_friday()
+    for idx in range(count):
+        ticker = tickers[idx % len(tickers)]
+        yield "entry", {"type": "in", "ticker": ticker, "expiration": expiration, "strike_price": 100.0, "option_type": "C", "option_price": 1.0}
+        yield "exit", {"type": "out", "ticker": ticker, "desired_plpc": None}
+
+class TimedHandlers:
+    """Wraps the real handlers to record how long each signal spends being executed."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.durations = {"entry": deque(), "exit": deque()}
+
+    def wrap(self, kind, handler):
+        def timed(trade):
+            started = time.perf_counter()
+            try:
+                handler(trade)
+            finally:
+                with self.lock:
+                    self.durations[kind].append(time.perf_counter() - started)
+        return timed
+
+    def summary(self, kind):
+        with self.lock:
+            samples = sorted(self.durations[kind])
+        if not samples:
+            return "n/a"
+        p50 = samples[len(samples) // 2]
+        p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+        return f"p50 {p50 * 1000:.0f}ms, p99 {p99 * 1000:.0f}ms, max {samples[-1] * 1000:.0f}ms over {len(samples)}"
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--signals", type=int, default=200, help="number of in/out callout pairs")
+    arg_parser.add_argument("--concurrency", type=int, default=4, help="execution queue workers")
+    arg_parser.add_argument("--rate", type=float, default=0.0, help="callouts per minute (0 = as fast as possible)")
+    arg_parser.add_argument("--tickers", type=int, default=50)
+    arg_parser.add_argument("--client-rate-limit", type=int, default=RATE_LIMIT_PER_MINUTE, help="client-side limiter, per minute (0 = off)")
+    arg_parser.add_argument("--url", help="existing fake or paper server to target instead of starting one")
+    add_server_arguments(arg_parser)
+    args = arg_parser.parse_args(argv)
+
+    server = None
+    url = args.url
+    if url is None:
+        server = server_from_args(args).start()
+        url = server.url
+    api.set_backend(tradeapi.REST("load-test", "load-test", url, api_version="v2"), rate_per_minute=args.client_rate_limit)
+
+    timed = TimedHandlers()
+    execution_queue = ExecutionQueue(timed.wrap("entry", handle_trade_entry), timed.wrap("exit", handle_trade_exit), workers=args.concurrency)
+    execution_queue.start()
+
+    signals = list(make_signals(args.signals, make_tickers(args.tickers)))
+    gap = 60 / args.rate if args.rate else 0.0
+    started = time.perf_counter()
+    for idx, (kind, trade) in enumerate(signals):
+        if gap:
+            time.sleep(max(0.0, started + idx * gap - time.perf_counter()))
+        execution_queue.enqueue(kind, trade)
+
+    while True:
+        stats = execution_queue.get_stats()
+        if stats["processed"] + stats["failed"] >= len(signals):
+            break
+        time.sleep(0.05)
+    elapsed = time.perf_counter() - started
+
+    print(f"{len(signals)} signals in {elapsed:.2f}s ({len(signals) / elapsed * 60:.0f}/min), "
+          f"processed {stats['processed']}, failed {stats['failed']}")
+    wait_p50 = f"{stats['wait_p50'] * 1000:.0f}ms" if stats["wait_p50"] is not None else "n/a"
+    wait_max = f"{stats['wait_max'] * 1000:.0f}ms" if stats["wait_max"] is not None else "n/a"
+    print(f"Queue wait p50 {wait_p50}, max {wait_max}")
+    print(f"Entry handling {timed.summary('entry')}")
+    print(f"Exit handling {timed.summary('exit')}")
+
+    fills = OrderTracker.get_instance().get_stats()
+    if fills["fill_latency_p50"] is not None:
+        print(f"Tracked fills {fills['fills']}: p50 {fills['fill_latency_p50'] * 1000:.0f}ms, max {fills['fill_latency_max'] * 1000:.0f}ms, "
+              f"still pending {fills['pending']}")
+
+    client = api.get_stats()
+    for name, endpoint in sorted(client["endpoints"].items()):
+        print(f"  {name:<16} {endpoint['calls']:>6} calls {endpoint['errors']:>4} errors {endpoint['retries']:>4} retries "
+              f"avg {endpoint['avg_latency'] * 1000:>6.1f}ms max {endpoint['max_latency'] * 1000:>7.1f}ms throttled {endpoint['throttled']:.2f}s")
+    if server is not None:
+        print(f"Server: {server.get_stats()}")
+        server.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+import os
+import queue
+import shutil
+import logging
+import multiprocessing
+from src.main.channel_manager import initialize_discord_session
+from src.main.discord_session import DEFAULT_PROFILE_DIR, STARTUP_CACHE_PATH, prepare_profile, startup_cache_path
+from src.main.dedupe_store import DedupeStore
+from src.main.live_monitoring import set_processed_messages
+from src.main.channel_scheduler import ChannelScheduler
+from src.main.logging_setup import configure_worker_logging, forward_process_logs
+
+logger = logging.getLogger(__name__)
+
+BASE_PROFILE_DIR = DEFAULT_PROFILE_DIR
+POOL_PROFILE_DIR = os.path.join(".browser_pool", "worker-{worker_id}")
+# Shards are disjoint by channel, so each worker keeps its own dedupe database instead of sharing one SQLite file
+POOL_DEDUPE_PATH = os.path.join("data", "processed_messages.worker-{worker_id}.db")
+
+def shard_channels(channel_scrapers, workers):
+    """Round-robin by priority so the fast channels are spread across workers."""
+    ordered = sorted(channel_scrapers, key=lambda url: -channel_scrapers[url].get("priority", 0))
+    shards = [{} for _ in range(min(workers, len(ordered)))]
+    for idx, channel_url in enumerate(ordered):
+        shards[idx % len(shards)][channel_url] = channel_scrapers[channel_url]
+    return shards
+
+def prepare_worker_profile(worker_id, base_dir=BASE_PROFILE_DIR):
+    """Copies the base profile once per worker; later restarts reuse the worker's own persistent copy."""
+    profile_dir = POOL_PROFILE_DIR.format(worker_id=worker_id)
+    if not os.path.isdir(profile_dir):
+        prepare_profile(profile_dir, seed_dir=prepare_profile(base_dir))
+        logger.info("📁 [POOL] Worker %s profile created at %s", worker_id, profile_dir)
+    # Seeded here in the parent; afterwards only the worker itself writes its copy
+    if os.path.exists(STARTUP_CACHE_PATH) and not os.path.exists(startup_cache_path(profile_dir)):
+        shutil.copyfile(STARTUP_CACHE_PATH, startup_cache_path(profile_dir))
+    return profile_dir
+
+def channel_worker(worker_id, channel_scrapers, profile_dir, signal_queue, mode, log_queue=None, log_level="INFO"):
+    """Runs in its own process: owns one Chrome, scrapes its shard and streams parsed signals back."""
+    if log_queue is not None:
+        configure_worker_logging(log_queue, log_level)
+    set_processed_messages(DedupeStore(db_path=POOL_DEDUPE_PATH.format(worker_id=worker_id)))
+    web_driver, tab_handles = initialize_discord_session(list(channel_scrapers), profile_dir=profile_dir)
+    if web_driver is None:
+        logger.error(f"❌ [POOL] Worker {worker_id} failed to start its Discord session.")
+        return
+
+    scheduler = ChannelScheduler(
+        web_driver,
+        handle_trade_entry=lambda trade: signal_queue.put(("entry", trade)),
+        handle_trade_exit=lambda trade: signal_queue.put(("exit", trade)),
+        mode=mode,
+    )
+    for channel_url, scraper in channel_scrapers.items():
+        scheduler.add_channel(channel_url, tab_handles[channel_url], **scraper)
+
+    try:
+        scheduler.run()
+    finally:
+        web_driver.quit()
+
+class BrowserPool:
+    def __init__(self, channel_scrapers, workers=2, mode="poll"):
+        self.channel_scrapers = channel_scrapers
+        self.workers = workers
+        self.mode = mode
+        # Spawn rather than fork: a forked child would inherit the parent's chromedriver sockets and locks
+        self.context = multiprocessing.get_context("spawn")
+        self.signal_queue = self.context.Queue()
+        # Workers log through the trading process's pipeline instead of each writing the log file
+        self.log_queue = self.context.Queue()
+        self.log_forwarder = None
+        self.processes = []
+
+    def start(self):
+        self.log_forwarder = forward_process_logs(self.log_queue)
+        for worker_id, shard in enumerate(shard_channels(self.channel_scrapers, self.workers)):
+            profile_dir = prepare_worker_profile(worker_id)
+            process = self.context.Process(
+                target=channel_worker,
+                args=(worker_id, shard, profile_dir, self.signal_queue, self.mode, self.log_queue, logging.getLogger().level),
+                name=f"browser-worker-{worker_id}",
+                daemon=True,
+            )
+            process.start()
+            self.processes.append(process)
+            logger.info(f"🧩 [POOL] Worker {worker_id} (pid {process.pid}) monitoring {len(shard)} channels")
+
+    def run(self, handle_trade_entry, handle_trade_exit):
+        """Consumes signals from all workers in the trading process until interrupted or every worker exits."""
+        try:
+            while any(process.is_alive() for process in self.processes):
+                try:
+                    kind, trade = self.signal_queue.get(timeout=1)
+                except queue.Empty:
+                    continue
+
+                try:
+                    if kind == "exit":
+                        handle_trade_exit(trade)
+                    else:
+                        handle_trade_entry(trade)
+                except Exception as e:
+                    logger.error(f"❌ [POOL] Failed to handle {trade.get('type')} signal for {trade.get('ticker')}: {e}")
+
+            logger.error("❌ [POOL] All browser workers exited.")
+
+        except KeyboardInterrupt:
+            logger.info("🛑 [POOL] Stopping browser pool...")
+        finally:
+            self.stop()
+
+    def stop(self):
+        for process in self.processes:
+            if process.is_alive():
+                process.terminate()
+        for process in self.processes:
+            process.join(timeout=10)
+        if self.log_forwarder is not None:
+            self.log_forwarder.stop()
+            self.log_forwarder = None
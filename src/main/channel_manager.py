@@ -1,46 +1,45 @@
-import os
 import time
 import logging
-import datetime as dt
-from discord_session import DiscordWebDriver, login_discord
+from src.main.discord_session import DiscordWebDriver, ensure_logged_in, wait_for_channel, timed_phase, format_timings, DEFAULT_PROFILE_DIR
 from config import DISCORD_EMAIL, DISCORD_PASSWORD
 
-# Configure logging with daily log files and console output
-log_filename = os.path.join("logs", dt.datetime.now().strftime("trading_bot_%Y-%m-%d.log"))
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(log_filename, encoding="utf-8"),
-        logging.StreamHandler()
-    ]
-)
-
 logger = logging.getLogger(__name__)
 
-def initialize_discord_session(channels):
+def initialize_discord_session(channels, profile_dir=DEFAULT_PROFILE_DIR):
     if not DISCORD_EMAIL or not DISCORD_PASSWORD:
         logger.error("❌ Missing Discord credentials! Check your .env file.")
         return None, None
     
     logger.info("🔑 [MANAGER] Logging into Discord...")
+    started = time.perf_counter()
     
     try:
-        web_driver = DiscordWebDriver.get_instance()
+        web_driver = DiscordWebDriver.get_instance(profile_dir)
         driver = web_driver.get_driver()
-        time.sleep(2)
-        login_discord()
+        timings = web_driver.startup_timings
+
+        with timed_phase(timings, "login"):
+            session = ensure_logged_in(driver)
+        if session is None:
+            logger.error("❌ [MANAGER] Could not establish a Discord session.")
+            web_driver.quit()
+            return None, None
+        logger.info(f"🔑 [MANAGER] Discord session from {session}")
 
         tab_handles = {}
-        for channel_url in channels:
-            driver.execute_script("window.open('');")
-            driver.switch_to.window(driver.window_handles[-1])
-            driver.get(channel_url)
-            tab_handles[channel_url] = driver.current_window_handle
+        with timed_phase(timings, "open_tabs"):
+            for channel_url in channels:
+                driver.execute_script("window.open('');")
+                driver.switch_to.window(driver.window_handles[-1])
+                driver.get(channel_url)
+                tab_handles[channel_url] = driver.current_window_handle
+                if not wait_for_channel(driver):
+                    logger.warning(f"⚠️ [MANAGER] {channel_url} did not finish loading; scraping will retry")
 
         logger.info(f"📝 [MANAGER] Tab Handles Assigned: {tab_handles}")
+        logger.info(f"⏱️ [MANAGER] Startup took {time.perf_counter() - started:.2f}s: {format_timings(timings)}")
         return web_driver, tab_handles
 
     except Exception as e:
         logger.error(f"❌ [MANAGER] Failed to initialize Discord session: {e}")
-        return None, None
\ No newline at end of file
+        return None, None
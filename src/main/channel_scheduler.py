@@ -0,0 +1,156 @@
+import time
+import heapq
+import logging
+import threading
+from src.main.live_monitoring import read_channel, dispatch_trade_signals, get_processed_messages, get_detection_latency_stats
+from src.main.message_sources import SeleniumTabSource
+
+logger = logging.getLogger(__name__)
+
+class ChannelScheduler:
+    """Time-slices every channel of one MessageSource from one loop; by default the tabs of the shared DiscordWebDriver.
+
+    Tab switches only happen under driver_lock; anything else that touches the driver must take it too.
+    In push mode every channel is drained each push_interval instead of on its own poll interval:
+    a drain only returns what the page's observer queued, so a short tick is cheap.
+    """
+
+    def __init__(self, web_driver, handle_trade_entry, handle_trade_exit, mode="poll", report_interval=60, reporters=(), source=None,
+                 push_interval=0.25):
+        self.web_driver = web_driver
+        self.source = source or SeleniumTabSource(mode=mode)
+        self.handle_trade_entry = handle_trade_entry
+        self.handle_trade_exit = handle_trade_exit
+        self.mode = mode
+        self.push_interval = push_interval
+        self.report_interval = report_interval
+        # Extra log_stats-style callables (e.g. the execution queue) run alongside the channel report
+        self.reporters = list(reporters)
+        self.driver_lock = threading.RLock()
+        self.channels = {}
+        self._schedule = []
+        self._sequence = 0
+        self._running = False
+
+    def add_channel(self, channel_url, tab_handle, parse_trade_message, scraper_name=None, interval=5, priority=0, budget=2.0):
+        """interval: target seconds between polls (push_interval in push mode); budget: poll time after which the channel is flagged as slow."""
+        if self.mode == "push":
+            interval = min(interval, self.push_interval)
+        self.channels[channel_url] = {
+            "scraper_name": scraper_name or channel_url,
+            "parse_trade_message": parse_trade_message,
+            "interval": interval,
+            "priority": priority,
+            "budget": budget,
+            "polls": 0,
+            "over_budget": 0,
+            "first_poll": None,
+            "last_poll": None,
+            "total_lag": 0.0,
+            "max_lag": 0.0,
+            "total_poll_time": 0.0,
+        }
+        self.source.add_channel(channel_url, tab_handle)
+        self._push(time.monotonic(), channel_url)
+
+    def _push(self, due, channel_url):
+        # The sequence number keeps ordering stable between channels with equal due time and priority
+        self._sequence += 1
+        heapq.heappush(self._schedule, (due, -self.channels[channel_url]["priority"], self._sequence, channel_url))
+
+    def poll(self, channel_url):
+        channel = self.channels[channel_url]
+        if not self.source.uses_browser:
+            return read_channel(self.source, channel_url, channel["parse_trade_message"], channel["scraper_name"])
+        with self.driver_lock:
+            return read_channel(self.source, channel_url, channel["parse_trade_message"], channel["scraper_name"])
+
+    def run_once(self):
+        """Polls the next due channel, sleeping until it is due. Returns the channel url."""
+        due, _, _, channel_url = heapq.heappop(self._schedule)
+        now = time.monotonic()
+        if due > now:
+            time.sleep(due - now)
+            now = time.monotonic()
+
+        channel = self.channels[channel_url]
+        lag = now - due
+
+        try:
+            trade_signals = self.poll(channel_url)
+            dispatch_trade_signals(trade_signals, channel["scraper_name"], self.handle_trade_entry, self.handle_trade_exit)
+        except Exception as e:
+            logger.error(f"❌ [SCHEDULER] {channel['scraper_name']} - Poll failed: {e}")
+
+        finished = time.monotonic()
+        poll_time = finished - now
+        channel["polls"] += 1
+        channel["first_poll"] = channel["first_poll"] or now
+        channel["last_poll"] = finished
+        channel["total_lag"] += lag
+        channel["max_lag"] = max(channel["max_lag"], lag)
+        channel["total_poll_time"] += poll_time
+        if poll_time > channel["budget"]:
+            channel["over_budget"] += 1
+            logger.warning(f"🐢 [SCHEDULER] {channel['scraper_name']} - Poll took {poll_time:.2f}s (budget {channel['budget']:.2f}s)")
+
+        # Reschedule from the previous due time, but never in the past, so a slow poll does not cause a burst
+        self._push(max(due + channel["interval"], finished), channel_url)
+        return channel_url
+
+    def get_stats(self):
+        stats = {}
+        for channel_url, channel in self.channels.items():
+            polls = channel["polls"]
+            elapsed = (channel["last_poll"] - channel["first_poll"]) if polls > 1 else None
+            stats[channel_url] = {
+                "scraper_name": channel["scraper_name"],
+                "polls": polls,
+                "poll_frequency": (polls - 1) / elapsed if elapsed else 0.0,
+                "avg_lag": channel["total_lag"] / polls if polls else 0.0,
+                "max_lag": channel["max_lag"],
+                "avg_poll_time": channel["total_poll_time"] / polls if polls else 0.0,
+                "over_budget": channel["over_budget"],
+            }
+        return stats
+
+    def log_stats(self):
+        for channel_url, stats in self.get_stats().items():
+            logger.info("📈 [SCHEDULER] %s - %.2f polls/s, avg lag %.2fs, max lag %.2fs, avg poll %.2fs, over budget %s",
+                        stats['scraper_name'], stats['poll_frequency'], stats['avg_lag'], stats['max_lag'],
+                        stats['avg_poll_time'], stats['over_budget'])
+            detection = get_detection_latency_stats(channel_url)
+            if detection:
+                logger.info("⏱️ [SCHEDULER] %s - Detection latency p50 %.2fs, p99 %.2fs, max %.2fs over %s messages",
+                            stats['scraper_name'], detection['p50'], detection['p99'], detection['max'], detection['count'])
+        dedupe = get_processed_messages().stats()
+        logger.info(f"🗃️ [SCHEDULER] Dedupe store: {dedupe['size']} entries, {dedupe['hits']} hits, "
+                    f"{dedupe['misses']} misses, {dedupe['evictions']} evictions")
+        for reporter in self.reporters:
+            reporter()
+
+    def run(self):
+        if not self.channels:
+            logger.error("❌ [SCHEDULER] No channels registered.")
+            return
+
+        logger.info(f"🔴 [SCHEDULER] Monitoring {len(self.channels)} channels ({self.mode} mode, {type(self.source).__name__})...")
+        self.source.start()
+        self._running = True
+        last_report = time.monotonic()
+
+        try:
+            while self._running:
+                self.run_once()
+                if time.monotonic() - last_report >= self.report_interval:
+                    self.log_stats()
+                    last_report = time.monotonic()
+
+        except KeyboardInterrupt:
+            logger.info("🛑 [SCHEDULER] Stopping channel scheduler...")
+        finally:
+            self.source.stop()
+            self.log_stats()
+
+    def stop(self):
+        self._running = False
@@ -0,0 +1,155 @@
+import os
+import time
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = os.path.join("data", "processed_messages.db")
+
+class DedupeStore:
+    """Per-channel LRU/TTL set of processed message keys, backed by SQLite so it survives restarts.
+
+    Membership checks hit an in-memory OrderedDict; SQLite is only written on insert/evict
+    and read once at startup. Channel watermarks are persisted alongside. Writes are committed
+    in batches at most commit_interval seconds after the first uncommitted one (and on close),
+    so a poll that records many messages pays for one commit instead of one per message.
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, max_entries=5000, ttl=7 * 24 * 3600, commit_interval=1.0):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.commit_interval = commit_interval
+        self.lock = threading.Lock()
+        self._flush_timer = None
+        self.closed = False
+        self.channels = {}
+        self.watermarks = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS processed (channel TEXT, key TEXT, seen_at REAL, PRIMARY KEY (channel, key))")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS watermarks (channel TEXT PRIMARY KEY, message_id TEXT)")
+        self.conn.commit()
+        self._load()
+
+    def _load(self):
+        started = time.perf_counter()
+        cutoff = time.time() - self.ttl
+        with self.lock:
+            self.conn.execute("DELETE FROM processed WHERE seen_at < ?", (cutoff,))
+            for channel, key, seen_at in self.conn.execute("SELECT channel, key, seen_at FROM processed ORDER BY seen_at"):
+                self.channels.setdefault(channel, OrderedDict())[key] = seen_at
+            for channel, message_id in self.conn.execute("SELECT channel, message_id FROM watermarks"):
+                self.watermarks[channel] = int(message_id)
+            self.conn.commit()
+            evicted = []
+            for channel, entries in self.channels.items():
+                evicted.extend(self._evict(channel, entries, time.time()))
+            self._delete(evicted)
+
+        logger.info(f"🗃️ [DEDUPE] Loaded {self.size()} processed messages for {len(self.channels)} channels "
+                    f"in {(time.perf_counter() - started) * 1000:.1f}ms")
+
+    def _evict(self, channel, entries, now):
+        evicted = []
+        while entries:
+            key, seen_at = next(iter(entries.items()))
+            if len(entries) <= self.max_entries and now - seen_at <= self.ttl:
+                break
+            entries.popitem(last=False)
+            evicted.append((channel, key))
+        self.evictions += len(evicted)
+        return evicted
+
+    def _delete(self, evicted):
+        if evicted:
+            self.conn.executemany("DELETE FROM processed WHERE channel = ? AND key = ?", evicted)
+            self._schedule_commit()
+
+    def _schedule_commit(self):
+        # Called under self.lock; the first uncommitted write arms the timer, later ones ride along
+        if not self.commit_interval:
+            self.conn.commit()
+            return
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.commit_interval, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def flush(self):
+        """Commits pending writes now."""
+        with self.lock:
+            self._flush_timer = None
+            if not self.closed:
+                self.conn.commit()
+
+    def contains(self, channel, key):
+        with self.lock:
+            entries = self.channels.get(channel)
+            if entries is not None and key in entries:
+                entries.move_to_end(key)
+                self.hits += 1
+                return True
+            self.misses += 1
+            return False
+
+    def add(self, channel, key):
+        now = time.time()
+        with self.lock:
+            entries = self.channels.setdefault(channel, OrderedDict())
+            entries[key] = now
+            entries.move_to_end(key)
+            self.conn.execute("INSERT OR REPLACE INTO processed (channel, key, seen_at) VALUES (?, ?, ?)", (channel, key, now))
+            self._schedule_commit()
+            self._delete(self._evict(channel, entries, now))
+
+    def check_and_add(self, channel, key):
+        """Returns True if the key was already processed; otherwise records it and returns False."""
+        if self.contains(channel, key):
+            return True
+        self.add(channel, key)
+        return False
+
+    def get_watermark(self, channel):
+        with self.lock:
+            return self.watermarks.get(channel)
+
+    def set_watermark(self, channel, message_id):
+        with self.lock:
+            self.watermarks[channel] = int(message_id)
+            self.conn.execute("INSERT OR REPLACE INTO watermarks (channel, message_id) VALUES (?, ?)", (channel, str(message_id)))
+            self._schedule_commit()
+
+    def size(self, channel=None):
+        if channel is not None:
+            return len(self.channels.get(channel, ()))
+        return sum(len(entries) for entries in self.channels.values())
+
+    def stats(self):
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": self.size(),
+                "channels": {channel: len(entries) for channel, entries in self.channels.items()},
+            }
+
+    def close(self):
+        with self.lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            self.conn.commit()
+            self.conn.close()
+            self.closed = True
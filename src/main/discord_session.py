@@ -1,33 +1,126 @@
 import time
 import os
+import json
+import shutil
 import logging
+from contextlib import contextmanager
 from selenium import webdriver
+from selenium.common.exceptions import SessionNotCreatedException
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from fake_useragent import UserAgent
-from config import DISCORD_EMAIL, DISCORD_PASSWORD
+from config import DISCORD_EMAIL, DISCORD_PASSWORD, FAST_START, CHROMEDRIVER_PATH, DISCORD_USER_AGENT
 
 logger = logging.getLogger(__name__)
 
+# Checked-in seed profile; Chrome never runs on it directly, since it rewrites the tracked files on every start
+SEED_PROFILE_DIR = "selenium"
+
+# Persistent Chrome profile (cookies, cache, service workers) reused across restarts, seeded from SEED_PROFILE_DIR
+DEFAULT_PROFILE_DIR = os.path.join("data", "chrome_profile")
+
+# Chrome refuses to start on a profile copied while another instance held these
+PROFILE_LOCK_FILES = ("SingletonLock", "SingletonCookie", "SingletonSocket", "lockfile")
+
+# Resolved chromedriver path and pinned User-Agent, so a restart needs no network lookups
+STARTUP_CACHE_PATH = os.path.join("data", "browser_startup.json")
+# Other profiles (the pool's workers) keep their own copy inside the profile, so no two processes write one file
+PROFILE_STARTUP_CACHE = "browser_startup.json"
+
+# Used when fake_useragent cannot produce one (offline or its data source is down)
+FALLBACK_USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                       "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36")
+
+@contextmanager
+def timed_phase(timings, name):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = time.perf_counter() - started
+
+def format_timings(timings):
+    return ", ".join(f"{name} {seconds:.2f}s" for name, seconds in timings.items())
+
+def startup_cache_path(profile_dir=None):
+    if not profile_dir or os.path.abspath(profile_dir) == os.path.abspath(DEFAULT_PROFILE_DIR):
+        return STARTUP_CACHE_PATH
+    return os.path.join(profile_dir, PROFILE_STARTUP_CACHE)
+
+def load_startup_cache(path=STARTUP_CACHE_PATH):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_startup_cache(cache, path=STARTUP_CACHE_PATH):
+    # Write then rename, so a reader never sees a half-written file
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp_path, path)
+
+def prepare_profile(profile_dir, seed_dir=SEED_PROFILE_DIR):
+    """Copies the seed profile to profile_dir the first time; later starts reuse the copy."""
+    if not os.path.isdir(profile_dir) and os.path.isdir(seed_dir):
+        shutil.copytree(seed_dir, profile_dir, ignore=shutil.ignore_patterns(*PROFILE_LOCK_FILES))
+        logger.info("📁 [MANAGER] Chrome profile created at %s from %s", profile_dir, seed_dir)
+    return profile_dir
+
+def install_chromedriver():
+    # Imported lazily: webdriver_manager is only needed when the cached driver is missing or stale
+    from webdriver_manager.chrome import ChromeDriverManager
+    return ChromeDriverManager().install()
+
+def random_user_agent():
+    try:
+        from fake_useragent import UserAgent
+        return UserAgent().random
+    except Exception as e:
+        logger.warning("⚠️ [MANAGER] fake_useragent unavailable (%s); using the built-in User-Agent", e)
+        return FALLBACK_USER_AGENT
+
+def resolve_chromedriver(cache, refresh=False, cache_path=STARTUP_CACHE_PATH):
+    """CHROMEDRIVER_PATH, else the cached path if it still exists, else a fresh webdriver_manager install."""
+    if CHROMEDRIVER_PATH:
+        return CHROMEDRIVER_PATH
+    cached = cache.get("driver_path")
+    if not refresh and cached and os.access(cached, os.X_OK):
+        return cached
+    cache["driver_path"] = install_chromedriver()
+    save_startup_cache(cache, cache_path)
+    return cache["driver_path"]
+
+def resolve_user_agent(cache, cache_path=STARTUP_CACHE_PATH):
+    if DISCORD_USER_AGENT:
+        return DISCORD_USER_AGENT
+    if not cache.get("user_agent"):
+        cache["user_agent"] = random_user_agent()
+        save_startup_cache(cache, cache_path)
+    return cache["user_agent"]
+
 class DiscordWebDriver:
     _instance = None
 
     @staticmethod
-    def get_instance():
+    def get_instance(profile_dir=None):
         if DiscordWebDriver._instance is None:
-            DiscordWebDriver._instance = DiscordWebDriver()
+            DiscordWebDriver._instance = DiscordWebDriver(profile_dir)
         return DiscordWebDriver._instance
     
-    def __init__(self):
+    def __init__(self, profile_dir=None):
         if DiscordWebDriver._instance is not None:
             raise Exception("WebDriver instance already exists! Use geT_instance().")
         
-        logging.info("🚀 Initializing Selenium WebDriver...")
+        logger.info("🚀 Initializing Selenium WebDriver%s...", ' (fast start)' if FAST_START else '')
+        self.startup_timings = {}
+        cache_path = startup_cache_path(profile_dir)
+        cache = load_startup_cache(cache_path) if FAST_START else {}
 
         # ✅ Configure Selenium WebDriver
         chrome_options = Options()
@@ -36,40 +129,171 @@ class DiscordWebDriver:
         chrome_options.add_argument("--disable-dev-shm-usage")
         chrome_options.add_argument("--disable-blink-features=AutomationControlled")
         chrome_options.add_argument("--disable-gpu")
+        if profile_dir:
+            chrome_options.add_argument(f"--user-data-dir={os.path.abspath(prepare_profile(profile_dir))}")
 
-        # ✅ Set a Random User-Agent
-        ua = UserAgent()
-        random_user_agent = ua.random
-        chrome_options.add_argument(f"user-agent={random_user_agent}")
+        # ✅ Pinned User-Agent in fast-start mode (a stable UA also keeps the profile's session valid), random otherwise
+        with timed_phase(self.startup_timings, "user_agent"):
+            user_agent = resolve_user_agent(cache, cache_path) if FAST_START else random_user_agent()
+        chrome_options.add_argument(f"user-agent={user_agent}")
 
-        # ✅ Initialize WebDriver
-        self.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
+        with timed_phase(self.startup_timings, "resolve_driver"):
+            driver_path = resolve_chromedriver(cache, cache_path=cache_path) if FAST_START else install_chromedriver()
+
+        # ✅ Initialize WebDriver. A cached driver that no longer matches an updated Chrome is re-resolved once.
+        with timed_phase(self.startup_timings, "launch_browser"):
+            try:
+                self.driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+            except SessionNotCreatedException as e:
+                if not FAST_START or CHROMEDRIVER_PATH:
+                    raise
+                logger.warning("⚠️ [MANAGER] Cached chromedriver rejected (%s). Re-resolving...", e.msg)
+                self.driver = webdriver.Chrome(service=Service(resolve_chromedriver(cache, refresh=True, cache_path=cache_path)), options=chrome_options)
         self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-        logging.info(f"🛡️  [MANAGER] Using User-Agent: {random_user_agent}")
+        logger.info("🛡️  [MANAGER] Using User-Agent: %s", user_agent)
+        logger.info("⏱️ [MANAGER] WebDriver ready: %s", format_timings(self.startup_timings))
+
+    def get_driver(self):
+        return self.driver
 
     def quit(self):
         if self.driver:
-            logging.info("🛑 [MANAGER] Closing WebDriver...")
+            logger.info("🛑 [MANAGER] Closing WebDriver...")
             self.driver.quit()
             DiscordWebDriver._instance = None
 
-def login_discord():
+LOGIN_URL = "https://discord.com/login"
+APP_URL = "https://discord.com/channels/@me"
+
+# Saved token/cookies for restoring a session into a fresh profile (contains credentials: kept out of git)
+SESSION_PATH = os.path.join("data", "discord_session.json")
+
+# Present only once the client has loaded for an authenticated user
+LOGGED_IN_SELECTOR = 'nav[aria-label="Servers sidebar"], [data-list-id="guildsnav"]'
+CHANNEL_READY_SELECTOR = 'ol[data-list-id="chat-messages"]'
+CAPTCHA_SELECTOR = 'iframe[src*="hcaptcha"]'
+
+# Discord removes window.localStorage once the app boots; a same-origin iframe still exposes it
+READ_STORAGE_SCRIPT = """
+const frame = document.createElement('iframe');
+document.body.appendChild(frame);
+const storage = frame.contentWindow.localStorage;
+const token = storage.getItem('token');
+frame.remove();
+return token;
+"""
+
+WRITE_STORAGE_SCRIPT = """
+const frame = document.createElement('iframe');
+document.body.appendChild(frame);
+frame.contentWindow.localStorage.setItem('token', arguments[0]);
+frame.remove();
+"""
+
+def wait_for_app_state(driver, timeout):
+    """Waits until the client shows either the logged-in UI or the login form. Returns True if logged in."""
+    def settled(d):
+        if d.find_elements(By.CSS_SELECTOR, LOGGED_IN_SELECTOR):
+            return "app"
+        if "/login" in d.current_url and d.find_elements(By.NAME, "email"):
+            return "login"
+        return False
+
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=0.2).until(settled) == "app"
+    except Exception:
+        return False
+
+def is_logged_in(driver, timeout=15):
+    driver.get(APP_URL)
+    return wait_for_app_state(driver, timeout)
+
+def save_session(driver, path=SESSION_PATH):
+    try:
+        token = driver.execute_script(READ_STORAGE_SCRIPT)
+        session = {"token": token, "cookies": driver.get_cookies(), "saved_at": time.time()}
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(session, f)
+        os.chmod(path, 0o600)
+        logger.info("💾 [MANAGER] Discord session saved")
+    except Exception as e:
+        logger.warning("⚠️ [MANAGER] Could not save Discord session: %s", e)
+
+def restore_session(driver, path=SESSION_PATH):
+    """Loads a saved token and cookies into the browser. Returns True if there was anything to restore."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            session = json.load(f)
+    except (OSError, ValueError):
+        return False
+    if not session.get("token"):
+        return False
+
+    # Storage and cookies can only be set for the origin currently loaded
+    driver.get(LOGIN_URL)
+    for cookie in session.get("cookies", []):
+        try:
+            driver.add_cookie({key: value for key, value in cookie.items() if key in ("name", "value", "path", "domain", "secure", "httpOnly", "expiry")})
+        except Exception:
+            pass
+    driver.execute_script(WRITE_STORAGE_SCRIPT, session["token"])
+    logger.info("♻️ [MANAGER] Restored saved Discord session")
+    return True
+
+def login_discord(timeout=30):
+    """Types the credentials and waits until the client has loaded. Returns True once logged in."""
     try:
         web_driver = DiscordWebDriver.get_instance().get_driver()
-        web_driver.get("https://discord.com/login")
-        time.sleep(1)
+        if "/login" not in web_driver.current_url:
+            web_driver.get(LOGIN_URL)
 
         # Enter credentials (Use environment variables for security)
-        email_input = WebDriverWait(web_driver, 10).until(EC.presence_of_element_located((By.NAME, "email")))
+        email_input = WebDriverWait(web_driver, 10).until(EC.element_to_be_clickable((By.NAME, "email")))
         email_input.send_keys(DISCORD_EMAIL)
 
         password_input = web_driver.find_element(By.NAME, "password")
         password_input.send_keys(DISCORD_PASSWORD)
         password_input.send_keys(Keys.RETURN)
 
-        logging.info("✅ [MANAGER] Logged into Discord successfully!")
-        time.sleep(2)
+        def finished(d):
+            if d.find_elements(By.CSS_SELECTOR, LOGGED_IN_SELECTOR):
+                return "app"
+            if d.find_elements(By.CSS_SELECTOR, CAPTCHA_SELECTOR):
+                return "captcha"
+            return False
+
+        outcome = WebDriverWait(web_driver, timeout, poll_frequency=0.2).until(finished)
+        if outcome == "captcha":
+            logger.error("❌ [MANAGER] Discord is asking for a captcha. Log in once manually with this profile.")
+            return False
+
+        logger.info("✅ [MANAGER] Logged into Discord successfully!")
+        return True
         
     except Exception as e:
-        logger.error(f"❌ Discord login failed: {e}")
+        logger.error("❌ Discord login failed: %s", e)
+        return False
+
+def ensure_logged_in(driver):
+    """Reuses the profile's session, then a saved one, and only types credentials as a last resort.
+    Returns how the session was obtained ("profile", "restored" or "login"), or None on failure."""
+    if is_logged_in(driver):
+        logger.info("✅ [MANAGER] Profile already logged into Discord")
+        return "profile"
+
+    if restore_session(driver) and is_logged_in(driver):
+        return "restored"
 
+    logger.info("🔑 [MANAGER] No valid session found. Logging in with credentials...")
+    if not login_discord():
+        return None
+    save_session(driver)
+    return "login"
+
+def wait_for_channel(driver, timeout=10):
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.2).until(EC.presence_of_element_located((By.CSS_SELECTOR, CHANNEL_READY_SELECTOR)))
+        return True
+    except Exception:
+        return False
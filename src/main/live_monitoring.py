@@ -1,73 +1,217 @@
 import time
+import atexit
 import logging
 import hashlib
 import threading
+from collections import deque
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from discord_session import DiscordWebDriver
+from src.main.discord_session import DiscordWebDriver
+from src.main.dedupe_store import DedupeStore
+from src.metrics.latency import new_trace, stamp
+from src.scrapers.trade_parser import ENTRY_TYPES, EXIT_TYPES
+from src.main.message_sources import SeleniumTabSource
+from src.main.message_extraction import MESSAGE_XPATH, extract_messages_per_element, snowflake_to_timestamp
 
 logger = logging.getLogger(__name__)
 
-# ✅ Store processed messages per channel
-processed_messages = {}
+# ✅ Store processed messages and per-channel high-water marks (newest Discord snowflake id seen).
+# Persisted on disk so a restart does not re-trade everything still visible in the channel.
+# Opened on first use, so importing this module never creates the database.
+_processed_messages = None
 processed_messages_lock = threading.Lock()
 
+def get_processed_messages():
+    global _processed_messages
+    if _processed_messages is None:
+        with processed_messages_lock:
+            if _processed_messages is None:
+                _processed_messages = DedupeStore()
+                # Commits are batched; flush the last ones on the way out
+                atexit.register(_processed_messages.close)
+    return _processed_messages
+
+def set_processed_messages(store):
+    """Installs this process's store, e.g. a pool worker's own database for its shard of channels."""
+    global _processed_messages
+    with processed_messages_lock:
+        _processed_messages = store
+    atexit.register(store.close)
+
+# ✅ Ids already seen carrying Discord's edited marker, per channel
+edited_message_ids = {}
+
+# ✅ Recent detection latencies (seconds from message creation to the bot seeing it) per channel
+detection_latencies = {}
+DETECTION_LATENCY_SAMPLES = 500
+
 def hash_message(message_text):
     return hashlib.md5(message_text.encode()).hexdigest()
 
-def scrape_channel(channel_url, parse_trade_message, scraper_name, tab_handles):
-    driver = DiscordWebDriver.get_instance().get_driver()
-    
+def record_detection_latency(channel_url, message_id, detected_at):
+    latency = max(0.0, detected_at - snowflake_to_timestamp(message_id))
+    with processed_messages_lock:
+        detection_latencies.setdefault(channel_url, deque(maxlen=DETECTION_LATENCY_SAMPLES)).append(latency)
+    return latency
+
+def get_detection_latency_stats(channel_url):
+    with processed_messages_lock:
+        samples = sorted(detection_latencies.get(channel_url, ()))
+    if not samples:
+        return None
+    return {
+        "count": len(samples),
+        "p50": samples[len(samples) // 2],
+        "p99": samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+        "max": samples[-1],
+    }
+
+def process_new_messages(channel_url, messages, parse_trade_message, scraper_name, edited_ids=None, detected_at=None):
+    """Applies the channel watermark to extracted messages and parses the ones not seen before."""
+    processed_messages = get_processed_messages()
+    watermark = processed_messages.get_watermark(channel_url)
+
+    with processed_messages_lock:
+        # Edits keep their id, so they never pass the watermark; only note them once.
+        # The set is replaced each poll, so it stays bounded by the visible list.
+        if edited_ids is not None:
+            seen_edits = edited_message_ids.get(channel_url, set())
+            for message_id in set(edited_ids) - seen_edits:
+                if watermark is not None and int(message_id) <= watermark:
+                    logger.info("✏️ [SCRAPER] %s - Message %s was edited. Not re-parsing.", scraper_name, message_id)
+            edited_message_ids[channel_url] = set(edited_ids)
+
+    # The observer can replay nodes Discord re-renders after a scroll, so filter here as well.
+    messages = [
+        msg for msg in messages
+        if (watermark is None or int(msg["id"]) > watermark) and not processed_messages.check_and_add(channel_url, msg["id"])
+    ]
+    if messages:
+        processed_messages.set_watermark(channel_url, max(watermark or 0, *(int(msg["id"]) for msg in messages)))
+
+    trade_signals = []
+
+    for msg in messages:
+        try:
+            message_text = msg["content"]
+            # Page-side detection time (ms) in push mode, the poll time otherwise
+            seen_at = msg["detected_at"] / 1000 if msg.get("detected_at") else (detected_at or time.time())
+            latency = record_detection_latency(channel_url, msg["id"], seen_at)
+            logger.info("📩 [SCRAPER] %s - New message (%.2fs after post): %s", scraper_name, latency, message_text)
+            parsed_at = time.time()
+            for trade in parse_trade_message(message_text):
+                # Stage timestamps travel with the signal; they are recorded once it is queued
+                trade["trace"] = new_trace(channel_url, posted=snowflake_to_timestamp(msg["id"]), detected=seen_at)
+                stamp(trade, "parsed", parsed_at)
+                trade_signals.append(trade)
+
+        except Exception as e:
+            logger.error("❌ [SCRAPER] %s - Error processing message: %s", scraper_name, e)
+
+    return trade_signals
+
+def read_channel(source, channel_url, parse_trade_message, scraper_name, wait_timeout=None):
+    """Reads new messages from any MessageSource and parses them. The source never sees the parser."""
+    watermark = get_processed_messages().get_watermark(channel_url)
+
     try:
-        driver.switch_to.window(tab_handles[channel_url])
+        messages, edited_ids = source.read(channel_url, after_id=watermark, wait_timeout=wait_timeout)
     except Exception as e:
-        logger.error(f"🚨 [SCRAPER] {scraper_name} - Failed to switch tab: {e}")
+        logger.error("⚠️ [SCRAPER] %s - No messages found or error loading messages: %s", scraper_name, e)
+        if wait_timeout:
+            time.sleep(wait_timeout)
         return []
 
-    logging.info(f"🔍 [SCRAPER] {scraper_name} - Monitoring for messages")
+    return process_new_messages(channel_url, messages, parse_trade_message, scraper_name, edited_ids, detected_at=time.time())
+
+def scrape_channel(channel_url, parse_trade_message, scraper_name, tab_handles, batched=True):
+    logger.info("🔍 [SCRAPER] %s - Monitoring for messages", scraper_name)
+
+    if not batched:
+        driver = DiscordWebDriver.get_instance().get_driver()
+        try:
+            driver.switch_to.window(tab_handles[channel_url])
+        except Exception as e:
+            logger.error("🚨 [SCRAPER] %s - Failed to switch tab: %s", scraper_name, e)
+            return []
+        return scrape_channel_per_element(driver, channel_url, parse_trade_message, scraper_name)
+
+    return read_channel(SeleniumTabSource(tab_handles), channel_url, parse_trade_message, scraper_name)
+
+def drain_channel(channel_url, parse_trade_message, scraper_name, tab_handles, wait_timeout=None):
+    """Push mode: drains the channel's MutationObserver queue, falling back to a scrape if it is gone."""
+    return read_channel(SeleniumTabSource(tab_handles, mode="push"), channel_url, parse_trade_message, scraper_name, wait_timeout)
 
+def scrape_channel_per_element(driver, channel_url, parse_trade_message, scraper_name):
     try:
-        messages = WebDriverWait(driver, 10).until(
-            EC.presence_of_all_elements_located((By.XPATH, '//li[contains(@id, "chat-messages-")]'))
-        )
+        WebDriverWait(driver, 10).until(EC.presence_of_all_elements_located((By.XPATH, MESSAGE_XPATH)))
+        messages = extract_messages_per_element(driver)
     except Exception as e:
-        logging.error(f"⚠️ [SCRAPER] {scraper_name} - No messages found or error loading messages: {e}")
+        logger.error("⚠️ [SCRAPER] %s - No messages found or error loading messages: %s", scraper_name, e)
         return []
 
     trade_signals = []
 
     for msg in messages:
         try:
-            message_text = msg.find_element(By.XPATH, './/div[contains(@class, "messageContent_c19a55")]').text.strip()
+            message_text = msg["content"]
             message_hash = hash_message(message_text)
 
-            with processed_messages_lock:
-                if message_hash not in processed_messages.get(channel_url, set()):
-                    logging.info(f"📩 [SCRAPER] {scraper_name} - New message: {message_text}")
-                    processed_messages.setdefault(channel_url, set()).add(message_hash)
-                    trade_signals.extend(parse_trade_message(message_text))
+            if not get_processed_messages().check_and_add(channel_url, message_hash):
+                logger.info("📩 [SCRAPER] %s - New message: %s", scraper_name, message_text)
+                trade_signals.extend(parse_trade_message(message_text))
 
         except Exception as e:
-            logging.error(f"❌ [SCRAPER] {scraper_name} - Error processing message: {e}")
+            logger.error("❌ [SCRAPER] %s - Error processing message: %s", scraper_name, e)
 
     return trade_signals
 
-def start_live_monitoring(scraper_name, channel_url, tab_handle, parse_trade_message, handle_trade_entry, handle_trade_exit, interval=5):
-    logging.info(f"🔴 [SCRAPER] {scraper_name} - Running...")
+def dispatch_trade_signals(trade_signals, scraper_name, handle_trade_entry, handle_trade_exit):
+    if trade_signals:
+        logger.info("📊 [SCRAPER] %s -  New Trades Found:", scraper_name)
+        for trade in trade_signals:
+            if trade["type"] in EXIT_TYPES:
+                handle_trade_exit(trade)
+            elif trade["type"] in ENTRY_TYPES:
+                handle_trade_entry(trade)
+
+def start_live_monitoring(scraper_name, channel_url, tab_handle, parse_trade_message, handle_trade_entry, handle_trade_exit,
+                          interval=5, batched=True, mode="poll", push_wait=1.0, source=None):
+    """mode="poll" reads every interval seconds; mode="push" blocks on the source until messages arrive.
+
+    source is any MessageSource; by default the channel's Selenium tab (tab_handle).
+    """
+    logger.info("🔴 [SCRAPER] %s - Running (%s mode)...", scraper_name, mode)
+    tab_handles = {channel_url: tab_handle}
+    # batched=False keeps the legacy per-element scraper, which has no MessageSource
+    if source is None and batched:
+        source = SeleniumTabSource(mode=mode)
+    if source is not None:
+        source.add_channel(channel_url, tab_handle)
+        source.start()
 
     try:
         while True:
-            trade_signals = scrape_channel(channel_url, parse_trade_message, scraper_name, {channel_url: tab_handle})
-            if trade_signals:
-                logging.info(f"📊 [SCRAPER] {scraper_name} -  New Trades Found:")
-                for trade in trade_signals:
-                    if trade["type"] in ["trim", "trimming", "out", "stop"]:
-                        handle_trade_exit(trade)
-                    elif trade["type"] in ["in", "added", "unnamed", "filled"]:
-                        handle_trade_entry(trade)
+            if source is None:
+                trade_signals = scrape_channel(channel_url, parse_trade_message, scraper_name, tab_handles, batched=False)
+            else:
+                trade_signals = read_channel(source, channel_url, parse_trade_message, scraper_name,
+                                             wait_timeout=push_wait if mode == "push" else None)
+
+            dispatch_trade_signals(trade_signals, scraper_name, handle_trade_entry, handle_trade_exit)
 
-            time.sleep(interval)
+            if mode != "push":
+                time.sleep(interval)
 
     except KeyboardInterrupt:
-        logging.info(f"🛑 [SCRAPER] {scraper_name} - Stopping Live Monitoring...")
\ No newline at end of file
+        dedupe = get_processed_messages().stats()
+        logger.info("🗃️ [SCRAPER] %s - Dedupe store: %s entries, %s hits, %s misses",
+                    scraper_name, dedupe['size'], dedupe['hits'], dedupe['misses'])
+        stats = get_detection_latency_stats(channel_url)
+        if stats:
+            logger.info("⏱️ [SCRAPER] %s - Detection latency p50 %.2fs, p99 %.2fs over %s messages",
+                        scraper_name, stats['p50'], stats['p99'], stats['count'])
+        logger.info("🛑 [SCRAPER] %s - Stopping Live Monitoring...", scraper_name)
+        if source is not None:
+            source.stop()
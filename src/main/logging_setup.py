@@ -0,0 +1,189 @@
+import os
+import re
+import json
+import queue
+import atexit
+import logging
+import threading
+import datetime as dt
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+# ✅ One process-wide pipeline: callers only enqueue records; a listener thread formats them and writes
+# the console and the rotating file, so a slow disk never stalls a scraper or an order submission.
+
+TEXT_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+# "📊 [TRIGGERS] ..." -> "TRIGGERS"
+TAG_PATTERN = re.compile(r"\[([A-Z_]+)\]")
+
+# Only lines starting with this marker are periodic status; anything else (orders sent, triggers fired) is never sampled
+STATUS_MARKER = "📊"
+
+# Args that are safe to format later on the listener thread; anything else is formatted on enqueue
+DEFERRABLE_TYPES = (str, int, float, bool, type(None))
+
+# Bounds the sampler's memory when tickers keep changing
+MAX_SAMPLER_KEYS = 10000
+
+_listener = None
+_lock = threading.Lock()
+
+def parse_rate_limits(spec):
+    """"TRIGGERS=30,POSITIONS=60" -> {"TRIGGERS": 30.0, "POSITIONS": 60.0}."""
+    limits = {}
+    for item in (spec or "").split(","):
+        if "=" in item:
+            tag, seconds = item.split("=", 1)
+            limits[tag.strip().upper()] = float(seconds)
+    return limits
+
+class RateLimitFilter(logging.Filter):
+    """Samples repetitive INFO/DEBUG status lines per subsystem tag. Warnings, errors and any line not
+    starting with STATUS_MARKER always pass, so a line recording an action is never dropped.
+
+    A line is identified by its format string plus its first argument (usually the ticker), so
+    "📊 [TRIGGERS] %s ..." lets one status line through per ticker every limits["TRIGGERS"] seconds.
+    Only lines logged with %-style args can be sampled; f-strings all look different. The next line let
+    through carries the number it replaced as record.suppressed.
+    """
+
+    def __init__(self, limits):
+        super().__init__()
+        self.limits = dict(limits)
+        self.lock = threading.Lock()
+        self.state = {}
+        self.dropped = 0
+
+    def filter(self, record):
+        if (not self.limits or record.levelno >= logging.WARNING or not isinstance(record.msg, str)
+                or not record.msg.startswith(STATUS_MARKER)):
+            return True
+        tag = TAG_PATTERN.search(record.msg)
+        interval = self.limits.get(tag.group(1)) if tag else None
+        if not interval:
+            return True
+
+        key = (record.msg, record.args[0] if isinstance(record.args, tuple) and record.args else None)
+        with self.lock:
+            last, suppressed = self.state.get(key, (None, 0))
+            if last is not None and record.created - last < interval:
+                self.state[key] = (last, suppressed + 1)
+                self.dropped += 1
+                return False
+            if len(self.state) >= MAX_SAMPLER_KEYS:
+                self.state.clear()
+            self.state[key] = (record.created, 0)
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+class DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves %-style formatting to the listener thread.
+
+    The stock handler formats every record on the caller's thread. Here plain scalar args are kept
+    as they are, and only exception text and non-scalar args (which may change later) are resolved up front.
+    """
+
+    def prepare(self, record):
+        record = logging.makeLogRecord(record.__dict__)
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        if record.args and (isinstance(record.args, dict) or not all(isinstance(arg, DEFERRABLE_TYPES) for arg in record.args)):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+class TextFormatter(logging.Formatter):
+    def format(self, record):
+        line = super().format(record)
+        suppressed = getattr(record, "suppressed", 0)
+        return f"{line} (+{suppressed} similar)" if suppressed else line
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, for shipping logs to a collector."""
+
+    def format(self, record):
+        message = record.getMessage()
+        tag = TAG_PATTERN.search(message)
+        entry = {
+            "time": dt.datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "tag": tag.group(1) if tag else None,
+            "message": message,
+        }
+        if getattr(record, "suppressed", 0):
+            entry["suppressed"] = record.suppressed
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+def configure_logging(level="INFO", fmt="text", path=None, max_bytes=10 * 1024 * 1024, backups=5, rate_limits=None, console=True):
+    """Routes the root logger through a queue. fmt: "text" or "json" (applies to the file; the console stays text).
+
+    Safe to call again: the previous pipeline is flushed and replaced.
+    """
+    global _listener
+    with _lock:
+        _stop_listener()
+
+        handlers = []
+        if console:
+            stream = logging.StreamHandler()
+            stream.setFormatter(TextFormatter(TEXT_FORMAT))
+            handlers.append(stream)
+        if path:
+            if os.path.dirname(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            file_handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+            file_handler.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter(TEXT_FORMAT))
+            handlers.append(file_handler)
+
+        log_queue = queue.SimpleQueue()
+        queue_handler = DeferredQueueHandler(log_queue)
+        queue_handler.addFilter(RateLimitFilter(rate_limits or {}))
+
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(queue_handler)
+        root.setLevel(level)
+
+        _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+    return queue_handler
+
+def _stop_listener():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+def stop_logging():
+    """Drains the queue and closes the handlers. Registered at exit, so the last lines are not lost."""
+    with _lock:
+        _stop_listener()
+
+atexit.register(stop_logging)
+
+class _ForwardHandler(logging.Handler):
+    def emit(self, record):
+        logging.getLogger(record.name).handle(record)
+
+def forward_process_logs(log_queue):
+    """Parent side of worker-process logging: replays records from log_queue through this process's pipeline."""
+    listener = QueueListener(log_queue, _ForwardHandler())
+    listener.start()
+    return listener
+
+def configure_worker_logging(log_queue, level="INFO"):
+    """Child side: sends every record to the parent over a multiprocessing queue, formatted (args must pickle)."""
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(level)
@@ -0,0 +1,181 @@
+import logging
+from selenium.webdriver.common.by import By
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_XPATH = '//li[contains(@id, "chat-messages-")]'
+CONTENT_XPATH = './/div[contains(@class, "messageContent_c19a55")]'
+
+# ✅ Runs entirely in the page: one chromedriver round trip for the whole visible list.
+# Snowflake ids are returned as strings because they do not fit in a JS double.
+# arguments[0] is the channel watermark; only messages with a newer id are returned,
+# walking back from the bottom of the list so the cost is O(new messages).
+EXTRACT_MESSAGES_SCRIPT = """
+const afterId = arguments[0];
+const isNewer = (id) => afterId === null || id.length > afterId.length || (id.length === afterId.length && id > afterId);
+const messageId = (li) => li.id.split('-').pop();
+const items = document.querySelectorAll('li[id^="chat-messages-"]');
+
+let first = items.length;
+while (first > 0 && isNewer(messageId(items[first - 1]))) {
+    first--;
+}
+
+// Continuation messages have no username header; inherit it from the nearest earlier one.
+let lastAuthor = null;
+for (let i = first - 1; i >= 0 && lastAuthor === null; i--) {
+    const author = items[i].querySelector('span[class*="username_"]');
+    if (author) {
+        lastAuthor = author.textContent.trim();
+    }
+}
+
+const messages = [];
+for (let i = first; i < items.length; i++) {
+    const li = items[i];
+    const author = li.querySelector('span[class*="username_"]');
+    if (author) {
+        lastAuthor = author.textContent.trim();
+    }
+    const time = li.querySelector('time[datetime]');
+    const content = li.querySelector('div[class*="messageContent_"]');
+    messages.push({
+        id: messageId(li),
+        author: lastAuthor,
+        timestamp: time ? time.getAttribute('datetime') : null,
+        content: content ? content.innerText.trim() : '',
+        edited: li.querySelector('[class*="edited_"]') !== null,
+    });
+}
+
+const edited = [];
+for (const marker of document.querySelectorAll('li[id^="chat-messages-"] [class*="edited_"]')) {
+    edited.push(messageId(marker.closest('li')));
+}
+return {messages: messages, edited: edited};
+"""
+
+# ✅ Push mode: a MutationObserver buffers newly appended message nodes in a page-side queue.
+# Installing twice is a no-op; a page reload drops the queue, which DRAIN reports as null.
+INSTALL_OBSERVER_SCRIPT = """
+if (window.__tradingBotQueue) {
+    return true;
+}
+const list = document.querySelector('ol[data-list-id="chat-messages"]');
+if (!list) {
+    return false;
+}
+const MAX_QUEUE = 1000;
+window.__tradingBotQueue = [];
+window.__tradingBotWaiter = null;
+
+const describe = (li, detectedAt) => {
+    let author = null;
+    for (let node = li, hops = 0; node && hops < 50 && author === null; node = node.previousElementSibling, hops++) {
+        const username = node.querySelector && node.querySelector('span[class*="username_"]');
+        if (username) {
+            author = username.textContent.trim();
+        }
+    }
+    const time = li.querySelector('time[datetime]');
+    const content = li.querySelector('div[class*="messageContent_"]');
+    return {
+        id: li.id.split('-').pop(),
+        author: author,
+        timestamp: time ? time.getAttribute('datetime') : null,
+        content: content ? content.innerText.trim() : '',
+        edited: li.querySelector('[class*="edited_"]') !== null,
+        detected_at: detectedAt,
+    };
+};
+
+window.__tradingBotObserver = new MutationObserver((mutations) => {
+    const detectedAt = Date.now();
+    const queue = window.__tradingBotQueue;
+    for (const mutation of mutations) {
+        for (const node of mutation.addedNodes) {
+            if (node.nodeType === 1 && node.id && node.id.startsWith('chat-messages-')) {
+                queue.push(describe(node, detectedAt));
+            }
+        }
+    }
+    if (queue.length > MAX_QUEUE) {
+        queue.splice(0, queue.length - MAX_QUEUE);
+    }
+    if (queue.length && window.__tradingBotWaiter) {
+        const waiter = window.__tradingBotWaiter;
+        window.__tradingBotWaiter = null;
+        waiter(queue.splice(0, queue.length));
+    }
+});
+window.__tradingBotObserver.observe(list, {childList: true});
+return true;
+"""
+
+DRAIN_QUEUE_SCRIPT = """
+const queue = window.__tradingBotQueue;
+return queue ? queue.splice(0, queue.length) : null;
+"""
+
+# execute_async_script: resolves as soon as the observer queues something, or with [] after arguments[0] ms.
+WAIT_FOR_MESSAGES_SCRIPT = """
+const timeoutMs = arguments[0];
+const done = arguments[arguments.length - 1];
+const queue = window.__tradingBotQueue;
+if (!queue) {
+    done(null);
+} else if (queue.length) {
+    done(queue.splice(0, queue.length));
+} else {
+    const timer = setTimeout(() => {
+        window.__tradingBotWaiter = null;
+        done([]);
+    }, timeoutMs);
+    window.__tradingBotWaiter = (messages) => {
+        clearTimeout(timer);
+        done(messages);
+    };
+}
+"""
+
+DISCORD_EPOCH_MS = 1420070400000
+
+def snowflake_to_timestamp(message_id):
+    """Discord snowflakes carry their creation time in ms since the Discord epoch."""
+    return ((int(message_id) >> 22) + DISCORD_EPOCH_MS) / 1000
+
+def timestamp_to_snowflake(timestamp, sequence=0):
+    """Synthetic snowflake for messages without a Discord id, ordered like real ones."""
+    return str(((int(timestamp * 1000) - DISCORD_EPOCH_MS) << 22) | (sequence & 0x3FFFFF))
+
+def install_message_observer(driver):
+    """Installs the page-side observer. Returns False when the message list is not rendered yet."""
+    return bool(driver.execute_script(INSTALL_OBSERVER_SCRIPT))
+
+def drain_observed_messages(driver, wait_timeout=None):
+    """Drains the page-side queue. Blocks up to wait_timeout seconds when given. None means no observer."""
+    if wait_timeout is None:
+        return driver.execute_script(DRAIN_QUEUE_SCRIPT)
+
+    driver.set_script_timeout(wait_timeout + 5)
+    return driver.execute_async_script(WAIT_FOR_MESSAGES_SCRIPT, int(wait_timeout * 1000))
+
+def extract_messages(driver, after_id=None):
+    """Returns (messages newer than after_id, ids of visible edited messages) in one script call."""
+    result = driver.execute_script(EXTRACT_MESSAGES_SCRIPT, None if after_id is None else str(after_id)) or {}
+    return result.get("messages", []), result.get("edited", [])
+
+def extract_messages_per_element(driver):
+    """Legacy path: one find_element round trip per message. Kept for fallback and benchmarking."""
+    messages = []
+    for msg in driver.find_elements(By.XPATH, MESSAGE_XPATH):
+        try:
+            messages.append({
+                "id": None,
+                "author": None,
+                "timestamp": None,
+                "content": msg.find_element(By.XPATH, CONTENT_XPATH).text.strip(),
+            })
+        except Exception as e:
+            logger.error(f"❌ [SCRAPER] Error processing message: {e}")
+    return messages
@@ -0,0 +1,270 @@
+import os
+import json
+import time
+import asyncio
+import logging
+import itertools
+import threading
+import datetime as dt
+from collections import defaultdict, deque
+from src.main.discord_session import DiscordWebDriver
+from src.main.message_extraction import (
+    extract_messages, install_message_observer, drain_observed_messages, timestamp_to_snowflake,
+)
+
+logger = logging.getLogger(__name__)
+
+# Messages buffered per channel by the push-style sources before the oldest are dropped
+MAX_BUFFERED_MESSAGES = 1000
+
+def channel_key(channel):
+    """Channel id from a channel URL (.../channels/<guild>/<channel>) or a bare id."""
+    return str(channel).rstrip("/").rsplit("/", 1)[-1]
+
+def parse_timestamp(value):
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    return dt.datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+def normalize_message(row, received_at, sequence):
+    """Shapes a JSONL row or gateway payload like the DOM extractor's output. Rows without an id get
+    a synthetic snowflake from their timestamp, so watermarks work the same for every source."""
+    posted_at = parse_timestamp(row.get("timestamp") or row.get("t")) or received_at
+    author = row.get("author")
+    return {
+        "id": str(row["id"]) if row.get("id") else timestamp_to_snowflake(posted_at, sequence),
+        "author": author.get("username") if isinstance(author, dict) else author,
+        "timestamp": row.get("timestamp"),
+        "content": row.get("content", ""),
+        "edited": bool(row.get("edited_timestamp")),
+        "detected_at": received_at * 1000,
+    }
+
+class MessageSource:
+    """Delivers raw channel messages; watermarking, dedupe and parsing happen in live_monitoring.
+
+    read() returns (messages, edited_ids): messages newer than after_id, oldest first, each a dict
+    with id, author, timestamp, content and optionally detected_at (ms); edited_ids is None when the
+    source cannot see edits. wait_timeout lets push-style sources block until something arrives.
+    """
+    # True when read() needs the shared browser, so callers must hold the driver lock
+    uses_browser = False
+
+    def add_channel(self, channel_url, tab_handle=None):
+        pass
+
+    def read(self, channel_url, after_id=None, wait_timeout=None):
+        raise NotImplementedError
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+class SeleniumTabSource(MessageSource):
+    """The Discord tab scraper: one tab per channel on the shared DiscordWebDriver.
+
+    mode="poll" reads the rendered list newer than the watermark; mode="push" drains the in-page
+    MutationObserver queue, reinstalling it (and catching up with one read) if the tab reloaded.
+    """
+    uses_browser = True
+
+    def __init__(self, tab_handles=None, mode="poll"):
+        self.tab_handles = dict(tab_handles or {})
+        self.mode = mode
+
+    def add_channel(self, channel_url, tab_handle=None):
+        if tab_handle is not None:
+            self.tab_handles[channel_url] = tab_handle
+
+    def read(self, channel_url, after_id=None, wait_timeout=None):
+        driver = DiscordWebDriver.get_instance().get_driver()
+        driver.switch_to.window(self.tab_handles[channel_url])
+
+        if self.mode == "push":
+            messages = drain_observed_messages(driver, wait_timeout)
+            if messages is not None:
+                return messages, None
+            if install_message_observer(driver):
+                logger.info(f"👀 [SOURCE] Message observer installed for {channel_url}")
+
+        return extract_messages(driver, after_id=after_id)
+
+class BufferedSource(MessageSource):
+    """Per-channel buffers filled by a reader; read() pops them, optionally waiting for new ones."""
+
+    def __init__(self):
+        self.buffers = defaultdict(lambda: deque(maxlen=MAX_BUFFERED_MESSAGES))
+        self.edits = defaultdict(set)
+        self.sequence = itertools.count()
+        self.cond = threading.Condition()
+
+    def publish(self, channel, row, received_at=None, edited=False):
+        received_at = received_at or time.time()
+        message = normalize_message(row, received_at, next(self.sequence))
+        with self.cond:
+            if edited:
+                self.edits[channel_key(channel)].add(message["id"])
+            else:
+                self.buffers[channel_key(channel)].append(message)
+            self.cond.notify_all()
+
+    def _fill(self):
+        """Hook for sources that read on the caller's thread."""
+
+    def read(self, channel_url, after_id=None, wait_timeout=None):
+        key = channel_key(channel_url)
+        deadline = time.monotonic() + (wait_timeout or 0)
+        with self.cond:
+            while True:
+                self._fill()
+                if self.buffers[key] or self.edits[key]:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.cond.wait(timeout=min(remaining, 0.2))
+            messages = list(self.buffers[key])
+            self.buffers[key].clear()
+            edited = list(self.edits.pop(key, ()))
+
+        if after_id is not None:
+            messages = [msg for msg in messages if int(msg["id"]) > int(after_id)]
+        return messages, edited
+
+class JsonlTailSource(BufferedSource):
+    """Follows a JSONL file like tail -f. Rows: {"channel": url or id, "content", "id"?, "author"?, "timestamp"?}.
+
+    Starts at the end of the file unless from_start is set. A truncated or rotated file is reread
+    from the beginning.
+    """
+
+    def __init__(self, path, from_start=False):
+        super().__init__()
+        self.path = path
+        self.offset = 0 if from_start or not os.path.exists(path) else os.path.getsize(path)
+        self.partial = ""
+
+    def _fill(self):
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return
+        if size < self.offset:
+            self.offset, self.partial = 0, ""
+        if size == self.offset:
+            return
+
+        with open(self.path, encoding="utf-8") as f:
+            f.seek(self.offset)
+            data = self.partial + f.read()
+            self.offset = f.tell()
+
+        lines = data.split("\n")
+        self.partial = lines.pop()
+        received_at = time.time()
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                logger.warning(f"⚠️ [SOURCE] Skipping malformed line in {self.path}: {line[:80]}")
+                continue
+            message = normalize_message(row, received_at, next(self.sequence))
+            self.buffers[channel_key(row.get("channel") or row.get("channel_id"))].append(message)
+
+class GatewaySource(BufferedSource):
+    """Websocket client for a Discord-gateway-shaped event stream (HELLO, IDENTIFY, heartbeats, dispatches).
+
+    MESSAGE_CREATE dispatches are buffered per channel_id and MESSAGE_UPDATE marks edits. Reconnects
+    with backoff. Meant to be fed by a local stand-in (src.backtest.gateway_standin) or a relay.
+    """
+
+    def __init__(self, url, token=None):
+        super().__init__()
+        self.url = url
+        self.token = token
+        self.loop = None
+        self.websocket = None
+        self.last_sequence = None
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run_loop, name="gateway-source", daemon=True)
+        self._thread.start()
+
+    def _run_loop(self):
+        self.loop = asyncio.new_event_loop()
+        self.loop.run_until_complete(self._run())
+
+    async def _run(self):
+        # Imported here so the other sources do not need the websockets package
+        import websockets
+
+        backoff = 1
+        while self._running:
+            heartbeat = None
+            try:
+                async with websockets.connect(self.url, max_size=None) as websocket:
+                    self.websocket = websocket
+                    hello = json.loads(await websocket.recv())
+                    interval = hello.get("d", {}).get("heartbeat_interval", 41250) / 1000
+                    await websocket.send(json.dumps({"op": 2, "d": {"token": self.token, "properties": {"os": "linux", "browser": "trading-bot"}}}))
+                    heartbeat = asyncio.ensure_future(self._heartbeat(websocket, interval))
+                    logger.info(f"📶 [SOURCE] Connected to gateway {self.url}")
+                    backoff = 1
+
+                    async for raw in websocket:
+                        self._on_event(json.loads(raw))
+
+            except Exception as e:
+                if not self._running:
+                    break
+                logger.error(f"⚠️ [SOURCE] Gateway {self.url} disconnected: {e}. Reconnecting in {backoff}s...")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+            finally:
+                self.websocket = None
+                if heartbeat is not None:
+                    heartbeat.cancel()
+
+    async def _heartbeat(self, websocket, interval):
+        while True:
+            await asyncio.sleep(interval)
+            await websocket.send(json.dumps({"op": 1, "d": self.last_sequence}))
+
+    def _on_event(self, event):
+        if event.get("s") is not None:
+            self.last_sequence = event["s"]
+        if event.get("op") in (7, 9):
+            raise ConnectionError(f"gateway requested reconnect (op {event['op']})")
+        if event.get("op") != 0:
+            return
+        data = event.get("d") or {}
+        if event.get("t") == "MESSAGE_CREATE":
+            self.publish(data.get("channel_id"), data)
+        elif event.get("t") == "MESSAGE_UPDATE" and data.get("id"):
+            self.publish(data.get("channel_id"), data, edited=True)
+
+    def stop(self):
+        self._running = False
+        if self.loop and self.websocket:
+            asyncio.run_coroutine_threadsafe(self.websocket.close(), self.loop)
+
+def create_message_source(kind, path=None, url=None, token=None, mode="poll"):
+    """kind: "selenium", "jsonl" (path) or "gateway" (url, token)."""
+    if kind == "selenium":
+        return SeleniumTabSource(mode=mode)
+    if kind == "jsonl":
+        return JsonlTailSource(path)
+    if kind == "gateway":
+        return GatewaySource(url, token)
+    raise ValueError(f"Unknown message source: {kind}")
@@ -0,0 +1,217 @@
+import json
+import math
+import time
+import logging
+import threading
+from logging.handlers import RotatingFileHandler
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+# Pipeline stages in order. A trace is a plain dict {stage: unix time} carried on the trade dict.
+STAGES = ("posted", "detected", "parsed", "queued", "submitted", "acknowledged", "filled")
+
+TRACE_KEY = "trace"
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+class LatencyHistogram:
+    """Log-linear buckets in the style of HdrHistogram: each power of two of microseconds is split
+    into SUB_BUCKETS linear buckets, so any recorded value is within ~3% of its bucket midpoint.
+    Recording is O(1) and memory is bounded by the value range, not the sample count.
+    """
+    SUB_BUCKETS = 16
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def _bucket(self, micros):
+        if micros < self.SUB_BUCKETS:
+            return micros
+        exponent = micros.bit_length() - 5
+        return (exponent + 1) * self.SUB_BUCKETS + (micros >> exponent) - self.SUB_BUCKETS
+
+    def _bucket_value(self, bucket):
+        if bucket < self.SUB_BUCKETS:
+            return bucket
+        exponent = bucket // self.SUB_BUCKETS - 1
+        sub = bucket % self.SUB_BUCKETS + self.SUB_BUCKETS
+        # Midpoint of the bucket's range
+        return ((sub << exponent) + ((sub + 1) << exponent)) / 2
+
+    def record(self, seconds):
+        micros = max(0, int(seconds * 1_000_000))
+        bucket = self._bucket(micros)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q):
+        if not self.count:
+            return None
+        target = max(1, math.ceil(q * self.count))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= target:
+                return min(self._bucket_value(bucket) / 1_000_000, self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "max": self.max,
+            **{f"p{q * 100:g}": self.quantile(q) for q in QUANTILES},
+        }
+
+def new_trace(channel, posted=None, detected=None):
+    trace = {"channel": channel}
+    if posted is not None:
+        trace["posted"] = posted
+    if detected is not None:
+        trace["detected"] = detected
+    return trace
+
+def stamp(trade, stage, at=None):
+    """Stores a stage timestamp on the trade's trace without recording it. Safe in any process."""
+    trace = trade.get(TRACE_KEY) if trade else None
+    if trace is not None and stage not in trace:
+        trace[stage] = at or time.time()
+    return trace
+
+class LatencyMetrics:
+    """Per-channel stage latency histograms, exported to a rotating JSONL file and a Prometheus endpoint.
+
+    mark() stamps a stage and records every stamped stage not yet recorded, so stamps taken in a
+    browser-pool worker are recorded once the trade reaches the main process. Each stage is
+    recorded twice: as the step from the previous stamped stage, and cumulatively since the post.
+    """
+    _instance = None
+
+    @staticmethod
+    def get_instance():
+        if LatencyMetrics._instance is None:
+            LatencyMetrics._instance = LatencyMetrics()
+        return LatencyMetrics._instance
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {}
+        self.file_logger = None
+        self._server = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    def mark(self, trade, stage, at=None):
+        trace = stamp(trade, stage, at)
+        if trace is None:
+            return
+        recorded = trace.setdefault("recorded", 0)
+        stamped = [name for name in STAGES if name in trace]
+        if len(stamped) <= recorded:
+            return
+
+        channel = trace.get("channel", "unknown")
+        with self.lock:
+            for idx in range(max(recorded, 1), len(stamped)):
+                name = stamped[idx]
+                self._histogram(channel, "step", name).record(max(0.0, trace[name] - trace[stamped[idx - 1]]))
+                if "posted" in trace:
+                    self._histogram(channel, "since_post", name).record(max(0.0, trace[name] - trace["posted"]))
+        trace["recorded"] = len(stamped)
+
+    def _histogram(self, channel, kind, stage):
+        key = (channel, kind, stage)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = LatencyHistogram()
+        return histogram
+
+    def snapshot(self):
+        with self.lock:
+            return [
+                {"channel": channel, "kind": kind, "stage": stage, **histogram.summary()}
+                for (channel, kind, stage), histogram in sorted(self.histograms.items())
+            ]
+
+    def render_prometheus(self):
+        lines = [
+            "# HELP trading_bot_signal_latency_seconds Callout pipeline latency per channel and stage.",
+            "# TYPE trading_bot_signal_latency_seconds summary",
+        ]
+        for row in self.snapshot():
+            labels = f'channel="{row["channel"]}",kind="{row["kind"]}",stage="{row["stage"]}"'
+            for q in QUANTILES:
+                lines.append(f'trading_bot_signal_latency_seconds{{{labels},quantile="{q:g}"}} {row[f"p{q * 100:g}"]}')
+            lines.append(f"trading_bot_signal_latency_seconds_sum{{{labels}}} {row['sum']}")
+            lines.append(f"trading_bot_signal_latency_seconds_count{{{labels}}} {row['count']}")
+        return "\n".join(lines) + "\n"
+
+    def write_snapshot(self):
+        if self.file_logger is None:
+            return
+        self.file_logger.info(json.dumps({"time": time.time(), "histograms": self.snapshot()}))
+
+    def log_stats(self):
+        for row in self.snapshot():
+            if row["kind"] == "since_post" and row["stage"] in ("parsed", "acknowledged", "filled"):
+                logger.info(f"⏱️ [METRICS] {row['channel']} post→{row['stage']}: p50 {row['p50']:.3f}s, "
+                            f"p99 {row['p99']:.3f}s, max {row['max']:.3f}s over {row['count']}")
+
+    def start(self, path=None, port=0, interval=60, max_bytes=10_000_000, backups=5, host="127.0.0.1"):
+        """Writes a snapshot to path every interval seconds and serves /metrics on host:port (0 = off).
+        Local only by default; pass host="0.0.0.0" to let a remote Prometheus scrape it."""
+        if path and self.file_logger is None:
+            handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self.file_logger = logging.getLogger("trading_bot.metrics")
+            self.file_logger.propagate = False
+            self.file_logger.setLevel(logging.INFO)
+            self.file_logger.addHandler(handler)
+
+        if port and self._server is None:
+            metrics = self
+
+            class Handler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path.split("?")[0] != "/metrics":
+                        self.send_error(404)
+                        return
+                    body = metrics.render_prometheus().encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, *args):
+                    pass
+
+            self._server = ThreadingHTTPServer((host, port), Handler)
+            threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+            logger.info("📈 [METRICS] Prometheus endpoint on %s:%s/metrics", host, port)
+
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, args=(interval,), name="metrics-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self, interval):
+        while not self._stop.wait(interval):
+            try:
+                self.write_snapshot()
+                self.log_stats()
+            except Exception as e:
+                logger.error(f"❌ [METRICS] Failed to write snapshot: {e}")
+
+    def stop(self):
+        self._stop.set()
+        self.write_snapshot()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server = None
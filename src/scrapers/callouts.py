@@ -0,0 +1,9 @@
+from src.trading.execute_trade import get_current_week_friday
+from src.scrapers.trade_parser import TradeParser
+
+# Every channel posts callouts in the same format, so all scrapers share this one parser
+trade_parser = TradeParser(default_expiration=get_current_week_friday)
+
+def parse_trade_message(message):
+    """Parses a trade callout message and returns structured data."""
+    return trade_parser.parse(message)
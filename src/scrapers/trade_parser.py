@@ -0,0 +1,156 @@
+import re
+
+# ✅ Compiled once at import. Each callout also lists the lowercase keywords that must all appear
+# in the message before its regex is tried, most selective first, so chatter never reaches the regex engine.
+CALLOUT_RULES = {
+    "in": (
+        re.compile(r"(?:@\S+\s*)?\bin\s+(?:([A-Z]+)\s+(\d{1,2}/\d{1,2})|(\d{1,2}/\d{1,2})\s+([A-Z]+))?\s+(\d+\.?\d*)([CP])\s*@\s*([\d\.]+)", re.IGNORECASE),
+        ("@", "in"),
+    ),
+    "added": (
+        re.compile(r"(?:@\S+\s*)?\badded\s+to\s+([A-Z]+),?\s*new\s+avg\s+is\s*([\d\.]+)", re.IGNORECASE),
+        ("added",),
+    ),
+    "trimming": (
+        re.compile(r"(?:@\S+\s*)?\btrimming\s+([A-Z]+)\s+@?\s*(-?\d+)%?", re.IGNORECASE),
+        ("trimming",),
+    ),
+    # The ticker must be written in capitals (or $-prefixed), so "out for lunch" is not a sell of FOR
+    "out": (
+        re.compile(r"(?:@\S+\s*)?\b(?:all\s+out\s+of|out\s+of|out)\s+\$?((?-i:[A-Z]{1,5}))\b(?:\s+@?\s*(-?\d+)%)?", re.IGNORECASE),
+        ("out",),
+    ),
+    "unnamed_trade": (
+        re.compile(r"\b(\w+)\s+(\d+)\s*([CP])\s+(\d{1,2}/\d{1,2})\s*[\"“]?(\d+\.\d+)[\"”]?", re.IGNORECASE),
+        ("/",),
+    ),
+    "filled": (
+        re.compile(r"filled on (\w+) (\w+ \d{4}) (\d+) (calls|puts).*?at (\d+\.\d+)", re.IGNORECASE),
+        ("filled on",),
+    ),
+}
+
+def build_in(groups, default_expiration):
+    ticker, expiration, alt_expiration, alt_ticker, strike_price, option_type, option_price = groups
+    ticker = ticker or alt_ticker
+    if ticker is None:
+        return None
+    expiration = expiration or alt_expiration
+    if expiration is None and default_expiration is not None:
+        expiration = default_expiration()
+    return {
+        "type": "in",
+        "ticker": ticker.upper(),
+        "expiration": expiration,
+        "strike_price": float(strike_price),
+        "option_type": option_type.upper(),
+        "option_price": float(option_price),
+    }
+
+def build_added(groups, default_expiration):
+    ticker, avg_price = groups
+    return {
+        "type": "added",
+        "ticker": ticker.upper(),
+        "desired_avg_price": float(avg_price)
+    }
+
+def build_trim(groups, default_expiration):
+    ticker, percentage = groups
+    return {
+        "type": "trim",
+        "ticker": ticker.upper(),
+        "desired_plpc": int(percentage),
+    }
+
+def build_out(groups, default_expiration):
+    ticker, percentage = groups
+    return {
+        "type": "out",
+        "ticker": ticker.upper(),
+        "desired_plpc": float(percentage) if percentage else None,
+    }
+
+def build_unnamed_trade(groups, default_expiration):
+    ticker, strike_price, option_type, expiration, option_price = groups
+    return {
+        "type": "in",
+        "ticker": ticker.upper(),
+        "expiration": expiration,
+        "strike_price": int(strike_price),
+        "option_type": "C" if option_type.upper() == "C" else "P",
+        "option_price": float(option_price),
+    }
+
+def build_filled(groups, default_expiration):
+    ticker, expiration, strike_price, option_type, option_price = groups
+    return {
+        "type": "in",
+        "ticker": ticker.upper(),
+        "expiration": expiration,
+        "strike_price": int(strike_price),
+        "option_type": "C" if option_type.lower() == "calls" else "P",
+        "option_price": float(option_price),
+    }
+
+def build_stop(groups, default_expiration):
+    ticker, limit_price = groups
+    return {
+        "type": "stop",
+        "ticker": ticker.upper(),
+        "limit_price": float(limit_price),
+    }
+
+CALLOUT_BUILDERS = {
+    "in": build_in,
+    "added": build_added,
+    "trimming": build_trim,
+    "out": build_out,
+    "unnamed_trade": build_unnamed_trade,
+    "filled": build_filled,
+    "stop": build_stop,
+}
+
+# Signal types routed to handle_trade_exit / handle_trade_entry
+EXIT_TYPES = ("trim", "trimming", "out", "stop")
+ENTRY_TYPES = ("in", "added", "unnamed", "filled")
+
+class TradeParser:
+    """Callout parser shared by every channel; the rules are compiled once in CALLOUT_RULES."""
+
+    def __init__(self, default_expiration=None):
+        self.default_expiration = default_expiration
+        self.rules = [(callout, pattern, keywords) for callout, (pattern, keywords) in CALLOUT_RULES.items()]
+        # Any message lacking every rule's first keyword cannot match anything
+        if all(keywords for _, _, keywords in self.rules):
+            self.prefilter = tuple({keywords[0] for _, _, keywords in self.rules})
+        else:
+            self.prefilter = None
+
+    def parse(self, message):
+        """Parses a trade callout message and returns structured data."""
+        lowered = message.lower()
+        if self.prefilter is not None and not any(keyword in lowered for keyword in self.prefilter):
+            return []
+
+        trade_data = []
+        extracted_trades = set()
+
+        for callout, pattern, keywords in self.rules:
+            if not all(keyword in lowered for keyword in keywords):
+                continue
+
+            match = pattern.search(message)
+            if not match:
+                continue
+
+            trade_info = CALLOUT_BUILDERS[callout](match.groups(), self.default_expiration)
+            if trade_info is None:
+                continue
+
+            trade_tuple = tuple(trade_info.items())
+            if trade_tuple not in extracted_trades:
+                extracted_trades.add(trade_tuple)
+                trade_data.append(trade_info)
+
+        return trade_data
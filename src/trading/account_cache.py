@@ -0,0 +1,122 @@
+import time
+import logging
+import threading
+from collections import OrderedDict
+from src.trading.alpaca_client import api
+
+logger = logging.getLogger(__name__)
+
+# Max age (seconds) of the account snapshot each decision will act on before forcing a refresh
+DEFAULT_MAX_STALENESS = {
+    "sizing": 10,
+    "add": 30,
+}
+
+BALANCE_FIELDS = ("cash", "buying_power", "options_buying_power")
+
+class AccountCache:
+    """Serves cash and buying power without a get_account() round trip on the order path.
+
+    A background poller refreshes the snapshot every refresh_interval seconds. Between refreshes,
+    our own fills (from the OrderTracker) are applied locally so sizing sees spent cash immediately.
+    Fills applied after a refresh was requested are carried over onto the new snapshot, since the
+    server may not have reflected them yet.
+    """
+    _instance = None
+
+    @staticmethod
+    def get_instance():
+        if AccountCache._instance is None:
+            AccountCache._instance = AccountCache()
+        return AccountCache._instance
+
+    def __init__(self, refresh_interval=5, max_staleness=None):
+        self.refresh_interval = refresh_interval
+        self.max_staleness = {**DEFAULT_MAX_STALENESS, **(max_staleness or {})}
+        self.lock = threading.Lock()
+        self.refresh_lock = threading.Lock()
+        self.snapshot = None
+        self.last_refresh = 0
+        # (applied_at, cash delta) for local fills not yet known to be in a server snapshot
+        self.adjustments = []
+        # order id -> notional already applied, so partial fills and duplicate updates apply once
+        self.applied = OrderedDict()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def refresh(self):
+        with self.refresh_lock:
+            requested_at = time.monotonic()
+            try:
+                account = api.get_account()
+            except Exception as e:
+                logger.error("⚠️ [ACCOUNT] Failed to fetch account: %s", e)
+                return False
+
+            with self.lock:
+                self.adjustments = [(at, delta) for at, delta in self.adjustments if at >= requested_at]
+                self.snapshot = {field: float(getattr(account, field, 0) or 0) for field in BALANCE_FIELDS}
+                self.last_refresh = time.monotonic()
+            return True
+
+    def invalidate(self):
+        with self.lock:
+            self.last_refresh = 0
+
+    def _ensure_fresh(self, decision):
+        max_age = self.max_staleness.get(decision, self.refresh_interval)
+        with self.lock:
+            stale = self.snapshot is None or time.monotonic() - self.last_refresh > max_age
+        if stale:
+            self.refresh()
+
+    def get(self, decision="sizing"):
+        """Balances dict with local fills applied, no older than the decision's staleness bound."""
+        self._ensure_fresh(decision)
+        with self.lock:
+            if self.snapshot is None:
+                raise RuntimeError("account snapshot unavailable")
+            delta = sum(delta for _, delta in self.adjustments)
+            return {field: value + delta for field, value in self.snapshot.items()}
+
+    def get_cash(self, decision="sizing"):
+        return self.get(decision)["cash"]
+
+    def on_order_update(self, order):
+        """OrderTracker listener: applies the newly filled notional of one of our orders."""
+        filled_qty = float(order.get("filled_qty") or 0)
+        price = float(order.get("filled_avg_price") or 0)
+        if not filled_qty or not price or order.get("id") is None:
+            return
+
+        multiplier = 100 if order.get("asset_class") == "us_option" else 1
+        notional = filled_qty * price * multiplier
+        with self.lock:
+            applied = self.applied.get(order["id"], 0.0)
+            if notional <= applied:
+                return
+            self.applied[order["id"]] = notional
+            while len(self.applied) > 1000:
+                self.applied.popitem(last=False)
+            delta = notional - applied
+            self.adjustments.append((time.monotonic(), -delta if order.get("side") == "buy" else delta))
+        logger.info("💵 [ACCOUNT] %s %s fill adjusted cash by %s$%.2f", order.get('symbol'), order.get('side'),
+                    "-" if order.get('side') == 'buy' else "+", delta)
+
+    def start(self, order_tracker=None):
+        if self._thread and self._thread.is_alive():
+            return
+        if order_tracker is not None:
+            order_tracker.add_listener(self.on_order_update)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="account-cache", daemon=True)
+        self._thread.start()
+        logger.info("💵 [ACCOUNT] Account poller started (%ss interval)", self.refresh_interval)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self.refresh_interval)
+
+    def stop(self):
+        self._stop.set()
@@ -1,7 +1,190 @@
+import os
+import time
+import uuid
+import random
+import logging
+import threading
+from collections import defaultdict
+import requests
+from requests.adapters import HTTPAdapter
 import alpaca_trade_api as tradeapi
+from alpaca_trade_api.rest import APIError
 from config import ALPACA_API_KEY, ALPACA_API_SECRET, ALPACA_BASE_URL
 
 if not ALPACA_API_KEY or not ALPACA_API_SECRET or not ALPACA_BASE_URL:
     raise ValueError("🚨 Missing Alpaca API credentials! Check your .env file.")
 
-api = tradeapi.REST(ALPACA_API_KEY, ALPACA_API_SECRET, ALPACA_BASE_URL, api_version="v2")
+logger = logging.getLogger(__name__)
+
+# ✅ Request priorities: lower runs first. Order traffic must never queue behind polling.
+PRIORITY_ORDER = 0
+PRIORITY_ACCOUNT = 1
+PRIORITY_POLL = 2
+
+ENDPOINT_PRIORITIES = {
+    "submit_order": PRIORITY_ORDER,
+    "cancel_order": PRIORITY_ORDER,
+    "replace_order": PRIORITY_ORDER,
+    "close_position": PRIORITY_ORDER,
+    "get_order": PRIORITY_ACCOUNT,
+    "get_account": PRIORITY_ACCOUNT,
+}
+
+# Calls Alpaca never executed (429) are always safe to retry; 5xx only for reads or idempotent orders
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Alpaca allows 200 requests/minute per key; keep a margin for clock skew between us and the server
+RATE_LIMIT_PER_MINUTE = int(os.getenv("ALPACA_RATE_LIMIT", "200"))
+
+class TokenBucket:
+    """Token bucket with per-priority reserves: low-priority callers cannot drain the last tokens,
+    and nobody takes a token while a higher-priority caller is waiting for one."""
+
+    def __init__(self, rate, capacity, reserves):
+        self.rate = rate
+        self.capacity = capacity
+        self.reserves = reserves
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.waiting = defaultdict(int)
+        self.cond = threading.Condition()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, priority):
+        """Blocks until a token is available for this priority. Returns the seconds spent waiting."""
+        started = time.monotonic()
+        with self.cond:
+            self.waiting[priority] += 1
+            try:
+                while True:
+                    self._refill()
+                    higher_waiting = any(self.waiting[p] for p in range(priority))
+                    floor = self.reserves.get(priority, 0)
+                    if not higher_waiting and self.tokens - 1 >= floor:
+                        self.tokens -= 1
+                        return time.monotonic() - started
+                    self.cond.wait(timeout=max(0.01, (floor + 1 - self.tokens) / self.rate))
+            finally:
+                self.waiting[priority] -= 1
+                self.cond.notify_all()
+
+    def available(self):
+        with self.cond:
+            self._refill()
+            return self.tokens
+
+class RateLimitedREST:
+    """Wraps tradeapi.REST: shared rate limiter, priorities, pooled sessions, jittered retries, counters."""
+
+    def __init__(self, rest, rate_per_minute=RATE_LIMIT_PER_MINUTE, max_retries=3, base_backoff=0.5, pool_size=16):
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.pool_size = pool_size
+        self.stats_lock = threading.Lock()
+        self.set_backend(rest, rate_per_minute)
+
+    def set_backend(self, rest, rate_per_minute=RATE_LIMIT_PER_MINUTE):
+        """Swaps the client every caller of api talks to, e.g. a simulated broker for backtests.
+        rate_per_minute=None disables the limiter."""
+        self.rest = rest
+        if rate_per_minute:
+            rate = rate_per_minute * 0.9 / 60
+            capacity = max(1, rate_per_minute // 10)
+            self.bucket = TokenBucket(rate, capacity, reserves={PRIORITY_ACCOUNT: capacity * 0.1, PRIORITY_POLL: capacity * 0.25})
+        else:
+            self.bucket = None
+        with self.stats_lock:
+            self.endpoint_stats = defaultdict(lambda: {"calls": 0, "errors": 0, "retries": 0, "total_latency": 0.0, "max_latency": 0.0, "throttled": 0.0})
+        self.quota_remaining = None
+
+        session = getattr(rest, "_session", None)
+        if session is not None:
+            # The wrapper owns retries; stop the SDK from sleeping 3s per retry on its own
+            rest._retry = 0
+            adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.hooks["response"].append(self._record_quota)
+
+    def _record_quota(self, response, *args, **kwargs):
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        if remaining is not None:
+            self.quota_remaining = int(remaining)
+
+    def __getattr__(self, name):
+        if name.startswith("__") or name == "rest":
+            raise AttributeError(name)
+        attr = getattr(self.rest, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            return self._call(name, attr, args, kwargs)
+        return call
+
+    def _retryable(self, name, kwargs, error):
+        if isinstance(error, requests.exceptions.ConnectionError):
+            return name != "submit_order" or "client_order_id" in kwargs
+        status = getattr(error, "status_code", None)
+        if status == 429:
+            return True
+        if status in RETRY_STATUS_CODES:
+            # A 5xx submit may have gone through; only retry when a duplicate would be rejected by id
+            return name != "submit_order" or "client_order_id" in kwargs
+        return False
+
+    def _call(self, name, method, args, kwargs):
+        priority = ENDPOINT_PRIORITIES.get(name, PRIORITY_POLL)
+        if name == "submit_order" and "client_order_id" not in kwargs:
+            kwargs["client_order_id"] = uuid.uuid4().hex
+
+        attempt = 0
+        while True:
+            throttled = self.bucket.acquire(priority) if self.bucket else 0.0
+            started = time.monotonic()
+            try:
+                result = method(*args, **kwargs)
+                self._record(name, time.monotonic() - started, throttled)
+                return result
+            except (APIError, requests.exceptions.RequestException) as e:
+                self._record(name, time.monotonic() - started, throttled, error=True)
+                if attempt >= self.max_retries or not self._retryable(name, kwargs, e):
+                    raise
+                attempt += 1
+                # Full jitter keeps a burst of failed callers from retrying in lockstep
+                backoff = random.uniform(0, self.base_backoff * (2 ** attempt))
+                with self.stats_lock:
+                    self.endpoint_stats[name]["retries"] += 1
+                logger.warning(f"🔁 [ALPACA] {name} failed ({e}); retry {attempt}/{self.max_retries} in {backoff:.2f}s")
+                time.sleep(backoff)
+
+    def _record(self, name, latency, throttled, error=False):
+        with self.stats_lock:
+            stats = self.endpoint_stats[name]
+            stats["calls"] += 1
+            stats["errors"] += int(error)
+            stats["total_latency"] += latency
+            stats["max_latency"] = max(stats["max_latency"], latency)
+            stats["throttled"] += throttled
+
+    def get_stats(self):
+        with self.stats_lock:
+            endpoints = {
+                name: {**stats, "avg_latency": stats["total_latency"] / stats["calls"] if stats["calls"] else 0.0}
+                for name, stats in self.endpoint_stats.items()
+            }
+        return {"tokens_available": self.bucket.available() if self.bucket else float("inf"), "quota_remaining": self.quota_remaining, "endpoints": endpoints}
+
+    def log_stats(self):
+        stats = self.get_stats()
+        logger.info(f"🔌 [ALPACA] Tokens {stats['tokens_available']:.1f}, server quota remaining {stats['quota_remaining']}")
+        for name, endpoint in sorted(stats["endpoints"].items()):
+            logger.info(f"🔌 [ALPACA] {name}: {endpoint['calls']} calls, {endpoint['errors']} errors, {endpoint['retries']} retries, "
+                        f"avg {endpoint['avg_latency'] * 1000:.0f}ms, max {endpoint['max_latency'] * 1000:.0f}ms, "
+                        f"throttled {endpoint['throttled']:.2f}s")
+
+api = RateLimitedREST(tradeapi.REST(ALPACA_API_KEY, ALPACA_API_SECRET, ALPACA_BASE_URL, api_version="v2"))
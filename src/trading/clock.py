@@ -0,0 +1,30 @@
+import time
+import datetime as dt
+
+class RealClock:
+    """Wall clock used live. The backtest swaps in a virtual clock with the same interface."""
+
+    def time(self):
+        return time.time()
+
+    def monotonic(self):
+        return time.monotonic()
+
+    def now(self):
+        return dt.datetime.fromtimestamp(self.time())
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+    def wait(self, future, timeout):
+        """future.result(timeout); raises concurrent.futures.TimeoutError if it does not complete."""
+        return future.result(timeout=timeout)
+
+_clock = RealClock()
+
+def get_clock():
+    return _clock
+
+def set_clock(clock):
+    global _clock
+    _clock = clock
@@ -2,48 +2,55 @@ import logging
 import datetime as dt
 import time
 import os
-import threading
 from src.trading.alpaca_client import api
 from src.trading.account_data import get_position_data
+from src.trading.position_cache import PositionCache
+from src.trading.trigger_book import TriggerBook
+from src.trading.order_tracker import OrderTracker
+from src.trading.account_cache import AccountCache
+from src.trading.option_chain import OptionChainIndex
+from src.trading.order_chaser import OrderChaser
+from src.metrics.latency import LatencyMetrics
+from src.trading.clock import get_clock
 
 logger = logging.getLogger(__name__)
 
 def format_options_symbol(ticker, expiration, option_type, strike_price):
-    try:
-        current_year = dt.datetime.now().year % 100
-        exp_date = dt.datetime.strptime(expiration, "%m/%d").strftime(f"{current_year}%m%d")
-    except ValueError:
-        logger.error(f"⚠️ Invalid expiration format: {expiration}. Must include a day (e.g., MM/DD). Trade rejected.")
-        return None
-
-    strike_int = int(float(strike_price) * 1000)
-    strike_formatted = f"{strike_int:08d}"
-
-    return f"{ticker.upper()}{exp_date}{option_type.upper()}{strike_formatted}"
+    """OCC symbol for a callout, snapped to the nearest listed contract once the underlying's chain is indexed."""
+    return OptionChainIndex.get_instance().resolve(ticker, expiration, option_type, strike_price)
 
 def get_current_week_friday():
-    today = dt.date.today()
+    today = get_clock().now().date()
     days_until_friday = (4 - today.weekday()) % 7
     friday = today + dt.timedelta(days=days_until_friday)
     return friday.strftime("%m/%d")
 
 def calculate_dynamic_position_size(limit_price, risk_percent=0.01):
     try:
-        account = api.get_account()
-        account_balance = float(account.cash)
+        account_balance = AccountCache.get_instance().get_cash("sizing")
         risk_per_trade = account_balance * risk_percent
         
         contracts_to_buy = risk_per_trade / (limit_price * 100)
         contracts_to_buy = max(1, int(contracts_to_buy))
 
-        logger.info(f"📊 [MAIN] Dynamic Sizing - Balance: ${account_balance:.2f}, Max Risk: ${risk_per_trade:.2f}, Contracts: {contracts_to_buy}")
+        logger.info("📊 [MAIN] Dynamic Sizing - Balance: $%.2f, Max Risk: $%.2f, Contracts: %s", account_balance, risk_per_trade, contracts_to_buy)
         return contracts_to_buy
     
     except Exception as e:
-        logger.error(f"❌ Failed to calculate position size: {str(e)}")
+        logger.error("❌ Failed to calculate position size: %s", e)
         return 10
 
-def execute_market_buy(buy_size, position_data):
+def track_fill(trade, response, submitted_at):
+    """Records the acknowledged stage now and the filled stage when the fill arrives."""
+    metrics = LatencyMetrics.get_instance()
+    metrics.mark(trade, "acknowledged")
+
+    def on_done(order):
+        if order["status"] == "filled":
+            metrics.mark(trade, "filled")
+    return OrderTracker.get_instance().track(response, submitted_at, callback=on_done)
+
+def execute_market_buy(buy_size, position_data, trade=None):
     symbol = position_data["symbol"]
     current_price = position_data["current_price"]
     order_payload = {
@@ -55,10 +62,14 @@ def execute_market_buy(buy_size, position_data):
     }
 
     try:
+        submitted_at = time.monotonic()
+        LatencyMetrics.get_instance().mark(trade, "submitted")
         response = api.submit_order(**order_payload)
-        logger.info(f"✅ [THREAD] ADD: Trade Executed: BUY {buy_size} {symbol} @ {current_price}")
+        track_fill(trade, response, submitted_at)
+        PositionCache.get_instance().invalidate()
+        logger.info("✅ [THREAD] ADD: Trade Executed: BUY %s %s @ %s", buy_size, symbol, current_price)
     except Exception as e:
-        logger.error(f"❌ [THREAD] ADD: Trade Execution Failed: {str(e)}")
+        logger.error("❌ [THREAD] ADD: Trade Execution Failed: %s", e)
 
 def execute_market_sell(trade, position_data):
     symbol = position_data["symbol"]
@@ -78,10 +89,15 @@ def execute_market_sell(trade, position_data):
     }
 
     try:
+        submitted_at = time.monotonic()
+        LatencyMetrics.get_instance().mark(trade, "submitted")
         response = api.submit_order(**order_payload)
-        logger.info(f"✅ [THREAD] {trade['ticker']} {trade['type'].upper()} Trade Executed: SELL {sell_size} {symbol} @ {position_data['current_price']}")
+        track_fill(trade, response, submitted_at)
+        PositionCache.get_instance().invalidate()
+        logger.info("✅ [THREAD] %s %s Trade Executed: SELL %s %s @ %s",
+                    trade['ticker'], trade['type'].upper(), sell_size, symbol, position_data['current_price'])
     except Exception as e:
-        logger.error(f"❌ [THREAD] {trade['ticker']} {trade['type'].upper()} Trade Execution Failed: {str(e)}")
+        logger.error("❌ [THREAD] %s %s Trade Execution Failed: %s", trade['ticker'], trade['type'].upper(), e)
 
 def execute_limit_buy(trade):
     ticker = trade['ticker']
@@ -92,45 +108,25 @@ def execute_limit_buy(trade):
 
     if expiration is None:
         expiration = get_current_week_friday()
-        logging.warning(f"🔄 No expiration found, using nearest Friday: {expiration}")
+        logger.warning("🔄 No expiration found, using nearest Friday: %s", expiration)
 
     symbol = format_options_symbol(ticker, expiration, option_type, strike_price)
     if symbol is None:
         return
 
-    price_buffer = 0.10
-    adjusted_limit_price = round(limit_price + price_buffer, 2)
-    qty = calculate_dynamic_position_size(adjusted_limit_price)
-
-    logging.info(f"[MAIN] {trade['ticker']} Price Buffer: {price_buffer}, Adjusted Limit Price: {adjusted_limit_price}, Buy Size: {qty}")
-
-    order_payload = {
-        "symbol": symbol,
-        "qty": qty,
-        "side": "buy",
-        "type": "limit",
-        "limit_price": str(adjusted_limit_price),
-        "time_in_force": "day"
-    }
+    # ✅ Size against the most we are willing to pay, then let the chaser work the price up from the callout
+    chaser = OrderChaser.get_instance()
+    qty = calculate_dynamic_position_size(chaser.ceiling(limit_price))
 
     try:
-        response = api.submit_order(**order_payload)
-        logging.info(f"✅ [MAIN] {trade['ticker']} Limit Order Submitted: BUY {qty} {symbol} @ {adjusted_limit_price}")
-
-        time.sleep(5)
-        order_status = api.get_order(response.id)
-
-        if order_status != "filled":
-            logging.warning(f"⚠️ [MAIN] {trade['ticker']} Limit Order for {symbol} @ {adjusted_limit_price} not filled in 5s. Cancelling...")
-            api.cancel_order(response.id)
-            
-            logging.info(f"📡 [MAIN] {trade['ticker']} Converting order to Market Buy for {symbol}...")
-            execute_market_buy(trade)
-        else:
-            logging.info((f"✅ [MAIN] {trade['ticker']} Market Order Submitted: {symbol} @ {adjusted_limit_price}"))
+        LatencyMetrics.get_instance().mark(trade, "submitted")
+        result = chaser.chase_buy(symbol, qty, limit_price, track=lambda response, submitted_at: track_fill(trade, response, submitted_at))
+        if result.filled_qty:
+            PositionCache.get_instance().invalidate()
+            logger.info("✅ [MAIN] %s Limit Order Filled: %s/%s %s @ %.2f", trade['ticker'], result.filled_qty, qty, symbol, result.avg_fill_price)
 
     except Exception as e:
-        logging.error(f"❌ [MAIN] {trade['ticker']} Trade Execution Failed: {str(e)}")
+        logger.error("❌ [MAIN] %s Trade Execution Failed: %s", trade['ticker'], e)
 
 def execute_limit_sell(trade, position_data):
     symbol = position_data["symbol"]
@@ -153,114 +149,104 @@ def execute_limit_sell(trade, position_data):
 
     try:
         response = api.submit_order(**order_payload)
-        logging.info(f"✅ [MAIN] {trade['ticker']} Trade Executed: STOP {sell_size} {symbol} @ {position_data['current_price']}")
+        PositionCache.get_instance().invalidate()
+        logger.info("✅ [MAIN] %s Trade Executed: STOP %s %s @ %s", trade['ticker'], sell_size, symbol, position_data['current_price'])
     except Exception as e:
-        logging.error(f"❌ [MAIN] {trade['ticker']} Trade Execution Failed: {str(e)}")
+        logger.error("❌ [MAIN] %s Trade Execution Failed: %s", trade['ticker'], e)
 
-def monitor_position_and_sell(trade, position_data):
-    target_plpc = trade["desired_plpc"]
+def check_position_and_sell(trade, position_data):
+    """Trigger check for trims/outs. Returns True once the sell went out or the position is gone."""
+    if not position_data:
+        logger.warning("⚠️ [TRIGGERS] %s %s: Position closed. Dropping trigger...", trade['ticker'], trade['type'].upper())
+        return True
 
-    if target_plpc is None:
-        logging.warning(f"📡 [THREAD] {trade['ticker']} {trade['type'].upper()}: No desired P/L percentage provided. Executing market sell...")
-        execute_market_sell(trade, position_data)
-        return
-    
+    target_plpc = trade["desired_plpc"]
     current_plpc = position_data["unrealized_plpc"]
+    # %-style so the sampler can group it per ticker and the formatting happens off the trigger thread
+    logger.info("📊 [TRIGGERS] %s %s: Current P/L: %.2f%% | Target: %.2f%%", trade['ticker'], trade['type'].upper(), current_plpc, target_plpc)
 
-    logging.info(f"🔍 [THREAD] {trade['ticker']} {trade['type'].upper()}: Monitoring position. Waiting for current P/L >= {target_plpc:.2f}%...")
-    wait_time = 2
-
-    while True:
-        position_data = get_position_data(trade['ticker'])
-        current_plpc = position_data["unrealized_plpc"]
-        logging.info(f"📊 [THREAD] {trade['ticker']} {trade['type'].upper()}: Current P/L: {current_plpc:.2f}% | Target: {target_plpc:.2f}%")
-
-        if current_plpc >= target_plpc:
-            logging.info(f"📡 [THREAD] {trade['ticker']} {trade['type'].upper()}: Target P/L reached. Executing trade...")
-            execute_market_sell(trade, position_data)
-            return
-
-        wait_time = min(wait_time * 1.05, 10)
-        time.sleep(wait_time)
+    if current_plpc >= target_plpc:
+        logger.info("📡 [EXEC] %s %s: Target P/L reached. Executing trade...", trade['ticker'], trade['type'].upper())
+        execute_market_sell(trade, position_data)
+        return True
+    return False
 
 def handle_trade_exit(trade):
     if trade["type"] == "stop":
-        logging.info(f"📡 Executing stop loss for {trade['ticker']} @ {trade['option_price']}...")
+        logger.info("📡 Executing stop loss for %s @ %s...", trade['ticker'], trade['option_price'])
         execute_limit_sell(trade)
 
     elif trade["type"] in ["trim", "trimming", "out"]:
         position_data = get_position_data(trade['ticker'])
         if not position_data:
-            logging.warning(f"⚠️ No open position found for {trade['ticker']}. Skipping trade...")
+            logger.warning("⚠️ No open position found for %s. Skipping trade...", trade['ticker'])
             return
 
-        # ✅ Start a new thread to monitor P/L and execute the trade
-        exit_thread = threading.Thread(target=monitor_position_and_sell, args=(trade, position_data))
-        exit_thread.daemon = True
-        exit_thread.start()
-    else:
-        logging.error(f"❌ Unknown trade type: {trade['type']}")
+        if trade["desired_plpc"] is None:
+            logger.warning("📡 [MAIN] %s %s: No desired P/L percentage provided. Executing market sell...", trade['ticker'], trade['type'].upper())
+            execute_market_sell(trade, position_data)
+            return
 
-def monitor_position_and_add(trade, position_data):
-    desired_avg_price = trade["desired_avg_price"]
+        # ✅ Hand the P/L target to the shared trigger book instead of a dedicated polling thread
+        logger.info("🔍 [MAIN] %s %s: Waiting for current P/L >= %.2f%%...", trade['ticker'], trade['type'].upper(), trade['desired_plpc'])
+        TriggerBook.get_instance().add(trade['ticker'], trade['type'].upper(), lambda data: check_position_and_sell(trade, data))
+    else:
+        logger.error("❌ Unknown trade type: %s", trade['type'])
 
-    try:
-        account = api.get_account()
-        account_balance = float(account.cash)
-        max_add_value = account_balance * 0.01
-    except Exception as e:
-        logging.error(f"❌ [THREAD] {trade['ticker']} ADD: Failed to fetch account balance: {str(e)}")
-        return
+def check_position_and_add(trade, position_data, max_add_value):
+    """Trigger check for adds. Returns True once the buy went out or the add is abandoned."""
+    if not position_data:
+        logger.warning("⚠️ [TRIGGERS] %s ADD: Position closed. Dropping trigger...", trade['ticker'])
+        return True
 
-    if desired_avg_price is None:
-        logging.warning(f"📡 [THREAD] {trade['ticker']} ADD: No desired average price provided. Executing market buy...")
-        execute_market_buy(trade, position_data)
-    
-    logging.info(f"🔍 [THREAD] {trade['ticker']} ADD: Monitoring current price to reach avg entry price ≤ {desired_avg_price}...")
-    
-    wait_time = 2
+    desired_avg_price = trade["desired_avg_price"]
+    current_price = position_data["current_price"]
+    avg_entry_price = float(position_data["avg_entry_price"])
+    qty = int(position_data["quantity"])
 
-    while True:
-        position_data = get_position_data(trade['ticker'])
-        current_price = position_data["current_price"]
-        avg_entry_price = float(position_data["avg_entry_price"])
-        qty = int(position_data["quantity"])
-        
-        buy_size = max(1, int(max_add_value / (current_price * 100)))
+    buy_size = max(1, int(max_add_value / (current_price * 100)))
 
-        if buy_size < 1:
-            logging.warning(f"⚠️ {trade['ticker']} [THREAD] ADD: Insufficient funds. Skipping add...")
-            return
+    if buy_size < 1:
+        logger.warning("⚠️ %s [TRIGGERS] ADD: Insufficient funds. Skipping add...", trade['ticker'])
+        return True
 
-        # Calculate new average entry price after buying at current price
-        new_total_cost = ((avg_entry_price * 100) * qty) + ((current_price * 100) * buy_size)
-        new_total_size = qty + buy_size
-        current_avg_entry_price = (new_total_cost / new_total_size) / 100
+    if desired_avg_price is None:
+        logger.warning("📡 [EXEC] %s ADD: No desired average price provided. Executing market buy...", trade['ticker'])
+        execute_market_buy(buy_size, position_data, trade)
+        return True
 
-        logging.info(f"📊 [THREAD] {trade['ticker']} ADD: Current Price: {current_price:.2f}, Current Avg Entry: {avg_entry_price:.2f}, "
-            f"Target Avg Entry: {desired_avg_price:.2f}, New Potential Avg Entry: {current_avg_entry_price:.2f}, Buy Size: {buy_size}")
+    # Calculate new average entry price after buying at current price
+    new_total_cost = ((avg_entry_price * 100) * qty) + ((current_price * 100) * buy_size)
+    new_total_size = qty + buy_size
+    current_avg_entry_price = (new_total_cost / new_total_size) / 100
 
-        if current_avg_entry_price <= desired_avg_price:
-            logging.info(f"📡 [THREAD] {trade['ticker']} ADD: Target avg entry price reached. Executing market buy...")
-            execute_market_buy(buy_size, position_data)
-            return
+    logger.info("📊 [TRIGGERS] %s ADD: Current Price: %.2f, Current Avg Entry: %.2f, Target Avg Entry: %.2f, New Potential Avg Entry: %.2f, Buy Size: %d",
+        trade['ticker'], current_price, avg_entry_price, desired_avg_price, current_avg_entry_price, buy_size)
 
-        wait_time = min(wait_time * 1.05, 10)
-        time.sleep(wait_time)
+    if current_avg_entry_price <= desired_avg_price:
+        logger.info("📡 [EXEC] %s ADD: Target avg entry price reached. Executing market buy...", trade['ticker'])
+        execute_market_buy(buy_size, position_data, trade)
+        return True
+    return False
 
 def handle_trade_entry(trade):
     if trade["type"] == "in":
-        logging.info(f"📡 [MAIN] Executing limit buy for {trade['ticker']} @ {trade['option_price']}...")
+        logger.info("📡 [MAIN] Executing limit buy for %s @ %s...", trade['ticker'], trade['option_price'])
         execute_limit_buy(trade)
 
     elif trade["type"] == "added":
         position_data = get_position_data(trade['ticker'])
         if not position_data:
-            logging.warning(f"⚠️ [MAIN] No open position found for {trade['ticker']}. Skipping add...")
+            logger.warning("⚠️ [MAIN] No open position found for %s. Skipping add...", trade['ticker'])
             return
-        
-        entry_thread = threading.Thread(target=monitor_position_and_add, args=(trade, position_data))
-        entry_thread.daemon = True
-        entry_thread.start()
+
+        try:
+            max_add_value = AccountCache.get_instance().get_cash("add") * 0.01
+        except Exception as e:
+            logger.error("❌ [MAIN] %s ADD: Failed to fetch account balance: %s", trade['ticker'], e)
+            return
+
+        logger.info("🔍 [MAIN] %s ADD: Waiting for avg entry price ≤ %s...", trade['ticker'], trade['desired_avg_price'])
+        TriggerBook.get_instance().add(trade['ticker'], "ADD", lambda data: check_position_and_add(trade, data, max_add_value))
     else:
-        logging.error(f"❌ Unknown trade type: {trade['type']}")
+        logger.error("❌ Unknown trade type: %s", trade['type'])
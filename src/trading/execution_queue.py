@@ -0,0 +1,98 @@
+import time
+import zlib
+import queue
+import logging
+import threading
+from collections import deque
+from src.metrics.latency import LatencyMetrics
+
+logger = logging.getLogger(__name__)
+
+class ExecutionQueue:
+    """Runs order placement off the scraper loop on a bounded pool of worker threads.
+
+    Signals are sharded to workers by ticker, so signals for one symbol run in the order they
+    were enqueued (an "out" can never overtake its "in") while different symbols run concurrently.
+    """
+
+    def __init__(self, handle_trade_entry, handle_trade_exit, workers=4, maxsize=500, slow_wait=1.0):
+        self.handlers = {"entry": handle_trade_entry, "exit": handle_trade_exit}
+        self.slow_wait = slow_wait
+        self.queues = [queue.Queue(maxsize=maxsize) for _ in range(workers)]
+        self.lock = threading.Lock()
+        self.wait_times = deque(maxlen=1000)
+        self.processed = 0
+        self.failed = 0
+        self._threads = []
+
+    def _shard(self, ticker):
+        return zlib.crc32(str(ticker).upper().encode()) % len(self.queues)
+
+    def enqueue(self, kind, trade):
+        shard = self.queues[self._shard(trade.get("ticker"))]
+        if shard.full():
+            logger.warning(f"⚠️ [EXECUTION] Queue full ({shard.qsize()}); {trade['ticker']} {trade['type']} waiting for space...")
+        LatencyMetrics.get_instance().mark(trade, "queued")
+        shard.put((kind, trade, time.monotonic()))
+
+    def enqueue_entry(self, trade):
+        self.enqueue("entry", trade)
+
+    def enqueue_exit(self, trade):
+        self.enqueue("exit", trade)
+
+    def _work(self, shard):
+        while True:
+            kind, trade, enqueued_at = shard.get()
+            if kind is None:
+                break
+
+            wait = time.monotonic() - enqueued_at
+            with self.lock:
+                self.wait_times.append(wait)
+            if wait > self.slow_wait:
+                logger.warning(f"🐢 [EXECUTION] {trade['ticker']} {trade['type']} waited {wait:.2f}s in queue")
+
+            try:
+                self.handlers[kind](trade)
+                with self.lock:
+                    self.processed += 1
+            except Exception as e:
+                with self.lock:
+                    self.failed += 1
+                logger.error(f"❌ [EXECUTION] {trade['ticker']} {trade['type']} failed: {e}")
+
+    def start(self):
+        if self._threads:
+            return
+        for idx, shard in enumerate(self.queues):
+            thread = threading.Thread(target=self._work, args=(shard,), name=f"execution-{idx}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"🏭 [EXECUTION] Started {len(self._threads)} order workers")
+
+    def stop(self, timeout=30):
+        for shard in self.queues:
+            shard.put((None, None, None))
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+    def get_stats(self):
+        with self.lock:
+            waits = sorted(self.wait_times)
+            processed, failed = self.processed, self.failed
+        return {
+            "depth": sum(shard.qsize() for shard in self.queues),
+            "depth_per_worker": [shard.qsize() for shard in self.queues],
+            "processed": processed,
+            "failed": failed,
+            "wait_p50": waits[len(waits) // 2] if waits else None,
+            "wait_max": waits[-1] if waits else None,
+        }
+
+    def log_stats(self):
+        stats = self.get_stats()
+        wait_p50 = f"{stats['wait_p50'] * 1000:.0f}ms" if stats["wait_p50"] is not None else "n/a"
+        logger.info(f"🏭 [EXECUTION] Depth {stats['depth']} {stats['depth_per_worker']}, processed {stats['processed']}, "
+                    f"failed {stats['failed']}, wait p50 {wait_p50}")
@@ -0,0 +1,252 @@
+import json
+import time
+import asyncio
+import logging
+import threading
+import msgpack
+import websockets
+from src.trading.position_cache import PositionCache, parse_occ_symbol
+from config import ALPACA_API_KEY, ALPACA_API_SECRET
+
+logger = logging.getLogger(__name__)
+
+STOCK_STREAM_URL = "wss://stream.data.alpaca.markets/v2/iex"
+OPTION_STREAM_URL = "wss://stream.data.alpaca.markets/v1beta1/indicative"
+
+def make_quote(symbol, bid, ask, received_at=None):
+    bid = float(bid or 0)
+    ask = float(ask or 0)
+    mid = (bid + ask) / 2 if bid and ask else (ask or bid)
+    return {"symbol": symbol, "bid": bid, "ask": ask, "mid": mid, "received_at": received_at or time.time()}
+
+def apply_quote(position_data, quote):
+    """Returns a copy of an option position re-marked at the quote's mid price."""
+    if not quote or not quote["mid"] or position_data.get("asset_class") != "option":
+        return position_data
+    marked = dict(position_data)
+    marked["current_price"] = quote["mid"]
+    marked["market_value"] = quote["mid"] * 100 * position_data["quantity"]
+    if position_data["avg_entry_price"]:
+        direction = 1 if position_data["side"] == "long" else -1
+        marked["unrealized_plpc"] = direction * (quote["mid"] - position_data["avg_entry_price"]) / position_data["avg_entry_price"] * 100
+    return marked
+
+class AlpacaQuoteTransport:
+    """Alpaca market-data websocket (msgpack). One instance per feed: stocks or options."""
+
+    def __init__(self, url, key=ALPACA_API_KEY, secret=ALPACA_API_SECRET):
+        self.url = url
+        self.key = key
+        self.secret = secret
+        self.symbols = set()
+        self.loop = None
+        self.websocket = None
+        self._running = False
+
+    def subscribe(self, symbols):
+        self.symbols |= set(symbols)
+        self._send({"action": "subscribe", "quotes": sorted(symbols)})
+
+    def unsubscribe(self, symbols):
+        self.symbols -= set(symbols)
+        self._send({"action": "unsubscribe", "quotes": sorted(symbols)})
+
+    def _send(self, message):
+        if self.loop and self.websocket:
+            asyncio.run_coroutine_threadsafe(self.websocket.send(msgpack.packb(message)), self.loop)
+
+    def run(self, on_quote):
+        self.loop = asyncio.new_event_loop()
+        self._running = True
+        self.loop.run_until_complete(self._run(on_quote))
+
+    async def _run(self, on_quote):
+        backoff = 1
+        while self._running:
+            try:
+                async with websockets.connect(self.url, extra_headers={"Content-Type": "application/msgpack"}) as websocket:
+                    await websocket.recv()
+                    await websocket.send(msgpack.packb({"action": "auth", "key": self.key, "secret": self.secret}))
+                    auth = msgpack.unpackb(await websocket.recv())
+                    if not any(msg.get("T") == "success" and msg.get("msg") == "authenticated" for msg in auth):
+                        raise ConnectionError(f"authentication failed: {auth}")
+
+                    self.websocket = websocket
+                    if self.symbols:
+                        await websocket.send(msgpack.packb({"action": "subscribe", "quotes": sorted(self.symbols)}))
+                    logger.info(f"📶 [QUOTES] Connected to {self.url} ({len(self.symbols)} symbols)")
+                    backoff = 1
+
+                    async for raw in websocket:
+                        received_at = time.time()
+                        for msg in msgpack.unpackb(raw):
+                            if msg.get("T") == "q":
+                                on_quote(make_quote(msg["S"], msg.get("bp"), msg.get("ap"), received_at))
+                            elif msg.get("T") == "error":
+                                logger.error(f"❌ [QUOTES] {self.url}: {msg}")
+
+            except Exception as e:
+                self.websocket = None
+                if not self._running:
+                    break
+                logger.error(f"⚠️ [QUOTES] {self.url} disconnected: {e}. Reconnecting in {backoff}s...")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+
+    def stop(self):
+        self._running = False
+        if self.loop and self.websocket:
+            asyncio.run_coroutine_threadsafe(self.websocket.close(), self.loop)
+
+class ReplayQuoteTransport:
+    """Replays recorded quotes ({"symbol", "bid", "ask"} dicts or a JSONL file) for tests and backtests.
+
+    Only subscribed symbols are emitted. speed=None emits as fast as possible; otherwise the gaps
+    between recorded "t" timestamps (seconds) are replayed divided by speed.
+    """
+
+    def __init__(self, quotes, speed=None):
+        self.quotes = quotes
+        self.speed = speed
+        self.symbols = set()
+        self._running = False
+
+    def subscribe(self, symbols):
+        self.symbols |= set(symbols)
+
+    def unsubscribe(self, symbols):
+        self.symbols -= set(symbols)
+
+    def _records(self):
+        if isinstance(self.quotes, str):
+            with open(self.quotes, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+        else:
+            yield from self.quotes
+
+    def run(self, on_quote):
+        self._running = True
+        previous = None
+        for record in self._records():
+            if not self._running:
+                break
+            if self.speed and previous is not None and record.get("t") is not None:
+                time.sleep(max(0, record["t"] - previous) / self.speed)
+            previous = record.get("t", previous)
+            if record["symbol"] in self.symbols:
+                on_quote(make_quote(record["symbol"], record.get("bid"), record.get("ask")))
+
+    def stop(self):
+        self._running = False
+
+class QuoteStream:
+    """Keeps quote subscriptions in sync with the positions pending triggers watch and fans quotes out.
+
+    Option symbols go to the option transport, everything else to the stock transport.
+    """
+    _instance = None
+
+    @staticmethod
+    def get_instance():
+        if QuoteStream._instance is None:
+            QuoteStream._instance = QuoteStream(
+                stock_transport=AlpacaQuoteTransport(STOCK_STREAM_URL),
+                option_transport=AlpacaQuoteTransport(OPTION_STREAM_URL),
+            )
+        return QuoteStream._instance
+
+    def __init__(self, stock_transport, option_transport=None, position_cache=None):
+        self.stock_transport = stock_transport
+        self.option_transport = option_transport or stock_transport
+        self.position_cache = position_cache or PositionCache.get_instance()
+        self.lock = threading.Lock()
+        self.quotes = {}
+        self.subscribed = set()
+        self.listeners = []
+        self.trigger_book = None
+        self.chaser = None
+        self._threads = []
+
+    def add_listener(self, callback):
+        """callback(quote) runs on the transport thread for every quote."""
+        self.listeners.append(callback)
+
+    def attach(self, trigger_book):
+        """Re-marks positions with live quotes for the trigger book and wakes it on every quote."""
+        self.trigger_book = trigger_book
+        trigger_book.quote_source = self
+        self.add_listener(lambda quote: trigger_book.notify())
+        trigger_book.add_listener(lambda book: self.sync_subscriptions())
+
+    def attach_chaser(self, chaser):
+        """Quotes contracts while the order chaser works them, and serves it their bid/ask."""
+        self.chaser = chaser
+        chaser.quote_source = self
+        chaser.on_working_changed = self.sync_subscriptions
+
+    def get_quote(self, symbol):
+        with self.lock:
+            return self.quotes.get(symbol.upper())
+
+    def mark(self, position_data):
+        if not position_data:
+            return position_data
+        return apply_quote(position_data, self.get_quote(position_data["symbol"]))
+
+    def on_quote(self, quote):
+        with self.lock:
+            self.quotes[quote["symbol"]] = quote
+        for callback in self.listeners:
+            try:
+                callback(quote)
+            except Exception as e:
+                logger.error(f"❌ [QUOTES] Listener failed: {e}")
+
+    def desired_symbols(self):
+        # Only what consumes quotes: the contract each pending trigger marks, and the contracts being chased
+        symbols = set()
+        if self.trigger_book is not None:
+            for ticker in self.trigger_book.tickers():
+                position_data = self.position_cache.cached_position(ticker)
+                if position_data:
+                    symbols.add(position_data["symbol"].upper())
+        if self.chaser is not None:
+            symbols |= self.chaser.symbols()
+        return symbols
+
+    def sync_subscriptions(self):
+        desired = self.desired_symbols()
+        with self.lock:
+            added = desired - self.subscribed
+            removed = self.subscribed - desired
+            self.subscribed = desired
+            for symbol in removed:
+                self.quotes.pop(symbol, None)
+
+        for transport, is_option in ((self.option_transport, True), (self.stock_transport, False)):
+            to_add = [symbol for symbol in added if (parse_occ_symbol(symbol) is not None) == is_option]
+            to_remove = [symbol for symbol in removed if (parse_occ_symbol(symbol) is not None) == is_option]
+            if to_add:
+                transport.subscribe(to_add)
+            if to_remove:
+                transport.unsubscribe(to_remove)
+
+        if added or removed:
+            logger.info(f"📶 [QUOTES] Subscriptions: +{sorted(added)} -{sorted(removed)}")
+
+    def start(self):
+        if self._threads:
+            return
+        self.position_cache.add_listener(lambda cache: self.sync_subscriptions())
+        self.sync_subscriptions()
+        transports = {id(self.stock_transport): self.stock_transport, id(self.option_transport): self.option_transport}
+        for transport in transports.values():
+            thread = threading.Thread(target=transport.run, args=(self.on_quote,), name="quote-stream", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        for transport in {id(self.stock_transport): self.stock_transport, id(self.option_transport): self.option_transport}.values():
+            transport.stop()
@@ -0,0 +1,237 @@
+import time
+import bisect
+import logging
+import threading
+import datetime as dt
+from src.trading.alpaca_client import api
+from src.trading.clock import get_clock
+
+logger = logging.getLogger(__name__)
+
+# A listed expiry this many days either side of the called one is used instead (e.g. Thursday expiries in a holiday week)
+MAX_EXPIRY_DRIFT_DAYS = 3
+# A listed strike within this fraction of the called one is used instead (e.g. a typo'd 512 -> 512.5)
+MAX_STRIKE_DRIFT = 0.02
+# Page size for /options/contracts (the API maximum)
+CONTRACTS_PAGE_LIMIT = 10000
+
+RIGHTS = {"C": "call", "P": "put"}
+
+def occ_symbol(root, expiry, right, strike):
+    """expiry is a date; right is "C" or "P"."""
+    return f"{root.upper()}{expiry.strftime('%y%m%d')}{right.upper()}{int(round(float(strike) * 1000)):08d}"
+
+def resolve_expiration(expiration, today):
+    """ "MM/DD" (or "MM/DD/YY[YY]") -> date. Without a year, the next occurrence on or after today, so a
+    January expiry called in late December lands in the next year. None if it does not parse."""
+    try:
+        parts = [int(part) for part in expiration.split("/")]
+        month, day = parts[0], parts[1]
+        if len(parts) > 2:
+            year = parts[2] + 2000 if parts[2] < 100 else parts[2]
+            return dt.date(year, month, day)
+        for year in (today.year, today.year + 1):
+            try:
+                expiry = dt.date(year, month, day)
+            except ValueError:
+                # 2/29 outside a leap year
+                continue
+            if expiry >= today:
+                return expiry
+    except (AttributeError, ValueError, IndexError):
+        pass
+    return None
+
+class OptionChain:
+    """Listed contracts of one underlying, indexed by (root, expiry, strike, right)."""
+
+    def __init__(self, underlying, contracts, refreshed_at):
+        self.underlying = underlying
+        self.refreshed_at = refreshed_at
+        self.symbols = {}
+        strikes = {}
+        for contract in contracts:
+            expiry = dt.date.fromisoformat(contract["expiration_date"])
+            right = "C" if contract["type"] == "call" else "P"
+            strike = float(contract["strike_price"])
+            root = contract.get("root_symbol") or underlying
+            self.symbols[(root, expiry, strike, right)] = contract["symbol"]
+            strikes.setdefault((root, expiry, right), set()).add(strike)
+        self.strikes = {key: sorted(values) for key, values in strikes.items()}
+        self.expiries = sorted({expiry for _, expiry, _ in self.strikes})
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def nearest_expiry(self, expiry):
+        """Exact match, else the closest listed expiry within MAX_EXPIRY_DRIFT_DAYS (earlier wins a tie)."""
+        idx = bisect.bisect_left(self.expiries, expiry)
+        candidates = self.expiries[max(0, idx - 1):idx + 1]
+        best = min(candidates, key=lambda listed: (abs((listed - expiry).days), listed), default=None)
+        if best is None or abs((best - expiry).days) > MAX_EXPIRY_DRIFT_DAYS:
+            return None
+        return best
+
+    def nearest_strike(self, root, expiry, right, strike):
+        strikes = self.strikes.get((root, expiry, right))
+        if not strikes:
+            return None
+        idx = bisect.bisect_left(strikes, strike)
+        best = min(strikes[max(0, idx - 1):idx + 1], key=lambda listed: (abs(listed - strike), listed))
+        if abs(best - strike) > strike * MAX_STRIKE_DRIFT:
+            return None
+        return best
+
+    def lookup(self, root, expiry, right, strike):
+        """(symbol, listed expiry, listed strike) for the nearest valid contract, or None."""
+        symbol = self.symbols.get((root, expiry, strike, right))
+        if symbol:
+            return symbol, expiry, strike
+        listed_expiry = self.nearest_expiry(expiry)
+        if listed_expiry is None:
+            return None
+        listed_strike = self.nearest_strike(root, listed_expiry, right, strike)
+        if listed_strike is None:
+            return None
+        return self.symbols[(root, listed_expiry, listed_strike, right)], listed_expiry, listed_strike
+
+class OptionChainIndex:
+    """Locally cached option chains for the underlyings we trade, refreshed in the background.
+
+    Callout symbols resolve against memory instead of finding out at submit_order that the contract
+    does not exist. Underlyings are added by watch() (or on first resolve) and fetched on the poller
+    thread; until one is indexed, resolve() falls back to building the OCC symbol from the callout.
+    """
+    _instance = None
+
+    @staticmethod
+    def get_instance():
+        if OptionChainIndex._instance is None:
+            OptionChainIndex._instance = OptionChainIndex()
+        return OptionChainIndex._instance
+
+    def __init__(self, refresh_interval=900, miss_refresh_interval=60, max_expiry_days=400):
+        self.refresh_interval = refresh_interval
+        # A miss on an indexed underlying refetches it once this old; new strikes get listed intraday
+        self.miss_refresh_interval = miss_refresh_interval
+        self.max_expiry_days = max_expiry_days
+        self.lock = threading.Lock()
+        self.refresh_lock = threading.Lock()
+        self.chains = {}
+        self.watched = set()
+        self.stats = {"hits": 0, "adjusted": 0, "rejected": 0, "fallbacks": 0, "refreshes": 0, "refresh_errors": 0}
+        self._thread = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+
+    def watch(self, *underlyings):
+        with self.lock:
+            new = {underlying.upper() for underlying in underlyings} - self.watched
+            self.watched |= new
+        if new:
+            self._wake.set()
+
+    def fetch_contracts(self, underlying):
+        today = get_clock().now().date()
+        params = {
+            "underlying_symbols": underlying,
+            "expiration_date_gte": today.isoformat(),
+            "expiration_date_lte": (today + dt.timedelta(days=self.max_expiry_days)).isoformat(),
+            "limit": CONTRACTS_PAGE_LIMIT,
+        }
+        contracts = []
+        while True:
+            page = api.get("/options/contracts", params)
+            contracts.extend(page.get("option_contracts") or ())
+            if not page.get("next_page_token"):
+                return contracts
+            params["page_token"] = page["next_page_token"]
+
+    def refresh(self, underlying):
+        underlying = underlying.upper()
+        with self.refresh_lock:
+            try:
+                contracts = self.fetch_contracts(underlying)
+            except Exception as e:
+                self.stats["refresh_errors"] += 1
+                logger.error(f"⚠️ [CHAIN] Failed to fetch the {underlying} option chain: {e}")
+                return False
+            chain = OptionChain(underlying, contracts, time.monotonic())
+            with self.lock:
+                self.chains[underlying] = chain
+                self.stats["refreshes"] += 1
+        logger.info(f"🔗 [CHAIN] {underlying}: {len(chain)} contracts over {len(chain.expiries)} expiries")
+        return True
+
+    def get_chain(self, underlying):
+        with self.lock:
+            return self.chains.get(underlying.upper())
+
+    def resolve(self, ticker, expiration, option_type, strike_price):
+        """OCC symbol for a callout contract, snapped to the nearest listed one. None means rejected:
+        the expiration does not parse, or the underlying is indexed and lists nothing close enough."""
+        ticker = ticker.upper()
+        right = option_type.upper()[:1]
+        strike = float(strike_price)
+        expiry = resolve_expiration(expiration, get_clock().now().date())
+        if expiry is None:
+            self.stats["rejected"] += 1
+            logger.error(f"⚠️ [CHAIN] Invalid expiration format: {expiration}. Must include a day (e.g., MM/DD). Trade rejected.")
+            return None
+
+        chain = self.get_chain(ticker)
+        if chain is None:
+            self.watch(ticker)
+            self.stats["fallbacks"] += 1
+            return occ_symbol(ticker, expiry, right, strike)
+
+        found = chain.lookup(ticker, expiry, right, strike)
+        if found is None and time.monotonic() - chain.refreshed_at > self.miss_refresh_interval and self.refresh(ticker):
+            chain = self.get_chain(ticker)
+            found = chain.lookup(ticker, expiry, right, strike)
+        if found is None:
+            self.stats["rejected"] += 1
+            logger.error(f"❌ [CHAIN] {ticker} {expiry:%m/%d/%y} {strike:g}{right} is not listed and nothing is close. Trade rejected.")
+            return None
+
+        symbol, listed_expiry, listed_strike = found
+        if (listed_expiry, listed_strike) != (expiry, strike):
+            self.stats["adjusted"] += 1
+            logger.warning(f"🔄 [CHAIN] {ticker} {expiry:%m/%d/%y} {strike:g}{right} is not listed; using {listed_expiry:%m/%d/%y} {listed_strike:g}{right}")
+        else:
+            self.stats["hits"] += 1
+        return symbol
+
+    def start(self, underlyings=()):
+        self.watch(*underlyings)
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="option-chain", daemon=True)
+        self._thread.start()
+        logger.info(f"🔗 [CHAIN] Option chain poller started ({self.refresh_interval}s interval)")
+
+    def _run(self):
+        while not self._stop.is_set():
+            now = time.monotonic()
+            with self.lock:
+                due = [underlying for underlying in self.watched
+                       if underlying not in self.chains or now - self.chains[underlying].refreshed_at >= self.refresh_interval]
+            for underlying in due:
+                if self._stop.is_set():
+                    return
+                self.refresh(underlying)
+            # Wakes early when a new underlying is watched
+            self._wake.wait(min(self.refresh_interval, 60))
+            self._wake.clear()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def log_stats(self):
+        with self.lock:
+            indexed = len(self.chains)
+        stats = self.stats
+        logger.info(f"🔗 [CHAIN] {indexed} chains indexed, {stats['hits']} hits, {stats['adjusted']} adjusted, "
+                    f"{stats['rejected']} rejected, {stats['fallbacks']} fallbacks, {stats['refresh_errors']} refresh errors")
@@ -0,0 +1,323 @@
+import math
+import time
+import logging
+import threading
+from collections import deque
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from src.trading.alpaca_client import api
+from src.trading.order_tracker import OrderTracker, TERMINAL_STATUSES, order_to_dict
+from src.trading.clock import get_clock
+from src.metrics.latency import LatencyHistogram
+from config import CHASE_MAX_SLIPPAGE, CHASE_TIME_BUDGET, CHASE_STEP_INTERVAL, CHASE_MARKET_FALLBACK
+
+logger = logging.getLogger(__name__)
+
+# Chases kept for the slippage percentiles
+SLIPPAGE_SAMPLES = 1000
+
+def tick_size(price):
+    """Option minimum increment: $0.01 below $3, $0.05 above (penny-pilot names trade in pennies, so this is conservative)."""
+    return 0.01 if price < 3 else 0.05
+
+def round_up_to_tick(price):
+    tick = tick_size(price)
+    return round(math.ceil(round(price / tick, 6)) * tick, 2)
+
+class ChaseResult:
+    def __init__(self, symbol, qty, reference_price):
+        self.symbol = symbol
+        self.qty = qty
+        self.reference_price = reference_price
+        self.order_ids = []
+        self.filled_qty = 0
+        self.filled_notional = 0.0
+        self.replacements = 0
+        self.time_to_fill = None
+        self.last_price = None
+        # False once an order's final fills could not be read; filled_qty may then undercount
+        self.settled = True
+
+    @property
+    def avg_fill_price(self):
+        return self.filled_notional / self.filled_qty if self.filled_qty else None
+
+    @property
+    def remaining(self):
+        return self.qty - self.filled_qty
+
+    @property
+    def slippage(self):
+        """Fraction paid above the callout price (negative means price improvement)."""
+        if not self.filled_qty or not self.reference_price:
+            return None
+        return (self.avg_fill_price - self.reference_price) / self.reference_price
+
+class OrderChaser:
+    """Works a limit buy toward the market with replace_order instead of a fixed buffer and a market fallback.
+
+    The first limit is the callout price (or the quote mid when that is higher, capped at the ceiling).
+    Every step_interval without a fill, the limit moves a step of the way from there to the ask, never
+    above reference * (1 + max_slippage). With no quote for the contract the path runs to the ceiling
+    instead. When time_budget runs out the order is cancelled; the remainder is only sent at market
+    if market_fallback is set. quote_source is anything with get_quote(symbol) -> {"bid", "ask"}:
+    the QuoteStream live, the simulated broker in the backtest.
+    """
+    _instance = None
+
+    @staticmethod
+    def get_instance():
+        if OrderChaser._instance is None:
+            OrderChaser._instance = OrderChaser()
+        return OrderChaser._instance
+
+    def __init__(self, max_slippage=CHASE_MAX_SLIPPAGE, time_budget=CHASE_TIME_BUDGET, step_interval=CHASE_STEP_INTERVAL,
+                 market_fallback=CHASE_MARKET_FALLBACK, quote_source=None):
+        self.max_slippage = max_slippage
+        self.time_budget = time_budget
+        self.step_interval = step_interval
+        self.market_fallback = market_fallback
+        self.quote_source = quote_source
+        self.lock = threading.Lock()
+        # Contracts with a working order; the QuoteStream subscribes to them while they are chased
+        self.working = set()
+        self.on_working_changed = None
+        self.stats = {"chases": 0, "filled": 0, "partial": 0, "unfilled": 0, "replacements": 0, "contracts": 0, "contracts_filled": 0}
+        self.time_to_fill = LatencyHistogram()
+        self.slippages = deque(maxlen=SLIPPAGE_SAMPLES)
+
+    def symbols(self):
+        with self.lock:
+            return set(self.working)
+
+    def _set_working(self, symbol, working):
+        with self.lock:
+            if working:
+                self.working.add(symbol)
+            else:
+                self.working.discard(symbol)
+        if self.on_working_changed is not None:
+            try:
+                self.on_working_changed()
+            except Exception as e:
+                logger.error("❌ [CHASE] Working-symbol listener failed: %s", e)
+
+    def get_quote(self, symbol):
+        if self.quote_source is None:
+            return None
+        quote = self.quote_source.get_quote(symbol)
+        if not quote or not quote.get("ask"):
+            return None
+        return quote
+
+    def ceiling(self, reference_price):
+        return round_up_to_tick(reference_price * (1 + self.max_slippage))
+
+    def price_path(self, reference_price, quote, step, steps):
+        """Limit for step 0..steps: a straight line from the opening price to min(ask, ceiling)."""
+        ceiling = self.ceiling(reference_price)
+        opening = reference_price
+        target = ceiling
+        if quote:
+            if quote.get("bid"):
+                opening = max(opening, (quote["bid"] + quote["ask"]) / 2)
+            target = min(quote["ask"], ceiling)
+        opening = min(opening, ceiling)
+        target = max(target, opening)
+        return min(ceiling, round_up_to_tick(opening + (target - opening) * step / max(1, steps)))
+
+    def _account(self, result, order):
+        """Adds an order's fills to the running total once it is done (filled, replaced or cancelled)."""
+        filled = int(float(order.get("filled_qty") or 0))
+        if filled and order.get("filled_avg_price") is not None:
+            result.filled_qty += filled
+            result.filled_notional += filled * float(order["filled_avg_price"])
+
+    def _current_order(self, order_id):
+        try:
+            return order_to_dict(api.get_order(order_id))
+        except Exception as e:
+            logger.warning("⚠️ [CHASE] Could not read order %s: %s", order_id, e)
+            return None
+
+    def _final_state(self, order_id, fill):
+        """Final fills of a cancelled or replaced order: its tracker update, else a fresh get_order.
+        None if neither shows it done, in which case its fill count is unknown."""
+        try:
+            return get_clock().wait(fill, self.step_interval)
+        except FutureTimeoutError:
+            order = self._current_order(order_id)
+            if order is not None and order.get("status") in TERMINAL_STATUSES:
+                return order
+            return None
+
+    def _settle(self, result, order_id, fill):
+        order = self._final_state(order_id, fill)
+        if order is None:
+            result.settled = False
+            logger.warning("⚠️ [CHASE] %s order %s did not report its final fills; stopping the chase", result.symbol, order_id)
+            return
+        self._account(result, order)
+
+    def chase_buy(self, symbol, qty, reference_price, track=None):
+        """Buys qty of symbol, chasing from reference_price. Returns a ChaseResult.
+
+        track(response, submitted_at) -> Future is called for every order in the chain, so the caller
+        can hook its latency metrics; by default orders go straight to the OrderTracker.
+        """
+        clock = get_clock()
+        tracker = OrderTracker.get_instance()
+        track = track or (lambda response, submitted_at: tracker.track(response, submitted_at))
+        result = ChaseResult(symbol, qty, reference_price)
+        steps = max(1, int(self.time_budget / self.step_interval))
+        started = clock.monotonic()
+        deadline = started + self.time_budget
+
+        self._set_working(symbol, True)
+        try:
+            step = 0
+            limit_price = self.price_path(reference_price, self.get_quote(symbol), step, steps)
+            # OrderTracker measures fill latency on the wall monotonic clock
+            submitted_at = time.monotonic()
+            response = api.submit_order(symbol=symbol, qty=qty, side="buy", type="limit",
+                                        limit_price=str(limit_price), time_in_force="day")
+            logger.info("✅ [CHASE] %s BUY %s @ %s (callout %s, ceiling %s)", symbol, qty, limit_price, reference_price, self.ceiling(reference_price))
+            order_id, fill = response.id, track(response, submitted_at)
+            result.order_ids.append(order_id)
+            # Set when a replacement came out larger than what is still needed
+            resize = False
+
+            while True:
+                if resize:
+                    next_price, resize = limit_price, False
+                else:
+                    try:
+                        order = clock.wait(fill, max(0.0, min(self.step_interval, deadline - clock.monotonic())))
+                    except FutureTimeoutError:
+                        order = None
+
+                    if order is not None:
+                        # Filled, or cancelled/rejected by the broker
+                        self._account(result, order)
+                        break
+
+                    if clock.monotonic() >= deadline:
+                        try:
+                            api.cancel_order(order_id)
+                        except Exception as e:
+                            logger.warning("⚠️ [CHASE] %s cancel failed (likely filled): %s", symbol, e)
+                        self._settle(result, order_id, fill)
+                        break
+
+                    if not result.settled:
+                        # Without the earlier orders' fills the remainder is unknown; let this order work to the deadline
+                        continue
+                    step = min(steps, step + 1)
+                    next_price = self.price_path(reference_price, self.get_quote(symbol), step, steps)
+                    if next_price < limit_price + tick_size(limit_price) / 2:
+                        continue
+
+                # Size the replacement from the broker's fill count, not the last (possibly stale) update
+                current = self._current_order(order_id)
+                if current is None:
+                    continue
+                if current.get("status") in TERMINAL_STATUSES:
+                    tracker.update(current)
+                    self._account(result, current)
+                    break
+                remaining = qty - result.filled_qty - int(float(current.get("filled_qty") or 0))
+                if remaining <= 0:
+                    # The working order already covers the rest: drop its excess instead of repricing
+                    try:
+                        api.cancel_order(order_id)
+                    except Exception as e:
+                        logger.warning("⚠️ [CHASE] %s cancel failed (likely filled): %s", symbol, e)
+                    self._settle(result, order_id, fill)
+                    break
+
+                try:
+                    replaced = api.replace_order(order_id, qty=str(remaining), limit_price=str(next_price))
+                except Exception as e:
+                    # Usually the order filled between the last update and the replace
+                    logger.warning("⚠️ [CHASE] %s replace @ %s failed: %s", symbol, next_price, e)
+                    continue
+
+                self._settle(result, order_id, fill)
+                result.replacements += 1
+                limit_price = next_price
+                order_id, fill = replaced.id, track(replaced, time.monotonic())
+                result.order_ids.append(order_id)
+                logger.info("🔁 [CHASE] %s repriced to %s (%s left)", symbol, limit_price, result.remaining)
+                if result.settled and remaining > result.remaining:
+                    # The old order filled more between the read and the replace
+                    logger.warning("⚠️ [CHASE] %s replacement for %s exceeds the %s still needed; resizing", symbol, remaining, result.remaining)
+                    resize = True
+
+            result.last_price = limit_price
+
+            if result.remaining > 0 and self.market_fallback:
+                if not result.settled:
+                    logger.warning("⚠️ [CHASE] %s fills unknown; skipping the market fallback for the remaining %s", symbol, result.remaining)
+                else:
+                    logger.info("📡 [CHASE] %s budget spent; buying the remaining %s at market", symbol, result.remaining)
+                    submitted_at = time.monotonic()
+                    response = api.submit_order(symbol=symbol, qty=result.remaining, side="buy", type="market", time_in_force="day")
+                    try:
+                        self._account(result, clock.wait(track(response, submitted_at), self.time_budget))
+                    except FutureTimeoutError:
+                        pass
+
+            if result.filled_qty:
+                result.time_to_fill = clock.monotonic() - started
+        finally:
+            self._set_working(symbol, False)
+            self.record(result)
+        return result
+
+    def record(self, result):
+        with self.lock:
+            self.stats["chases"] += 1
+            self.stats["contracts"] += result.qty
+            self.stats["contracts_filled"] += result.filled_qty
+            self.stats["replacements"] += result.replacements
+            if result.remaining <= 0:
+                self.stats["filled"] += 1
+            elif result.filled_qty:
+                self.stats["partial"] += 1
+            else:
+                self.stats["unfilled"] += 1
+            if result.time_to_fill is not None:
+                self.time_to_fill.record(result.time_to_fill)
+            if result.slippage is not None:
+                self.slippages.append(result.slippage)
+
+        if result.filled_qty:
+            logger.info("📊 [CHASE] %s filled %s/%s @ %.2f in %.2fs, slippage %+.2f%% vs callout %s, %s replacements",
+                        result.symbol, result.filled_qty, result.qty, result.avg_fill_price, result.time_to_fill,
+                        result.slippage * 100, result.reference_price, result.replacements)
+        else:
+            logger.warning("⚠️ [CHASE] %s not filled within %ss (last limit %s, callout %s)",
+                           result.symbol, self.time_budget, result.last_price, result.reference_price)
+
+    def get_stats(self):
+        with self.lock:
+            stats = dict(self.stats)
+            slippages = sorted(self.slippages)
+            ttf = self.time_to_fill.summary()
+        stats["fill_rate"] = stats["contracts_filled"] / stats["contracts"] if stats["contracts"] else None
+        stats["time_to_fill"] = ttf
+        stats["slippage_p50"] = slippages[len(slippages) // 2] if slippages else None
+        stats["slippage_p90"] = slippages[min(len(slippages) - 1, int(len(slippages) * 0.9))] if slippages else None
+        stats["slippage_mean"] = sum(slippages) / len(slippages) if slippages else None
+        return stats
+
+    def log_stats(self):
+        stats = self.get_stats()
+        if not stats["chases"]:
+            return
+        ttf = stats["time_to_fill"]
+        ttf_text = f"p50 {ttf['p50']:.2f}s, p99 {ttf['p99']:.2f}s" if ttf.get("count") else "n/a"
+        slippage_text = (f"p50 {stats['slippage_p50'] * 100:+.2f}%, p90 {stats['slippage_p90'] * 100:+.2f}%"
+                         if stats["slippage_p50"] is not None else "n/a")
+        logger.info("📈 [CHASE] %s chases: fill rate %.1f%% of contracts (%s filled, %s partial, %s unfilled), "
+                    "time to fill %s, slippage %s, %s replacements", stats['chases'], stats['fill_rate'] * 100,
+                    stats['filled'], stats['partial'], stats['unfilled'], ttf_text, slippage_text, stats['replacements'])
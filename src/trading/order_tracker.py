@@ -0,0 +1,164 @@
+import time
+import logging
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from alpaca_trade_api.stream import Stream
+from src.trading.alpaca_client import api
+from config import ALPACA_API_KEY, ALPACA_API_SECRET, ALPACA_BASE_URL
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = {"filled", "canceled", "expired", "rejected", "done_for_day", "replaced"}
+
+# Updates for orders not tracked yet, kept so a fill that beats track() is not lost
+EARLY_UPDATES = 1000
+
+def order_to_dict(order):
+    """Normalizes a REST Order entity or a raw trade-update order to a plain dict."""
+    if isinstance(order, dict):
+        return order
+    return dict(getattr(order, "_raw", {}) or vars(order))
+
+class OrderTracker:
+    """Resolves submitted orders as futures from Alpaca trade updates, with a polling fallback.
+
+    track() returns a Future that completes with the final order dict once the order reaches a
+    terminal status. Orders without an update for poll_interval seconds (5x that while the stream
+    is up) are polled with get_order, so fills still resolve if the stream is down. An update that
+    arrives before track() registers its order (the stream can beat the submit response) is held
+    in a small buffer and applied when track() is called.
+    """
+    _instance = None
+
+    @staticmethod
+    def get_instance():
+        if OrderTracker._instance is None:
+            OrderTracker._instance = OrderTracker()
+        return OrderTracker._instance
+
+    def __init__(self, poll_interval=1.0):
+        self.poll_interval = poll_interval
+        self.lock = threading.Lock()
+        self.orders = {}
+        self.early_updates = OrderedDict()
+        self.fill_latencies = deque(maxlen=1000)
+        self.listeners = []
+        self.stream = None
+        self._poller = None
+        self._stream_thread = None
+
+    def add_listener(self, callback):
+        """callback(order_dict) runs for every order update, tracked or not (e.g. partial fills)."""
+        self.listeners.append(callback)
+
+    def track(self, order, submitted_at=None, callback=None):
+        """callback(order_dict) runs once the order reaches a terminal status."""
+        order = order_to_dict(order)
+        future = Future()
+        if callback is not None:
+            future.add_done_callback(lambda done: callback(done.result()))
+        with self.lock:
+            early = self.early_updates.pop(order["id"], None)
+            if early is not None and order.get("status") not in TERMINAL_STATUSES:
+                # The stream got there first; its update is newer than the submit response
+                order = early
+            self.orders[order["id"]] = {
+                "future": future,
+                "order": order,
+                "submitted_at": submitted_at or time.monotonic(),
+                "last_update": time.monotonic(),
+            }
+        self._start_poller()
+        # The submit response (or an early update) may already be terminal, e.g. rejected or an instant fill
+        self.update(order)
+        return future
+
+    def get(self, order_id):
+        with self.lock:
+            tracked = self.orders.get(order_id)
+            return dict(tracked["order"]) if tracked else None
+
+    def update(self, order):
+        order = order_to_dict(order)
+        for callback in self.listeners:
+            try:
+                callback(order)
+            except Exception as e:
+                logger.error("❌ [ORDERS] Listener failed: %s", e)
+
+        with self.lock:
+            tracked = self.orders.get(order.get("id"))
+            if tracked is None:
+                if order.get("id"):
+                    self.early_updates.pop(order["id"], None)
+                    self.early_updates[order["id"]] = order
+                    if len(self.early_updates) > EARLY_UPDATES:
+                        self.early_updates.popitem(last=False)
+                return
+            tracked["order"] = order
+            tracked["last_update"] = time.monotonic()
+            if order.get("status") not in TERMINAL_STATUSES:
+                return
+            del self.orders[order["id"]]
+            latency = time.monotonic() - tracked["submitted_at"]
+            if order["status"] == "filled":
+                self.fill_latencies.append(latency)
+
+        if order["status"] == "filled":
+            logger.info("✅ [ORDERS] %s order %s filled %s @ %s in %.0fms", order.get('symbol'), order['id'],
+                        order.get('filled_qty'), order.get('filled_avg_price'), latency * 1000)
+        if not tracked["future"].done():
+            tracked["future"].set_result(order)
+
+    async def _on_trade_update(self, data):
+        self.update(data.order)
+
+    def start(self):
+        """Subscribes to the trade_updates stream. Without it, tracking relies on polling only."""
+        self._start_poller()
+        if self._stream_thread and self._stream_thread.is_alive():
+            return
+        self.stream = Stream(ALPACA_API_KEY, ALPACA_API_SECRET, base_url=ALPACA_BASE_URL)
+        self.stream.subscribe_trade_updates(self._on_trade_update)
+        self._stream_thread = threading.Thread(target=self.stream.run, name="trade-updates", daemon=True)
+        self._stream_thread.start()
+        logger.info("📶 [ORDERS] Subscribed to trade updates")
+
+    def _start_poller(self):
+        with self.lock:
+            if self._poller and self._poller.is_alive():
+                return
+            self._poller = threading.Thread(target=self._poll, name="order-poller", daemon=True)
+            self._poller.start()
+
+    def _poll(self):
+        while True:
+            time.sleep(self.poll_interval)
+            now = time.monotonic()
+            streaming = self._stream_thread is not None and self._stream_thread.is_alive()
+            max_age = self.poll_interval * (5 if streaming else 1)
+            with self.lock:
+                stale = [order_id for order_id, tracked in self.orders.items() if now - tracked["last_update"] >= max_age]
+            for order_id in stale:
+                try:
+                    self.update(api.get_order(order_id))
+                except Exception as e:
+                    logger.error("⚠️ [ORDERS] Failed to poll order %s: %s", order_id, e)
+
+    def get_stats(self):
+        with self.lock:
+            latencies = sorted(self.fill_latencies)
+            pending = len(self.orders)
+        return {
+            "pending": pending,
+            "fills": len(latencies),
+            "fill_latency_p50": latencies[len(latencies) // 2] if latencies else None,
+            "fill_latency_max": latencies[-1] if latencies else None,
+        }
+
+    def log_stats(self):
+        stats = self.get_stats()
+        latency = (f"p50 {stats['fill_latency_p50'] * 1000:.0f}ms, max {stats['fill_latency_max'] * 1000:.0f}ms"
+                   if stats["fill_latency_p50"] is not None else "n/a")
+        logger.info("📬 [ORDERS] %s pending, %s fills, submit-to-fill latency %s", stats['pending'], stats['fills'], latency)
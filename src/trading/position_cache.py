@@ -0,0 +1,165 @@
+import re
+import time
+import logging
+import threading
+from src.trading.alpaca_client import api
+
+logger = logging.getLogger(__name__)
+
+# OCC option symbol: root, YYMMDD expiration, C/P, strike * 1000 zero-padded to 8 digits
+OCC_SYMBOL = re.compile(r"^(.+?)(\d{6})([CP])(\d{8})$")
+
+def parse_occ_symbol(symbol):
+    match = OCC_SYMBOL.match(symbol.upper())
+    if not match:
+        return None
+    root, expiration, option_type, strike = match.groups()
+    return {
+        "root": root,
+        "expiration": expiration,
+        "option_type": option_type,
+        "strike_price": int(strike) / 1000,
+    }
+
+def format_position(position):
+    if position.asset_class == "us_option":
+        return {
+            "symbol": position.symbol,
+            "asset_class": "option",
+            "quantity": int(position.qty),
+            "current_price": float(position.current_price),
+            "avg_entry_price": float(position.avg_entry_price),
+            "market_value": float(position.market_value),
+            "unrealized_plpc": float(position.unrealized_plpc) * 100,
+            "side": position.side,
+        }
+    return {
+        "symbol": position.symbol,
+        "asset_class": "stock",
+        "qty": int(position.qty),
+        "current_price": float(position.current_price),
+        "market_value": float(position.market_value),
+        "unrealized_plpc": float(position.unrealized_plpc),
+        "side": position.side,
+    }
+
+class PositionCache:
+    """One list_positions() call per refresh interval, shared by every reader.
+
+    Positions are indexed by OCC symbol and by underlying root. With the background poller running,
+    reads never touch the network; without it, a read refreshes at most once per interval.
+    """
+    _instance = None
+
+    @staticmethod
+    def get_instance():
+        if PositionCache._instance is None:
+            PositionCache._instance = PositionCache()
+        return PositionCache._instance
+
+    def __init__(self, refresh_interval=2):
+        self.refresh_interval = refresh_interval
+        self.lock = threading.Lock()
+        self.refresh_lock = threading.RLock()
+        self.by_symbol = {}
+        self.options_by_root = {}
+        self.last_refresh = 0
+        self.listeners = []
+        self._thread = None
+        self._stop = threading.Event()
+
+    def add_listener(self, callback):
+        """callback(cache) runs on the refreshing thread after every successful refresh."""
+        self.listeners.append(callback)
+
+    def refresh(self):
+        with self.refresh_lock:
+            return self._refresh_locked()
+
+    def _refresh_locked(self):
+        try:
+            positions = api.list_positions()
+        except Exception as e:
+            logger.error(f"⚠️ Failed to fetch positions: {str(e)}")
+            return False
+
+        by_symbol = {}
+        options_by_root = {}
+        for position in positions:
+            data = format_position(position)
+            by_symbol[position.symbol.upper()] = data
+            if data["asset_class"] == "option":
+                contract = parse_occ_symbol(position.symbol)
+                if contract:
+                    options_by_root.setdefault(contract["root"], []).append(data)
+
+        with self.lock:
+            self.by_symbol = by_symbol
+            self.options_by_root = options_by_root
+            self.last_refresh = time.monotonic()
+
+        for callback in self.listeners:
+            try:
+                callback(self)
+            except Exception as e:
+                logger.error(f"❌ [POSITIONS] Listener failed: {e}")
+        return True
+
+    def invalidate(self):
+        """Forces the next read to refresh, e.g. right after one of our own orders."""
+        with self.lock:
+            self.last_refresh = 0
+
+    def _is_stale(self):
+        # With the poller running, allow it a full extra interval before a reader refreshes on its own
+        polling = self._thread is not None and self._thread.is_alive()
+        max_age = self.refresh_interval * (2 if polling else 1)
+        with self.lock:
+            return time.monotonic() - self.last_refresh > max_age
+
+    def _ensure_fresh(self):
+        # Re-check under the refresh lock so concurrent readers share one list_positions() call
+        if self._is_stale():
+            with self.refresh_lock:
+                if self._is_stale():
+                    self._refresh_locked()
+
+    def get_position(self, ticker):
+        """Options first (by underlying root, then exact OCC symbol), then stocks, like the old linear scan."""
+        self._ensure_fresh()
+        return self.cached_position(ticker)
+
+    def cached_position(self, ticker):
+        """Same lookup as get_position, but never refreshes; safe to call from a refresh listener."""
+        ticker = ticker.upper()
+        with self.lock:
+            options = self.options_by_root.get(ticker)
+            if options:
+                return options[0]
+            return self.by_symbol.get(ticker)
+
+    def get_options(self, root):
+        self._ensure_fresh()
+        with self.lock:
+            return list(self.options_by_root.get(root.upper(), ()))
+
+    def get_all(self):
+        self._ensure_fresh()
+        with self.lock:
+            return dict(self.by_symbol)
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="position-cache", daemon=True)
+        self._thread.start()
+        logger.info(f"📡 [POSITIONS] Position poller started ({self.refresh_interval}s interval)")
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self.refresh_interval)
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,102 @@
+import logging
+import threading
+from collections import OrderedDict, deque
+from src.trading.clock import get_clock
+from src.trading.option_chain import resolve_expiration
+
+logger = logging.getLogger(__name__)
+
+# Parser types that mean the same action
+ACTION_ALIASES = {"trimming": "trim"}
+
+# Merged signals kept for get_stats()
+RECENT_MERGES = 100
+
+def signal_channel(trade):
+    return (trade.get("trace") or {}).get("channel") or trade.get("channel") or "unknown"
+
+def canonical_key(trade):
+    """(ticker, contract, action). contract is (expiry, strike, right) for callouts that name one, else None,
+    so "in SPY 3/15 510C" and "in SPY 03/15 510c" match and two channels' "trim SPY" do too."""
+    contract = None
+    if trade.get("strike_price") is not None and trade.get("option_type"):
+        expiration = trade.get("expiration")
+        expiry = resolve_expiration(expiration, get_clock().now().date()) if expiration else None
+        contract = (expiry or expiration, float(trade["strike_price"]), trade["option_type"].upper()[:1])
+    action = ACTION_ALIASES.get(trade["type"], trade["type"])
+    return trade["ticker"].upper(), contract, action
+
+class SignalCoalescer:
+    """Merges the same callout arriving from several channels within window seconds into one signal.
+
+    Entries live in an OrderedDict keyed by canonical_key, in first-seen order, so a lookup is one
+    dict probe and expiry pops from the front until the oldest entry is inside the window. A repeat
+    from a channel that already contributed is passed through: within one channel it is a new
+    callout (e.g. a second trim), not an echo.
+    """
+
+    def __init__(self, window=30.0):
+        self.window = window
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.recent_merges = deque(maxlen=RECENT_MERGES)
+        self.stats = {"signals": 0, "forwarded": 0, "merged": 0}
+
+    def _expire(self, now):
+        while self.entries:
+            key, entry = next(iter(self.entries.items()))
+            if now - entry["first_seen"] < self.window:
+                break
+            self.entries.popitem(last=False)
+            if len(entry["channels"]) > 1:
+                self.recent_merges.append({"key": key, "channels": entry["channels"], "span": entry["last_seen"] - entry["first_seen"]})
+
+    def offer(self, trade):
+        """True if the signal should go on to execution, False if it was merged into an earlier one."""
+        if not self.window:
+            return True
+        key = canonical_key(trade)
+        channel = signal_channel(trade)
+        now = get_clock().monotonic()
+
+        with self.lock:
+            self.stats["signals"] += 1
+            self._expire(now)
+            entry = self.entries.get(key)
+            if entry is None or channel in entry["channels"]:
+                if entry is not None:
+                    # Same channel again: a new callout; it starts a fresh window
+                    del self.entries[key]
+                self.entries[key] = {"first_seen": now, "last_seen": now, "channels": [channel], "trade": trade}
+                self.stats["forwarded"] += 1
+                return True
+
+            entry["channels"].append(channel)
+            entry["last_seen"] = now
+            self.stats["merged"] += 1
+            # The forwarded trade carries every contributing channel for logs and reports
+            entry["trade"]["sources"] = list(entry["channels"])
+
+        logger.info(f"🔗 [COALESCE] {key[0]} {trade['type'].upper()} from {channel} merged into the signal from "
+                    f"{entry['channels'][0]} ({now - entry['first_seen']:.1f}s later, {len(entry['channels'])} channels)")
+        return False
+
+    def gate(self, handler):
+        """Wraps an entry/exit handler so only the first of each merged group reaches it."""
+        def coalesced(trade):
+            if self.offer(trade):
+                handler(trade)
+        return coalesced
+
+    def get_stats(self):
+        with self.lock:
+            self._expire(get_clock().monotonic())
+            stats = dict(self.stats)
+            stats["active"] = len(self.entries)
+            stats["recent_merges"] = list(self.recent_merges)
+        return stats
+
+    def log_stats(self):
+        stats = self.get_stats()
+        logger.info(f"🔗 [COALESCE] {stats['signals']} signals, {stats['forwarded']} forwarded, {stats['merged']} merged, "
+                    f"{stats['active']} in window")
@@ -0,0 +1,172 @@
+import time
+import queue
+import logging
+import itertools
+import threading
+from collections import deque
+from src.trading.position_cache import PositionCache
+
+logger = logging.getLogger(__name__)
+
+class TriggerBook:
+    """Holds every pending trim/out/add condition and evaluates them in one worker thread.
+
+    A trigger is a check(position_data) callable registered under a ticker. It returns True once it
+    has fired (or should be dropped) and False to keep waiting. All triggers are re-evaluated in a
+    batch whenever the position cache refreshes or a quote arrives, so the thread count stays
+    constant no matter how many callouts are pending.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @staticmethod
+    def get_instance():
+        # Execution workers call this concurrently when no QuoteStream created the book at startup
+        if TriggerBook._instance is None:
+            with TriggerBook._instance_lock:
+                if TriggerBook._instance is None:
+                    TriggerBook._instance = TriggerBook()
+        return TriggerBook._instance
+
+    def __init__(self, position_cache=None):
+        self.position_cache = position_cache or PositionCache.get_instance()
+        self.lock = threading.Lock()
+        self.triggers = {}
+        self.events = queue.Queue()
+        self.ids = itertools.count(1)
+        self.fired = 0
+        self.latencies = deque(maxlen=1000)
+        self.listeners = []
+        # Optional live quote source (QuoteStream) used to re-mark positions between cache refreshes
+        self.quote_source = None
+        self.start_lock = threading.Lock()
+        self._thread = None
+        self.position_cache.add_listener(lambda cache: self.notify())
+
+    def add_listener(self, callback):
+        """callback(book) runs whenever a ticker gains its first or loses its last pending trigger."""
+        self.listeners.append(callback)
+
+    def _tickers_changed(self):
+        for callback in self.listeners:
+            try:
+                callback(self)
+            except Exception as e:
+                logger.error("❌ [TRIGGERS] Listener failed: %s", e)
+
+    def add(self, ticker, name, check):
+        trigger_id = next(self.ids)
+        with self.lock:
+            new_ticker = ticker.upper() not in self.triggers
+            self.triggers.setdefault(ticker.upper(), {})[trigger_id] = {"name": name, "check": check, "created_at": time.time()}
+        if new_ticker:
+            self._tickers_changed()
+        logger.info("🎯 [TRIGGERS] %s %s: trigger #%s registered", ticker.upper(), name, trigger_id)
+        self.start()
+        # Evaluate right away against the cached position, like the old monitor thread's first iteration
+        self.notify()
+        return trigger_id
+
+    def cancel(self, ticker, trigger_id):
+        ticker = ticker.upper()
+        with self.lock:
+            cancelled = self.triggers.get(ticker, {}).pop(trigger_id, None) is not None
+            emptied = cancelled and not self.triggers.get(ticker)
+            if emptied:
+                self.triggers.pop(ticker, None)
+        if emptied:
+            self._tickers_changed()
+        return cancelled
+
+    def tickers(self):
+        with self.lock:
+            return set(self.triggers)
+
+    def notify(self):
+        self.events.put(time.monotonic())
+
+    def current_position(self, ticker):
+        position_data = self.position_cache.get_position(ticker)
+        if self.quote_source is not None:
+            position_data = self.quote_source.mark(position_data)
+        return position_data
+
+    def evaluate(self, event_time):
+        with self.lock:
+            pending = {ticker: sorted(triggers) for ticker, triggers in self.triggers.items()}
+
+        for ticker, trigger_ids in pending.items():
+            position_data, stale = None, True
+            for trigger_id in trigger_ids:
+                # Claim the trigger before running it, so a concurrent evaluation or a cancel can't fire it twice
+                with self.lock:
+                    trigger = self.triggers.get(ticker, {}).pop(trigger_id, None)
+                if trigger is None:
+                    continue
+                if stale:
+                    position_data, stale = self.current_position(ticker), False
+
+                try:
+                    done = trigger["check"](position_data)
+                except Exception as e:
+                    logger.error("❌ [TRIGGERS] %s %s: trigger #%s failed: %s", ticker, trigger['name'], trigger_id, e)
+                    done = True
+
+                if not done:
+                    with self.lock:
+                        self.triggers.setdefault(ticker, {})[trigger_id] = trigger
+                    continue
+
+                latency = time.monotonic() - event_time
+                with self.lock:
+                    emptied = not self.triggers.get(ticker) and self.triggers.pop(ticker, None) is not None
+                    self.fired += 1
+                    self.latencies.append(latency)
+                if emptied:
+                    self._tickers_changed()
+                logger.info("⚡ [TRIGGERS] %s %s: trigger #%s done in %.0fms after update",
+                            ticker, trigger['name'], trigger_id, latency * 1000)
+                # The fired trigger may have sold or bought: a trim and an out on the same ticker must not both size off the old quantity
+                self.position_cache.invalidate()
+                stale = True
+
+    def _run(self):
+        while True:
+            event_time = self.events.get()
+            # Coalesce a burst of updates into one batch evaluation, keeping the oldest timestamp
+            while True:
+                try:
+                    self.events.get_nowait()
+                except queue.Empty:
+                    break
+            try:
+                self.evaluate(event_time)
+            except Exception as e:
+                logger.error("❌ [TRIGGERS] Evaluation failed: %s", e)
+
+    def start(self):
+        # add() calls this from every execution worker; only one of them may start the thread
+        with self.start_lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="trigger-book", daemon=True)
+            self._thread.start()
+        self.position_cache.start()
+
+    def get_stats(self):
+        with self.lock:
+            latencies = sorted(self.latencies)
+            pending = sum(len(triggers) for triggers in self.triggers.values())
+            fired = self.fired
+        return {
+            "pending": pending,
+            "fired": fired,
+            "latency_p50": latencies[len(latencies) // 2] if latencies else None,
+            "latency_max": latencies[-1] if latencies else None,
+        }
+
+    def log_stats(self):
+        stats = self.get_stats()
+        latency = (f"p50 {stats['latency_p50'] * 1000:.0f}ms, max {stats['latency_max'] * 1000:.0f}ms"
+                   if stats["latency_p50"] is not None else "n/a")
+        logger.info("🎯 [TRIGGERS] %s pending, %s fired, update-to-fire latency %s", stats['pending'], stats['fired'], latency)
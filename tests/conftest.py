@@ -0,0 +1,9 @@
+import os
+import sys
+
+# config.py reads credentials at import time; the tests never reach a real broker or Discord
+for name in ("DISCORD_EMAIL", "DISCORD_PASSWORD", "ALPACA_API_KEY", "ALPACA_API_SECRET"):
+    os.environ.setdefault(name, "test")
+os.environ.setdefault("ALPACA_BASE_URL", "http://127.0.0.1:1")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,86 @@
+import time
+import sqlite3
+import pytest
+from src.main.dedupe_store import DedupeStore
+
+CHANNEL = "https://discord.com/channels/1/2"
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "processed.db")
+
+def test_check_and_add(db_path):
+    store = DedupeStore(db_path=db_path, commit_interval=0)
+    assert store.check_and_add(CHANNEL, "a") is False
+    assert store.check_and_add(CHANNEL, "a") is True
+    assert store.check_and_add("other", "a") is False
+    assert store.stats()["hits"] == 1
+    store.close()
+
+def test_lru_evicts_least_recently_seen(db_path):
+    store = DedupeStore(db_path=db_path, max_entries=2, commit_interval=0)
+    store.add(CHANNEL, "a")
+    store.add(CHANNEL, "b")
+    # A hit refreshes "a", so "b" is the one dropped
+    assert store.contains(CHANNEL, "a")
+    store.add(CHANNEL, "c")
+    assert store.contains(CHANNEL, "a")
+    assert not store.contains(CHANNEL, "b")
+    assert store.contains(CHANNEL, "c")
+    assert store.size(CHANNEL) == 2
+    assert store.stats()["evictions"] == 1
+    store.close()
+
+def test_ttl_expires_entries(db_path):
+    store = DedupeStore(db_path=db_path, ttl=0.05, commit_interval=0)
+    store.add(CHANNEL, "old")
+    time.sleep(0.1)
+    store.add(CHANNEL, "new")
+    assert not store.contains(CHANNEL, "old")
+    assert store.contains(CHANNEL, "new")
+    store.close()
+
+def test_reload_restores_entries_and_watermarks(db_path):
+    store = DedupeStore(db_path=db_path)
+    store.add(CHANNEL, "a")
+    store.set_watermark(CHANNEL, 1234567890123)
+    store.close()
+
+    reopened = DedupeStore(db_path=db_path)
+    assert reopened.contains(CHANNEL, "a")
+    assert reopened.get_watermark(CHANNEL) == 1234567890123
+    assert reopened.get_watermark("other") is None
+    reopened.close()
+
+def test_reload_drops_expired_and_overflow(db_path):
+    store = DedupeStore(db_path=db_path, commit_interval=0)
+    for key in ("a", "b", "c"):
+        store.add(CHANNEL, key)
+    store.close()
+
+    reopened = DedupeStore(db_path=db_path, max_entries=2)
+    assert not reopened.contains(CHANNEL, "a")
+    assert reopened.size(CHANNEL) == 2
+    reopened.close()
+
+    time.sleep(0.1)
+    expired = DedupeStore(db_path=db_path, ttl=0.05)
+    assert expired.size() == 0
+    expired.close()
+
+def committed_rows(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM processed").fetchone()[0]
+    finally:
+        conn.close()
+
+def test_batched_writes_commit_on_flush(db_path):
+    store = DedupeStore(db_path=db_path, commit_interval=60)
+    store.add(CHANNEL, "a")
+    store.add(CHANNEL, "b")
+    # Another connection only sees the rows once the batch is committed
+    assert committed_rows(db_path) == 0
+    store.flush()
+    assert committed_rows(db_path) == 2
+    store.close()
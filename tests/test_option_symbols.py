@@ -0,0 +1,65 @@
+import datetime as dt
+import pytest
+from src.trading.option_chain import OptionChain, occ_symbol, resolve_expiration
+from src.trading.position_cache import parse_occ_symbol
+
+@pytest.mark.parametrize("expiration, today, expected", [
+    ("3/15", dt.date(2024, 3, 1), dt.date(2024, 3, 15)),
+    ("3/15", dt.date(2024, 3, 15), dt.date(2024, 3, 15)),
+    # A January expiry called in late December is next year's
+    ("1/17", dt.date(2024, 12, 27), dt.date(2025, 1, 17)),
+    ("12/20", dt.date(2024, 12, 21), dt.date(2025, 12, 20)),
+    ("01/05", dt.date(2024, 12, 30), dt.date(2025, 1, 5)),
+    # 2/29 only exists in a leap year
+    ("2/29", dt.date(2023, 3, 1), dt.date(2024, 2, 29)),
+    ("2/29", dt.date(2024, 3, 1), None),
+    # An explicit year is taken as given
+    ("1/17/25", dt.date(2024, 12, 27), dt.date(2025, 1, 17)),
+    ("1/17/2025", dt.date(2024, 12, 27), dt.date(2025, 1, 17)),
+    ("13/01", dt.date(2024, 1, 1), None),
+    ("3", dt.date(2024, 1, 1), None),
+    ("soon", dt.date(2024, 1, 1), None),
+    (None, dt.date(2024, 1, 1), None),
+])
+def test_resolve_expiration(expiration, today, expected):
+    assert resolve_expiration(expiration, today) == expected
+
+@pytest.mark.parametrize("symbol, expected", [
+    ("SPY240315C00510000", {"root": "SPY", "expiration": "240315", "option_type": "C", "strike_price": 510.0}),
+    ("spy240315p00512500", {"root": "SPY", "expiration": "240315", "option_type": "P", "strike_price": 512.5}),
+    ("F250117C00012000", {"root": "F", "expiration": "250117", "option_type": "C", "strike_price": 12.0}),
+    # Adjusted contracts carry a digit in the root
+    ("AMD1240315C00150000", {"root": "AMD1", "expiration": "240315", "option_type": "C", "strike_price": 150.0}),
+    ("SPY", None),
+    ("SPY240315X00510000", None),
+    ("SPY240315C0051000", None),
+])
+def test_parse_occ_symbol(symbol, expected):
+    assert parse_occ_symbol(symbol) == expected
+
+def test_occ_symbol_round_trips():
+    symbol = occ_symbol("spy", dt.date(2024, 3, 15), "c", 512.5)
+    assert symbol == "SPY240315C00512500"
+    assert parse_occ_symbol(symbol) == {"root": "SPY", "expiration": "240315", "option_type": "C", "strike_price": 512.5}
+
+def contract(expiration, strike, kind="call"):
+    right = "C" if kind == "call" else "P"
+    return {"symbol": occ_symbol("SPY", dt.date.fromisoformat(expiration), right, strike),
+            "expiration_date": expiration, "type": kind, "strike_price": str(strike)}
+
+@pytest.fixture
+def chain():
+    contracts = [contract(expiration, strike) for expiration in ("2024-03-14", "2024-03-22") for strike in (510, 512.5, 515)]
+    return OptionChain("SPY", contracts, refreshed_at=0)
+
+def test_chain_lookup_exact(chain):
+    assert chain.lookup("SPY", dt.date(2024, 3, 14), "C", 512.5) == ("SPY240314C00512500", dt.date(2024, 3, 14), 512.5)
+
+def test_chain_lookup_snaps_to_nearest_listed(chain):
+    # Friday called in a week whose expiry is Thursday, with a typo'd strike
+    assert chain.lookup("SPY", dt.date(2024, 3, 15), "C", 512) == ("SPY240314C00512500", dt.date(2024, 3, 14), 512.5)
+
+def test_chain_lookup_rejects_far_contracts(chain):
+    assert chain.lookup("SPY", dt.date(2024, 3, 18), "C", 510) is None
+    assert chain.lookup("SPY", dt.date(2024, 3, 14), "C", 530) is None
+    assert chain.lookup("SPY", dt.date(2024, 3, 14), "P", 510) is None
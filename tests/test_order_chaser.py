@@ -0,0 +1,125 @@
+import types
+import itertools
+from concurrent.futures import Future
+import pytest
+from src.trading.alpaca_client import api
+from src.trading.order_tracker import OrderTracker
+from src.trading.order_chaser import OrderChaser
+
+SYMBOL = "SPY240315C00510000"
+
+class FakeBroker:
+    """Just enough of the REST client for a chase. fill_on_replace makes the old order fill that many
+    contracts between the chaser's get_order and its replace_order."""
+
+    def __init__(self, fill_on_replace=0):
+        self.ids = itertools.count(1)
+        self.orders = {}
+        self.calls = []
+        self.fill_on_replace = fill_on_replace
+
+    def entity(self, order):
+        return types.SimpleNamespace(_raw=dict(order), **order)
+
+    def submit_order(self, symbol, qty, side, type, time_in_force, limit_price=None, **kwargs):
+        order = {"id": f"o{next(self.ids)}", "symbol": symbol, "qty": str(qty), "side": side, "type": type,
+                 "limit_price": limit_price, "status": "new", "filled_qty": "0", "filled_avg_price": None}
+        self.orders[order["id"]] = order
+        self.calls.append(("submit", int(qty), limit_price))
+        return self.entity(order)
+
+    def get_order(self, order_id):
+        return self.entity(self.orders[order_id])
+
+    def replace_order(self, order_id, qty, limit_price, **kwargs):
+        old = self.orders[order_id]
+        if self.fill_on_replace:
+            old.update(filled_qty=str(self.fill_on_replace), filled_avg_price=old["limit_price"])
+            self.fill_on_replace = 0
+        old["status"] = "replaced"
+        new = dict(old, id=f"o{next(self.ids)}", qty=str(qty), limit_price=limit_price, status="new", filled_qty="0", filled_avg_price=None)
+        self.orders[new["id"]] = new
+        self.calls.append(("replace", int(qty), limit_price))
+        return self.entity(new)
+
+    def cancel_order(self, order_id):
+        self.orders[order_id]["status"] = "canceled"
+        self.calls.append(("cancel", order_id))
+
+@pytest.fixture
+def broker():
+    previous = api.rest
+    fake = FakeBroker()
+    api.set_backend(fake, None)
+    OrderTracker._instance = OrderTracker()
+    yield fake
+    OrderTracker._instance = None
+    api.set_backend(previous)
+
+def never_fills(response, submitted_at):
+    # No trade updates: the chaser has to read final fills back with get_order
+    return Future()
+
+def chaser(**kwargs):
+    options = {"max_slippage": 0.05, "time_budget": 0.1, "step_interval": 0.02, "market_fallback": False}
+    options.update(kwargs)
+    return OrderChaser(**options)
+
+@pytest.mark.parametrize("quote, step, steps, expected", [
+    # No quote: straight from the callout price to the ceiling
+    (None, 0, 5, 1.00),
+    (None, 5, 5, 1.05),
+    # Opens at the mid when it is above the callout, walks toward the ask
+    ({"bid": 1.00, "ask": 1.04}, 0, 4, 1.02),
+    ({"bid": 1.00, "ask": 1.04}, 4, 4, 1.04),
+    ({"bid": 0.90, "ask": 1.10}, 2, 5, 1.02),
+    # Never above the ceiling, even when the whole market is
+    ({"bid": 1.20, "ask": 1.30}, 0, 5, 1.05),
+    ({"bid": 1.20, "ask": 1.30}, 5, 5, 1.05),
+    # Never below the callout price when the ask is under it
+    ({"bid": 0.80, "ask": 0.90}, 5, 5, 1.00),
+    ({"bid": None, "ask": 1.02}, 0, 2, 1.00),
+])
+def test_price_path(quote, step, steps, expected):
+    assert chaser().price_path(1.00, quote, step, steps) == pytest.approx(expected)
+
+def test_price_path_rounds_up_to_the_nickel_above_three_dollars():
+    assert chaser().price_path(4.00, None, 1, 3) == pytest.approx(4.10)
+    assert chaser().ceiling(4.00) == pytest.approx(4.20)
+
+def test_price_path_is_monotonic():
+    prices = [chaser().price_path(1.00, {"bid": 0.95, "ask": 1.08}, step, 10) for step in range(11)]
+    assert prices == sorted(prices)
+    assert prices[-1] == pytest.approx(1.05)
+
+def test_unfilled_chase_reprices_then_cancels(broker):
+    result = chaser().chase_buy(SYMBOL, 5, 1.00, track=never_fills)
+    replaces = [call for call in broker.calls if call[0] == "replace"]
+    assert replaces
+    assert all(qty == 5 for _, qty, _ in replaces)
+    prices = [float(price) for _, _, price in replaces]
+    assert prices == sorted(prices) and prices[-1] <= 1.05
+    assert broker.calls[-1][0] == "cancel"
+    assert result.filled_qty == 0 and result.settled
+
+def test_replacement_is_resized_when_the_old_order_fills_first(broker):
+    broker.fill_on_replace = 3
+    result = chaser().chase_buy(SYMBOL, 5, 1.00, track=never_fills)
+    replaces = [call[1] for call in broker.calls if call[0] == "replace"]
+    # The first replacement asked for 5 while 3 were filling; the next one only asks for what is left
+    assert replaces[:2] == [5, 2]
+    assert all(qty <= 2 for qty in replaces[1:])
+    assert result.filled_qty == 3
+    assert result.settled
+
+def test_fill_on_the_first_limit(broker):
+    def fills_immediately(response, submitted_at):
+        future = Future()
+        future.set_result(dict(response._raw, status="filled", filled_qty="5", filled_avg_price="1.00"))
+        return future
+
+    result = chaser().chase_buy(SYMBOL, 5, 1.00, track=fills_immediately)
+    assert [call[0] for call in broker.calls] == ["submit"]
+    assert result.filled_qty == 5
+    assert result.slippage == pytest.approx(0.0)
+    assert result.time_to_fill is not None
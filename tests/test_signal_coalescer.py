@@ -0,0 +1,84 @@
+import datetime as dt
+import pytest
+from src.trading.clock import RealClock, set_clock
+from src.trading.signal_coalescer import SignalCoalescer
+
+class FakeClock(RealClock):
+    def __init__(self):
+        self.now_monotonic = 1000.0
+
+    def monotonic(self):
+        return self.now_monotonic
+
+    def now(self):
+        return dt.datetime(2024, 3, 1, 10, 0)
+
+@pytest.fixture
+def clock():
+    fake = FakeClock()
+    set_clock(fake)
+    yield fake
+    set_clock(RealClock())
+
+def entry(channel, **fields):
+    trade = {"type": "in", "ticker": "SPY", "expiration": "3/15", "strike_price": 510.0, "option_type": "C", "option_price": 1.2}
+    trade.update(fields)
+    trade["channel"] = channel
+    return trade
+
+@pytest.fixture
+def gated():
+    coalescer = SignalCoalescer(window=30)
+    received = []
+    return coalescer, coalescer.gate(received.append), received
+
+def test_same_callout_from_two_channels_is_merged(clock, gated):
+    coalescer, handle, received = gated
+    handle(entry("swing"))
+    clock.now_monotonic += 5
+    handle(entry("daytrade", expiration="03/15", option_type="c"))
+    assert len(received) == 1
+    assert received[0]["sources"] == ["swing", "daytrade"]
+    assert coalescer.get_stats()["merged"] == 1
+
+def test_repeat_from_the_same_channel_passes(clock, gated):
+    _, handle, received = gated
+    handle({"type": "trim", "ticker": "SPY", "desired_plpc": 20, "channel": "swing"})
+    handle({"type": "trimming", "ticker": "SPY", "desired_plpc": 40, "channel": "swing"})
+    assert len(received) == 2
+
+def test_exit_aliases_merge_across_channels(clock, gated):
+    _, handle, received = gated
+    handle({"type": "trim", "ticker": "SPY", "desired_plpc": 20, "channel": "swing"})
+    handle({"type": "trimming", "ticker": "spy", "desired_plpc": 20, "channel": "daytrade"})
+    assert len(received) == 1
+
+def test_signal_after_the_window_passes(clock, gated):
+    _, handle, received = gated
+    handle(entry("swing"))
+    clock.now_monotonic += 30
+    handle(entry("daytrade"))
+    assert len(received) == 2
+
+def test_different_contracts_are_not_merged(clock, gated):
+    _, handle, received = gated
+    handle(entry("swing"))
+    handle(entry("daytrade", strike_price=512.0))
+    handle(entry("highrisk", option_type="P"))
+    handle(entry("leaps", expiration="3/22"))
+    handle(entry("midas", type="added"))
+    assert len(received) == 5
+
+def test_zero_window_disables_coalescing(clock):
+    received = []
+    handle = SignalCoalescer(window=0).gate(received.append)
+    handle(entry("swing"))
+    handle(entry("daytrade"))
+    assert len(received) == 2
+
+def test_trace_channel_takes_precedence(clock, gated):
+    _, handle, received = gated
+    handle(dict(entry("unknown"), trace={"channel": "swing"}))
+    handle(dict(entry("unknown"), trace={"channel": "daytrade"}))
+    assert len(received) == 1
+    assert received[0]["sources"] == ["swing", "daytrade"]
@@ -0,0 +1,60 @@
+import os
+import stat
+import pytest
+from src.main import discord_session
+from src.main.discord_session import (
+    DEFAULT_PROFILE_DIR, STARTUP_CACHE_PATH, load_startup_cache, resolve_chromedriver, resolve_user_agent, startup_cache_path,
+)
+
+@pytest.fixture
+def cache_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(discord_session, "CHROMEDRIVER_PATH", None)
+    monkeypatch.setattr(discord_session, "DISCORD_USER_AGENT", None)
+    return str(tmp_path / "browser_startup.json")
+
+@pytest.fixture
+def driver(tmp_path):
+    path = tmp_path / "chromedriver"
+    path.write_text("")
+    path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    return str(path)
+
+def test_cached_driver_skips_install(cache_path, driver, monkeypatch):
+    monkeypatch.setattr(discord_session, "install_chromedriver", lambda: pytest.fail("should use the cached driver"))
+    assert resolve_chromedriver({"driver_path": driver}, cache_path=cache_path) == driver
+
+def test_missing_driver_is_reinstalled_and_cached(cache_path, driver, monkeypatch):
+    monkeypatch.setattr(discord_session, "install_chromedriver", lambda: driver)
+    cache = {"driver_path": os.path.join(os.path.dirname(driver), "gone")}
+    assert resolve_chromedriver(cache, cache_path=cache_path) == driver
+    assert load_startup_cache(cache_path)["driver_path"] == driver
+
+def test_refresh_reinstalls_cached_driver(cache_path, driver, monkeypatch):
+    installs = []
+    monkeypatch.setattr(discord_session, "install_chromedriver", lambda: installs.append(1) or driver)
+    resolve_chromedriver({"driver_path": driver}, refresh=True, cache_path=cache_path)
+    assert installs == [1]
+
+def test_user_agent_is_pinned(cache_path, monkeypatch):
+    agents = iter(["agent-1", "agent-2"])
+    monkeypatch.setattr(discord_session, "random_user_agent", lambda: next(agents))
+    assert resolve_user_agent({}, cache_path=cache_path) == "agent-1"
+    assert resolve_user_agent(load_startup_cache(cache_path), cache_path=cache_path) == "agent-1"
+
+def test_configured_overrides_win(cache_path, monkeypatch):
+    monkeypatch.setattr(discord_session, "CHROMEDRIVER_PATH", "/opt/chromedriver")
+    monkeypatch.setattr(discord_session, "DISCORD_USER_AGENT", "pinned")
+    assert resolve_chromedriver({}, cache_path=cache_path) == "/opt/chromedriver"
+    assert resolve_user_agent({}, cache_path=cache_path) == "pinned"
+    assert not os.path.exists(cache_path)
+
+def test_worker_profiles_get_their_own_cache(tmp_path):
+    assert startup_cache_path(None) == STARTUP_CACHE_PATH
+    assert startup_cache_path(DEFAULT_PROFILE_DIR) == STARTUP_CACHE_PATH
+    worker = str(tmp_path / "worker-0")
+    assert startup_cache_path(worker) == os.path.join(worker, "browser_startup.json")
+
+def test_unreadable_cache_is_empty(tmp_path):
+    path = tmp_path / "browser_startup.json"
+    path.write_text("{not json")
+    assert load_startup_cache(str(path)) == {}